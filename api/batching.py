@@ -0,0 +1,118 @@
+"""
+Dynamic micro-batching for model inference
+Coalesces concurrent single-item requests into one batched call
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+
+class MicroBatcher:
+    """
+    Collects items submitted by concurrent requests and processes them together.
+
+    A batch is flushed as soon as it reaches max_batch_size or when max_wait_ms
+    has passed since its first item arrived, whichever comes first. Up to
+    max_concurrent_batches batches run at once; while they are all busy, new items
+    keep queueing and go out together in the next batch.
+
+    Results match processing each item alone up to floating-point tolerance only:
+    padding changes the shapes, and so the reduction order, of the forward pass.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[Sequence[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        runner: Optional[Callable[..., Awaitable[Any]]] = None,
+        max_concurrent_batches: int = 1
+    ):
+        """
+        Args:
+            process_batch: Function mapping a list of items to a list of results (same order)
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+            runner: Async executor for process_batch, e.g. InferencePool.run
+                (None runs it inline on the event loop)
+            max_concurrent_batches: Batches in flight at once, e.g. the runner's
+                pool size (only useful with a runner)
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.runner = runner
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self._queue = None
+        self._worker = None
+        self._dispatching = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the background worker and cancel batches still in flight"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        for task in list(self._dispatching):
+            task.cancel()
+        await asyncio.gather(*self._dispatching, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_concurrent_batches)
+
+        while True:
+            # Collect the next batch only once it could start right away
+            await slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, batch) -> None:
+        items = [item for item, _ in batch]
+
+        try:
+            if self.runner is not None:
+                results = await self.runner(self.process_batch, items)
+            else:
+                results = self.process_batch(items)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,205 @@
+"""
+Content-addressed cache for model outputs
+Keys are a hash of the normalized input text plus the loaded model version, so
+results are shared across requests and invalidated when the models change
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially re-formatted resumes share a cache entry"""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def model_fingerprint(paths: Iterable[Path]) -> str:
+    """
+    Version string for a set of model files/directories
+
+    Derived from the relative path, size and modification time of every file,
+    so retraining or replacing a model produces a new version.
+    """
+    digest = hashlib.sha256()
+    for root in paths:
+        root = Path(root)
+        if not root.exists():
+            continue
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for path in files:
+            stat = path.stat()
+            digest.update(f"{path.relative_to(root.parent)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Two-tier cache: an in-process LRU with size and TTL eviction, backed by an
+    optional SQLite file that survives restarts. Values must be JSON-serializable.
+
+    The SQLite connection is opened per process, so a cache created before
+    forking (e.g. gunicorn --preload) is safe to use in the workers. Until a
+    model version is set, lookups and stores are bypassed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 86400,
+        disk_path: Optional[str] = None,
+        model_version: str = ""
+    ):
+        """
+        Args:
+            max_entries: Maximum entries kept in memory (least recently used are evicted)
+            ttl_seconds: Entry lifetime in both tiers
+            disk_path: SQLite file for the persistent tier (None keeps the cache in memory only)
+            model_version: Version of the models producing the cached values
+                (empty disables the cache until set_model_version is called)
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        self.model_version = model_version
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "bypassed": 0, "evictions": 0, "expirations": 0}
+
+        self.disk_path = disk_path
+        self._db = None
+        self._db_pid = None
+        if disk_path:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        """SQLite connection owned by the current process (None without a disk tier)"""
+        if not self.disk_path:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db_pid = os.getpid()
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, model_version TEXT, value TEXT, created_at REAL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def set_model_version(self, version: str) -> None:
+        """Switch to a new model version and drop entries produced by any other version"""
+        with self._lock:
+            self.model_version = version
+            self._memory.clear()
+            db = self._disk
+            if db:
+                deleted = db.execute(
+                    "DELETE FROM results WHERE model_version != ? OR created_at < ?",
+                    (version, time.time() - self.ttl)
+                ).rowcount
+                db.commit()
+                self._stats["expirations"] += max(deleted, 0)
+
+    def _key(self, namespace: str, text: str) -> str:
+        payload = f"{self.model_version}\x00{namespace}\x00{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, text: str) -> Optional[Any]:
+        """Cached value for (namespace, text), or None"""
+        now = time.time()
+
+        with self._lock:
+            if not self.model_version:
+                self._stats["bypassed"] += 1
+                return None
+            key = self._key(namespace, text)
+
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._memory[key]
+                self._stats["expirations"] += 1
+
+            db = self._disk
+            if db:
+                row = db.execute(
+                    "SELECT value, created_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    value = json.loads(row[0])
+                    self._put_memory(key, value, row[1])
+                    self._stats["disk_hits"] += 1
+                    return value
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, namespace: str, text: str, value: Any) -> None:
+        """Store a value for (namespace, text) in both tiers"""
+        now = time.time()
+
+        with self._lock:
+            if not self.model_version:
+                return
+            key = self._key(namespace, text)
+            self._put_memory(key, value, now)
+            db = self._disk
+            if db:
+                db.execute(
+                    "INSERT OR REPLACE INTO results (key, model_version, value, created_at) VALUES (?, ?, ?, ?)",
+                    (key, self.model_version, json.dumps(value), now)
+                )
+                db.commit()
+
+    def _put_memory(self, key: str, value: Any, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            db = self._disk
+            if db:
+                db.execute("DELETE FROM results")
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round((lookups - self._stats["misses"]) / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_enabled": self.disk_path is not None,
+                "model_version": self.model_version
+            }
+
+    def close(self) -> None:
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+
+def create_result_cache() -> ResultCache:
+    """ResultCache configured from RESULT_CACHE_* environment variables"""
+    return ResultCache(
+        max_entries=int(os.getenv("RESULT_CACHE_SIZE", "10000")),
+        ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", "86400")),
+        disk_path=os.getenv("RESULT_CACHE_PATH") or None
+    )
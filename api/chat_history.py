@@ -0,0 +1,152 @@
+"""
+Server-side interview chat history
+Builds the LLM prompt for a session from the persisted ChatMessage rows: a rolling
+summary of older turns followed by the most recent turns that fit in a token budget
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from api import db_models
+
+# Rough token estimate for Llama-style BPE tokenizers on English text
+CHARS_PER_TOKEN = 4
+# Role and formatting tokens added by the chat template around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = """You maintain the running notes of a mock technical interview.
+Update the notes with the new turns below. Keep the questions asked, the key points of
+the candidate's answers, the feedback given and any recurring weaknesses.
+Reply with the updated notes only, as short bullet points."""
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def prompt_tokens(messages: List[Dict]) -> int:
+    """Estimated prompt tokens of OpenAI-style chat messages"""
+    return sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def chat_role(sender: str) -> str:
+    """Stored sender ('user' / 'ai') or client role ('user' / 'model') -> OpenAI role"""
+    return "user" if sender == "user" else "assistant"
+
+
+def build_context(
+    system_prompt: str,
+    summary: Optional[str],
+    history: List[Dict],
+    current: str,
+    token_budget: int
+) -> Tuple[List[Dict], int]:
+    """
+    Assemble the chat messages for one turn within a token budget
+
+    The system prompt, the summary and the current message are always included;
+    older turns are dropped first.
+
+    Args:
+        system_prompt: Interviewer instructions
+        summary: Rolling summary of turns no longer sent verbatim
+        history: Earlier turns ({"role", "content"}, oldest first) not covered by the summary
+        current: Content of the current user message
+        token_budget: Maximum estimated prompt tokens
+
+    Returns:
+        (messages, dropped) where dropped is the number of oldest history turns
+        that did not fit
+    """
+    head = [{"role": "system", "content": system_prompt}]
+    if summary:
+        head.append({"role": "system", "content": f"Summary of the interview so far:\n{summary}"})
+    tail = [{"role": "user", "content": current}]
+
+    remaining = token_budget - prompt_tokens(head) - prompt_tokens(tail)
+    kept = 0
+    for message in reversed(history):
+        cost = prompt_tokens([message])
+        if cost > remaining:
+            break
+        remaining -= cost
+        kept += 1
+
+    recent = history[len(history) - kept:] if kept else []
+    return head + recent + tail, len(history) - kept
+
+
+def turns_to_summarize(history: List[Dict], keep_tokens: int) -> int:
+    """
+    Number of oldest history turns to fold into the summary so that the turns kept
+    verbatim fit in keep_tokens, leaving room for several new turns before the
+    next summarization
+    """
+    kept = 0
+    for message in reversed(history):
+        keep_tokens -= prompt_tokens([message])
+        if keep_tokens < 0:
+            break
+        kept += 1
+    return len(history) - kept
+
+
+def summary_request(summary: Optional[str], turns: List[Dict]) -> List[Dict]:
+    """Messages asking the LLM to fold turns into the rolling summary"""
+    transcript = "\n\n".join(
+        f"{'Candidate' if t['role'] == 'user' else 'Interviewer'}: {t['content']}" for t in turns
+    )
+    return [
+        {"role": "system", "content": SUMMARY_PROMPT},
+        {"role": "user", "content": f"Current notes:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"}
+    ]
+
+
+def load_session_history(db: Session, session_id: int) -> Tuple[Optional[db_models.ChatSession], List[Dict]]:
+    """
+    Session and its turns not yet covered by the summary, oldest first
+
+    Returns:
+        (session or None, [{"id", "role", "content"}, ...])
+    """
+    session = db.query(db_models.ChatSession).filter(db_models.ChatSession.id == session_id).first()
+    if session is None:
+        return None, []
+
+    query = db.query(
+        db_models.ChatMessage.id, db_models.ChatMessage.sender, db_models.ChatMessage.content
+    ).filter(db_models.ChatMessage.session_id == session_id)
+    if session.summary_message_id is not None:
+        query = query.filter(db_models.ChatMessage.id > session.summary_message_id)
+
+    turns = [
+        {"id": row.id, "role": chat_role(row.sender), "content": row.content or ""}
+        for row in query.order_by(db_models.ChatMessage.id).all()
+    ]
+    return session, turns
+
+
+def save_summary(db: Session, session_id: int, summary: str, through_message_id: int) -> bool:
+    """
+    Store a new rolling summary covering messages up to through_message_id
+
+    Only moves forward: a concurrent turn that already summarized further wins.
+
+    Returns:
+        True if the summary was stored
+    """
+    updated = db.query(db_models.ChatSession).filter(
+        db_models.ChatSession.id == session_id,
+        or_(
+            db_models.ChatSession.summary_message_id.is_(None),
+            db_models.ChatSession.summary_message_id < through_message_id
+        )
+    ).update(
+        {"summary": summary, "summary_message_id": through_message_id},
+        synchronize_session=False
+    )
+    db.commit()
+    return bool(updated)
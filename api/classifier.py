@@ -0,0 +1,393 @@
+"""
+BERT role classification helpers
+Runs dynamically padded, length-bucketed forward passes shared by the single and batch endpoints,
+on an eager PyTorch, INT8-quantized or ONNX Runtime backend
+"""
+
+import math
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+import torch
+
+try:
+    from common_utils import length_buckets
+except ImportError:
+    sys.path.append(str(Path(__file__).parent.parent / "scripts"))
+    from common_utils import length_buckets
+
+
+CLASSIFIER_BACKENDS = ("torch", "int8", "onnx")
+
+# Weights written by save_pretrained, memory-mapped directly by load_mmap_model
+SAFETENSORS_FILE = "model.safetensors"
+
+
+def embedding_buffers(config) -> Dict[str, torch.Tensor]:
+    """
+    BertEmbeddings' non-persistent buffers, as its constructor creates them;
+    checkpoints do not store them, so a model built on meta gets them from here
+    """
+    position_ids = torch.arange(config.max_position_embeddings).expand((1, -1))
+    return {
+        "position_ids": position_ids,
+        "token_type_ids": torch.zeros(position_ids.size(), dtype=torch.long)
+    }
+
+
+def load_mmap_model(model_dir):
+    """
+    BertForSequenceClassification whose parameters are views of model.safetensors,
+    memory-mapped read-only, so every worker process on the machine shares the same
+    physical pages (via the page cache) instead of holding a private copy
+
+    Args:
+        model_dir: Directory with config.json and SAFETENSORS_FILE
+
+    Returns:
+        Model in eval mode on CPU
+    """
+    from safetensors.torch import load_file
+    from transformers import BertConfig, BertForSequenceClassification
+
+    config = BertConfig.from_pretrained(model_dir)
+    # A randomly initialized copy would be freed right away, but the allocator
+    # keeps most of it as private memory in every worker. The device context is
+    # per thread, so models built elsewhere meanwhile are unaffected
+    with torch.device("meta"):
+        model = BertForSequenceClassification(config)
+
+    embeddings = model.bert.embeddings
+    for name, buffer in embedding_buffers(config).items():
+        if name in embeddings._buffers:
+            embeddings._buffers[name] = buffer
+
+    state = load_file(Path(model_dir) / SAFETENSORS_FILE, device="cpu")
+    # Checkpoints from older transformers versions also store non-persistent buffers
+    expected = model.state_dict().keys()
+    state = {name: tensor for name, tensor in state.items() if name in expected}
+
+    # assign=True keeps the mmap-backed tensors instead of copying them
+    model.load_state_dict(state, assign=True)
+    still_meta = [name for name, tensor in [*model.named_parameters(), *model.named_buffers()] if tensor.is_meta]
+    if still_meta:
+        raise RuntimeError(f"{SAFETENSORS_FILE} does not cover {still_meta}")
+    return model.eval()
+
+
+class OnnxClassifier:
+    """
+    Drop-in for BertForSequenceClassification backed by an onnxruntime session
+    (see scripts/export_bert_onnx.py); returns an object with a .logits tensor
+    """
+
+    def __init__(self, onnx_path, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(str(onnx_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def __call__(self, input_ids: torch.Tensor, attention_mask: torch.Tensor):
+        feeds = {
+            "input_ids": input_ids.cpu().numpy(),
+            "attention_mask": attention_mask.cpu().numpy()
+        }
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = torch.zeros_like(input_ids).cpu().numpy()
+
+        logits = self.session.run(["logits"], feeds)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def load_classifier(
+    model_dir,
+    backend: str = "torch",
+    device=None,
+    onnx_path=None,
+    num_threads: Optional[int] = None,
+    mmap_weights: bool = True
+):
+    """
+    Load the fine-tuned BERT classifier on the requested backend
+
+    Args:
+        model_dir: Directory with the saved model and tokenizer
+        backend: One of CLASSIFIER_BACKENDS
+            torch: eager fp32 PyTorch on device
+            int8: torch dynamic quantization of the Linear layers (CPU only)
+            onnx: exported model run by onnxruntime with all graph optimizations (CPU)
+        device: torch.device for the torch backend
+        onnx_path: Exported model (defaults to model_dir/model.onnx)
+        num_threads: Intra-op threads for onnxruntime (None keeps its default)
+        mmap_weights: For the torch backend on CPU, memory-map SAFETENSORS_FILE
+            when it exists (see load_mmap_model)
+
+    Returns:
+        (model, tokenizer); model is called as model(input_ids=..., attention_mask=...)
+    """
+    from transformers import BertTokenizer, BertForSequenceClassification
+
+    if backend not in CLASSIFIER_BACKENDS:
+        raise ValueError(f"Unknown classifier backend '{backend}', expected one of {CLASSIFIER_BACKENDS}")
+
+    tokenizer = BertTokenizer.from_pretrained(model_dir)
+
+    if backend == "onnx":
+        return OnnxClassifier(onnx_path or Path(model_dir) / "model.onnx", num_threads=num_threads), tokenizer
+
+    device = device or torch.device("cpu")
+    if backend == "torch" and device.type == "cpu" and mmap_weights and (Path(model_dir) / SAFETENSORS_FILE).exists():
+        try:
+            return load_mmap_model(model_dir), tokenizer
+        except RuntimeError as e:
+            # e.g. parameter names from_pretrained would have renamed
+            print(f"⚠️ Could not memory-map {model_dir}/{SAFETENSORS_FILE}, loading a private copy: {e}")
+
+    model = BertForSequenceClassification.from_pretrained(model_dir).eval()
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        model.to(device)
+
+    return model, tokenizer
+
+
+def classify_texts(
+    texts: Sequence[str],
+    model,
+    tokenizer,
+    device,
+    label_mapping: Dict[int, str],
+    max_length: int = 512,
+    batch_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Classify resume texts, padding each forward pass only to its longest sequence
+
+    Args:
+        texts: Resume texts to classify
+        model: Loaded BertForSequenceClassification
+        tokenizer: Matching BERT tokenizer
+        device: torch.device the model lives on
+        label_mapping: Class index -> role name
+        max_length: Maximum sequence length per text (longer texts are truncated)
+        batch_size: Texts per forward pass; texts of similar length are bucketed
+            together (None runs everything in one pass)
+
+    Returns:
+        One dict per text with predicted_role, confidence and raw logits, in input order
+    """
+    if not texts:
+        return []
+
+    encodings = tokenizer(list(texts), max_length=max_length, truncation=True)
+    input_ids = encodings["input_ids"]
+    lengths = [len(ids) for ids in input_ids]
+
+    results = [None] * len(texts)
+    for bucket in length_buckets(lengths, batch_size or len(texts)):
+        batch = tokenizer.pad(
+            {
+                "input_ids": [input_ids[i] for i in bucket],
+                "attention_mask": [encodings["attention_mask"][i] for i in bucket]
+            },
+            padding=True,
+            return_tensors="pt"
+        )
+
+        with torch.no_grad():
+            outputs = model(
+                input_ids=batch["input_ids"].to(device),
+                attention_mask=batch["attention_mask"].to(device)
+            )
+            probs = torch.softmax(outputs.logits, dim=1)
+
+        top_probs, top_idx = torch.max(probs, dim=1)
+        logits = outputs.logits.float().cpu().tolist()
+
+        for i, prob, idx, row in zip(bucket, top_probs.tolist(), top_idx.tolist(), logits):
+            results[i] = {
+                "predicted_role": label_mapping[idx],
+                "confidence": round(prob, 4),
+                "logits": row
+            }
+
+    return results
+
+
+def top_k_predictions(
+    logits: Sequence[Sequence[float]],
+    label_mapping: Dict[int, str],
+    k: int = 3
+) -> List[List[Dict[str, float]]]:
+    """
+    Most likely roles for each row of logits, in one vectorized softmax + topk pass
+
+    Works on logits returned by classify_texts / classify_chunked (or read back from
+    the result cache), so no extra forward pass is needed.
+
+    Args:
+        logits: One row of class logits per document
+        label_mapping: Class index -> role name
+        k: Number of roles per document (capped at the number of classes)
+
+    Returns:
+        Per document, a list of {role: probability} dicts in descending order
+    """
+    if not logits:
+        return []
+
+    probs = torch.softmax(torch.tensor(logits, dtype=torch.float32), dim=1)
+    top_probs, top_idx = torch.topk(probs, min(k, probs.shape[1]), dim=1)
+
+    return [
+        [{label_mapping[idx]: round(prob, 4)} for prob, idx in zip(row_probs, row_idx)]
+        for row_probs, row_idx in zip(top_probs.tolist(), top_idx.tolist())
+    ]
+
+
+CHUNK_AGGREGATIONS = ("mean", "max", "attention")
+
+
+def chunk_windows(
+    token_ids: List[int],
+    window_size: int,
+    stride: int,
+    max_chunks: int
+) -> List[int]:
+    """
+    Start offsets of overlapping windows covering a token sequence
+
+    Args:
+        token_ids: Token ids without special tokens
+        window_size: Tokens per window (excluding [CLS]/[SEP])
+        stride: Tokens shared by consecutive windows
+        max_chunks: Upper bound on windows; when exceeded, windows are spread
+            evenly over the document so the first and last tokens stay covered
+
+    Returns:
+        List of window start offsets
+    """
+    last_start = max(0, len(token_ids) - window_size)
+    step = max(1, window_size - stride)
+    n_windows = 1 + math.ceil(last_start / step)
+
+    if n_windows <= max_chunks:
+        return [min(i * step, last_start) for i in range(n_windows)]
+
+    if max_chunks == 1:
+        return [0]
+    return [round(i * last_start / (max_chunks - 1)) for i in range(max_chunks)]
+
+
+def aggregate_logits(logits: torch.Tensor, aggregation: str) -> torch.Tensor:
+    """
+    Combine per-window logits [n_windows, n_labels] into document logits [n_labels]
+
+    mean: average of window logits
+    max: per-label maximum over windows
+    attention: windows weighted by softmax(-entropy), so decisive windows dominate
+    """
+    if aggregation == "max":
+        return logits.max(dim=0).values
+    if aggregation == "attention":
+        log_probs = torch.log_softmax(logits, dim=1)
+        entropy = -(log_probs.exp() * log_probs).sum(dim=1)
+        weights = torch.softmax(-entropy, dim=0)
+        return (weights.unsqueeze(1) * logits).sum(dim=0)
+    return logits.mean(dim=0)
+
+
+def classify_chunked(
+    texts: Sequence[str],
+    model,
+    tokenizer,
+    device,
+    label_mapping: Dict[int, str],
+    aggregation: str = "mean",
+    max_length: int = 512,
+    stride: int = 128,
+    max_chunks: int = 8,
+    batch_size: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Classify long resumes by splitting them into overlapping windows
+
+    All windows of all texts go through bucketed forward passes together,
+    then window logits are aggregated per document.
+
+    Args:
+        texts: Resume texts to classify
+        model: Loaded BertForSequenceClassification
+        tokenizer: Matching BERT tokenizer
+        device: torch.device the model lives on
+        label_mapping: Class index -> role name
+        aggregation: One of CHUNK_AGGREGATIONS
+        max_length: Window length including special tokens
+        stride: Tokens of overlap between consecutive windows
+        max_chunks: Maximum windows per document
+        batch_size: Windows per forward pass (None runs everything in one pass)
+
+    Returns:
+        One dict per text with predicted_role, confidence, chunks_used and
+        aggregated logits, in input order
+    """
+    if aggregation not in CHUNK_AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{aggregation}', expected one of {CHUNK_AGGREGATIONS}")
+    if not texts:
+        return []
+
+    # Every window is wrapped as [CLS] ... [SEP]
+    window_size = max_length - 2
+    token_ids = tokenizer(list(texts), add_special_tokens=False, verbose=False)["input_ids"]
+
+    windows, owners = [], []
+    for doc_idx, ids in enumerate(token_ids):
+        for start in chunk_windows(ids, window_size, stride, max_chunks):
+            windows.append(
+                [tokenizer.cls_token_id] + ids[start:start + window_size] + [tokenizer.sep_token_id]
+            )
+            owners.append(doc_idx)
+
+    lengths = [len(ids) for ids in windows]
+    window_logits = [None] * len(windows)
+    for bucket in length_buckets(lengths, batch_size or len(windows)):
+        batch = tokenizer.pad(
+            {"input_ids": [windows[i] for i in bucket]},
+            padding=True,
+            return_tensors="pt"
+        )
+
+        with torch.no_grad():
+            outputs = model(
+                input_ids=batch["input_ids"].to(device),
+                attention_mask=batch["attention_mask"].to(device)
+            )
+
+        for i, logits in zip(bucket, outputs.logits.float().cpu()):
+            window_logits[i] = logits
+
+    per_doc = [[] for _ in texts]
+    for owner, logits in zip(owners, window_logits):
+        per_doc[owner].append(logits)
+
+    results = []
+    for doc_logits in per_doc:
+        logits = aggregate_logits(torch.stack(doc_logits), aggregation)
+        probs = torch.softmax(logits, dim=0)
+        top_prob, top_idx = torch.max(probs, dim=0)
+        results.append({
+            "predicted_role": label_mapping[top_idx.item()],
+            "confidence": round(top_prob.item(), 4),
+            "chunks_used": len(doc_logits),
+            "logits": logits.tolist()
+        })
+
+    return results
@@ -1,9 +1,12 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 import os
 import urllib.parse
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -49,3 +52,81 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Seconds a process waits for another one to finish migrating the schema
+MIGRATION_LOCK_TIMEOUT = int(os.getenv("DB_MIGRATION_LOCK_TIMEOUT", "300"))
+MIGRATION_LOCK_NAME = "hirelens_schema_migration"
+
+@contextmanager
+def schema_migration():
+    """
+    Connection for schema changes, held by one process at a time, so workers
+    starting together do not race each other's migration
+
+    SQLite: a single BEGIN IMMEDIATE transaction (it holds the database write lock
+    and SQLite DDL is transactional); MySQL: a named lock (DDL commits implicitly there)
+    """
+    if engine.dialect.name == "sqlite":
+        lock_engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False, "timeout": MIGRATION_LOCK_TIMEOUT},
+            poolclass=NullPool
+        )
+
+        @event.listens_for(lock_engine, "connect")
+        def no_implicit_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(lock_engine, "begin")
+        def begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+        try:
+            with lock_engine.begin() as conn:
+                yield conn
+        finally:
+            lock_engine.dispose()
+
+    elif engine.dialect.name == "mysql":
+        with engine.connect() as conn:
+            locked = conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT}
+            ).scalar()
+            if not locked:
+                raise TimeoutError("Timed out waiting for another process to migrate the schema")
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+
+    else:
+        with engine.begin() as conn:
+            yield conn
+
+def add_missing_columns(table, conn):
+    """
+    Add nullable columns introduced after a table was created
+    (create_all only creates missing tables, not missing columns)
+    """
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing and column.nullable:
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+def has_index(conn, table_name: str, index_name: str) -> bool:
+    return any(index["name"] == index_name for index in inspect(conn).get_indexes(table_name))
+
+def ensure_indexes(table, conn):
+    """
+    Create indexes declared on a table after it was created
+    (create_all skips existing tables entirely)
+    """
+    for index in table.indexes:
+        try:
+            index.create(bind=conn, checkfirst=True)
+        except (OperationalError, ProgrammingError):
+            # Created by a process migrating without the lock in the meantime
+            if not has_index(conn, table.name, index.name):
+                raise
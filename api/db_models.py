@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -10,6 +10,10 @@ class ChatSession(Base):
     applicant_id = Column(String(255), index=True, nullable=False)  # Links session to authenticated applicant
     title = Column(String(255), default="New Interview Session")
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Rolling summary of the turns up to summary_message_id (see api/chat_history.py)
+    summary = Column(Text, nullable=True)
+    summary_message_id = Column(Integer, nullable=True)
     
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
 
@@ -17,7 +21,7 @@ class ChatMessage(Base):
     __tablename__ = "chat_messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("chat_sessions.id"))
+    session_id = Column(Integer, ForeignKey("chat_sessions.id"), index=True)
     sender = Column(String(50)) # 'user' or 'ai'
     content = Column(Text)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -44,3 +48,41 @@ class CandidateRanking(Base):
     missing_skills = Column(Text) # Stored as comma-separated string
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # One ranking per candidate and job (the upsert conflict target), and
+    # GET /rankings filtered by job and sorted by score or date (id is the implicit tiebreaker)
+    __table_args__ = (
+        Index("ux_candidate_rankings_candidate_job", "candidate_id", "job_id", unique=True),
+        Index("ix_candidate_rankings_job_score", "job_id", "total_score"),
+        Index("ix_candidate_rankings_job_created", "job_id", "created_at"),
+    )
+
+class JobRankingWeights(Base):
+    __tablename__ = "job_ranking_weights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(255), unique=True, index=True, nullable=False)
+
+    # Component weights of the total score (see api/ranking.py RankingWeights)
+    skill_match = Column(Float, nullable=False)
+    experience_match = Column(Float, nullable=False)
+    role_confidence = Column(Float, nullable=False)
+    ats_score = Column(Float, nullable=False)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class JobProfile(Base):
+    __tablename__ = "job_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String(255), unique=True, index=True, nullable=False)
+
+    # Parsed once per job instead of once per candidate
+    required_skills = Column(Text) # Stored as comma-separated string
+    required_experience = Column(Integer, default=0)
+    taxonomy_version = Column(String(50)) # Skill taxonomy used for parsing
+    embedding = Column(Text, nullable=True) # JSON-encoded vector, when an embedding model is configured
+
+    job_text = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
@@ -0,0 +1,144 @@
+"""
+Bounded worker pool for blocking model inference
+Keeps spaCy and torch calls off the asyncio event loop and sheds load when saturated
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import sys
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+try:
+    from ner_pipeline import extract_entities, load_ner_model, pipe_entities
+except ImportError:
+    sys.path.append(str(Path(__file__).parent.parent / "scripts"))
+    from ner_pipeline import extract_entities, load_ner_model, pipe_entities
+
+
+class InferenceSaturated(Exception):
+    """Raised when the inference queue is full and the request should be retried later"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference queue is full")
+        self.retry_after = retry_after
+
+
+# -------------------- NER PROCESS WORKERS --------------------
+
+_worker_ner_model = None
+
+
+def _init_ner_worker(model_path: str) -> None:
+    global _worker_ner_model
+    _worker_ner_model = load_ner_model(model_path)
+
+
+def _ner_worker(texts: List[str]) -> List[List[Tuple[str, str, int, int]]]:
+    return pipe_entities(_worker_ner_model, texts, n_process=1)
+
+
+# -------------------- POOL --------------------
+
+class InferencePool:
+    """
+    Runs blocking inference on a fixed-size thread pool (plus an optional process
+    pool for spaCy) and limits how many requests may be in flight at once.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue_depth: int = 64,
+        torch_threads: Optional[int] = None,
+        ner_processes: int = 0,
+        retry_after: int = 1
+    ):
+        """
+        Args:
+            max_workers: Threads used for torch / in-process spaCy calls
+            max_queue_depth: Maximum in-flight inference requests before shedding load
+            torch_threads: Intra-op threads for torch (None keeps torch's default)
+            ner_processes: Size of the spaCy process pool (0 runs spaCy on the thread pool)
+            retry_after: Seconds suggested to clients in the Retry-After header
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.torch_threads = torch_threads
+        self.ner_processes = max(0, ner_processes)
+        self.retry_after = retry_after
+        self.depth = 0
+        self._threads = None
+        self._processes = None
+
+    def start(self, ner_model_path: Optional[str] = None) -> None:
+        """Create the executors (call once models are available)"""
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+
+        self._threads = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference"
+        )
+
+        if self.ner_processes and ner_model_path:
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.ner_processes,
+                initializer=_init_ner_worker,
+                initargs=(str(ner_model_path),)
+            )
+
+    def shutdown(self) -> None:
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Admit one request into the inference queue.
+
+        Raises:
+            InferenceSaturated: If max_queue_depth requests are already in flight
+        """
+        if self.depth >= self.max_queue_depth:
+            raise InferenceSaturated(self.retry_after)
+
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking function on the inference thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._threads, functools.partial(fn, *args, **kwargs))
+
+    async def run_ner(self, ner_model, text: str) -> List[Tuple[str, str, int, int]]:
+        """Extract entities, on the process pool when configured"""
+        if self._processes is not None:
+            loop = asyncio.get_running_loop()
+            return (await loop.run_in_executor(self._processes, _ner_worker, [text]))[0]
+        return await self.run(extract_entities, ner_model, text)
+
+    async def run_ner_many(self, ner_model, texts: List[str]) -> List[List[Tuple[str, str, int, int]]]:
+        """
+        Extract entities for several texts with nlp.pipe batching
+        With a process pool, texts are split into one contiguous slice per process
+        """
+        if self._processes is not None:
+            loop = asyncio.get_running_loop()
+            size = -(-len(texts) // self.ner_processes)
+            slices = await asyncio.gather(*[
+                loop.run_in_executor(self._processes, _ner_worker, texts[i:i + size])
+                for i in range(0, len(texts), size)
+            ])
+            return [ents for chunk in slices for ents in chunk]
+        return await self.run(pipe_entities, ner_model, texts, n_process=1)
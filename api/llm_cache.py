@@ -0,0 +1,262 @@
+"""
+Response cache for interview copilot LLM calls
+Replies to history-free turns depend only on the model, the system prompt, the context
+and the message, so identical questions are answered from memory instead of upstream.
+Concurrent identical misses share one upstream call (single-flight), and an optional
+semantic tier reuses the reply of a sufficiently similar earlier message.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from api.cache import normalize_text
+from api.chat_history import MESSAGE_OVERHEAD_TOKENS, estimate_tokens
+
+
+@dataclass(frozen=True)
+class LLMRequest:
+    """Everything a history-free reply depends on"""
+    model: str
+    system_prompt: str
+    context: str
+    message: str
+
+    @property
+    def scope(self) -> str:
+        """Hash of everything but the message: semantic matches never cross scopes"""
+        payload = "\x00".join([self.model, self.system_prompt, normalize_text(self.context).casefold()])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def normalized_message(self) -> str:
+        return normalize_text(self.message).casefold()
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(f"{self.scope}\x00{self.normalized_message}".encode("utf-8")).hexdigest()
+
+    @property
+    def prompt_tokens(self) -> int:
+        return (
+            estimate_tokens(self.system_prompt) + estimate_tokens(self.context) + estimate_tokens(self.message)
+            + 2 * MESSAGE_OVERHEAD_TOKENS
+        )
+
+
+class LLMResponseCache:
+    """
+    In-memory LRU + TTL cache of LLM replies with single-flight coalescing.
+    Used from the event loop only (no locking).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.0,
+        embed: Optional[Callable[[str], Any]] = None,
+        inflight_timeout: float = 120
+    ):
+        """
+        Args:
+            max_entries: Maximum cached replies (least recently used are evicted; 0 disables the cache)
+            ttl_seconds: Reply lifetime
+            similarity_threshold: Minimum cosine similarity for a semantic hit (0 disables the tier)
+            embed: Text -> vector function for the semantic tier (see set_embedder)
+            inflight_timeout: Seconds coalesced requests wait for the first one; an
+                in-flight call older than this is no longer joined
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embed = embed
+        self.inflight_timeout = inflight_timeout
+        # key -> (text, created_at, scope, vector, prompt_tokens, completion_tokens)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # key -> (future, started_at)
+        self._inflight: Dict[str, Tuple[asyncio.Future, float]] = {}
+        # Embeddings of in-flight misses, reused when their reply is stored
+        self._pending_vectors: Dict[str, np.ndarray] = {}
+        self._stats = {
+            "hits": 0, "semantic_hits": 0, "coalesced": 0, "misses": 0,
+            "saved_prompt_tokens": 0, "saved_completion_tokens": 0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.similarity_threshold > 0 and self.embed is not None
+
+    def set_embedder(self, embed: Callable[[str], Any]) -> None:
+        self.embed = embed
+
+    async def _vector(self, request: LLMRequest) -> Optional[np.ndarray]:
+        """Unit-length embedding of the normalized message (computed off the event loop)"""
+        if not self.semantic_enabled:
+            return None
+        try:
+            vector = np.asarray(await asyncio.to_thread(self.embed, request.normalized_message), dtype=np.float32)
+        except Exception as e:
+            # The exact tier keeps working without embeddings
+            print(f"⚠️ LLM cache embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _lookup(self, key: str) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _lookup_similar(self, scope: str, vector: np.ndarray) -> Optional[tuple]:
+        now = time.time()
+        candidates = [
+            (key, entry) for key, entry in self._entries.items()
+            if entry[2] == scope and entry[3] is not None and now - entry[1] <= self.ttl
+        ]
+        if not candidates:
+            return None
+        similarities = np.stack([entry[3] for _, entry in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        key, entry = candidates[best]
+        self._entries.move_to_end(key)
+        return entry
+
+    def _count_saved(self, entry: tuple) -> None:
+        self._stats["saved_prompt_tokens"] += entry[4]
+        self._stats["saved_completion_tokens"] += entry[5]
+
+    async def claim(self, request: LLMRequest) -> Tuple[Optional[str], Optional[asyncio.Future], bool]:
+        """
+        Look a request up before calling the LLM
+
+        Returns:
+            (text, None, False) on an exact or semantic hit;
+            (None, future, False) when an identical request is already in flight (await the future);
+            (None, future, True) on a miss: the caller generates the reply and must call
+            store() or release() with this future afterwards
+        """
+        key = request.key
+        entry = self._lookup(key)
+        if entry is not None:
+            self._stats["hits"] += 1
+            self._count_saved(entry)
+            return entry[0], None, False
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and time.monotonic() - inflight[1] < self.inflight_timeout:
+            self._stats["coalesced"] += 1
+            self._stats["saved_prompt_tokens"] += request.prompt_tokens
+            return None, inflight[0], False
+
+        # Registered before the (awaited) embedding, so identical requests coalesce meanwhile.
+        # A stale entry is replaced; its owner can no longer pop this one (see _finish)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, time.monotonic())
+        try:
+            vector = await self._vector(request)
+        except BaseException as e:
+            # Cancelled while embedding: nobody else would ever release the claim
+            self.release(request, e, future)
+            raise
+        if vector is not None:
+            entry = self._lookup_similar(request.scope, vector)
+            if entry is not None:
+                self._stats["semantic_hits"] += 1
+                self._count_saved(entry)
+                self._finish(key, future)
+                future.set_result(entry[0])
+                return entry[0], None, False
+            self._pending_vectors[key] = vector
+
+        self._stats["misses"] += 1
+        return None, future, True
+
+    def _finish(self, key: str, future: asyncio.Future) -> bool:
+        """Drop the in-flight entry for key if it still belongs to future"""
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight[0] is not future:
+            return False
+        del self._inflight[key]
+        return True
+
+    async def store(self, request: LLMRequest, text: str, future: asyncio.Future) -> None:
+        """Cache a generated reply and hand it to the requests coalesced on future"""
+        key = request.key
+        vector = self._pending_vectors.pop(key, None)
+        if vector is None:
+            vector = await self._vector(request)
+        self._entries[key] = (text, time.time(), request.scope, vector, request.prompt_tokens, estimate_tokens(text))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        self._finish(key, future)
+        if not future.done():
+            future.set_result(text)
+
+    def release(self, request: LLMRequest, error: BaseException, future: asyncio.Future) -> None:
+        """Generation failed: propagate the error to the requests coalesced on future"""
+        if self._finish(request.key, future):
+            self._pending_vectors.pop(request.key, None)
+        if not future.done():
+            if isinstance(error, asyncio.CancelledError):
+                # Followers were not cancelled themselves
+                error = RuntimeError("Identical in-flight request was cancelled")
+            future.set_exception(error)
+            future.exception()  # Nobody may be waiting; do not log it as unretrieved
+
+    async def wait(self, future: asyncio.Future) -> str:
+        """Reply of the identical in-flight request returned by claim()"""
+        text = await asyncio.wait_for(asyncio.shield(future), self.inflight_timeout)
+        self._stats["saved_completion_tokens"] += estimate_tokens(text)
+        return text
+
+    async def get_or_generate(self, request: LLMRequest, generate: Callable[[], Awaitable[str]]) -> Tuple[str, str]:
+        """
+        Cached reply, or the result of generate() shared with identical concurrent requests
+
+        Returns:
+            (text, source) with source "hit", "coalesced" or "miss"
+        """
+        text, future, leader = await self.claim(request)
+        if text is not None:
+            return text, "hit"
+        if not leader:
+            return await self.wait(future), "coalesced"
+
+        try:
+            text = await generate()
+        except BaseException as e:
+            self.release(request, e, future)
+            raise
+        await self.store(request, text, future)
+        return text, "miss"
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self._stats[k] for k in ("hits", "semantic_hits", "coalesced", "misses"))
+        return {
+            **self._stats,
+            "lookups": lookups,
+            "hit_rate": round((lookups - self._stats["misses"]) / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "semantic_enabled": self.semantic_enabled,
+            "similarity_threshold": self.similarity_threshold
+        }
@@ -3,21 +3,23 @@ FastAPI application for AI Resume Analyzer
 Serves trained NER and BERT models via REST API
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, Header, BackgroundTasks
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from fastapi.middleware.cors import CORSMiddleware
-import spacy
-from transformers import BertTokenizer, BertForSequenceClassification
-import torch
 from pathlib import Path
 import sys
 import os
 from datetime import datetime
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
 import re
+import gc
+import asyncio
+import hashlib
+import time
 from typing import List, Optional
+from dataclasses import asdict
 
 
 # Load environment variables
@@ -26,8 +28,16 @@ load_dotenv()
 # Add scripts directory to path
 sys.path.append(str(Path(__file__).parent.parent / "scripts"))
 
-from gap_analysis import perform_gap_analysis
+from gap_analysis import (
+    perform_gap_analysis,
+    parse_job_requirements,
+    extract_skills_from_text,
+    calculate_skill_match,
+    estimate_experience_years
+)
 from common_utils import load_pickle, extract_skills_keywords
+from skill_matcher import get_skill_matcher, set_taxonomy
+from ner_pipeline import load_ner_model, extract_entities
 
 # Import Pydantic models
 from api.models import (
@@ -38,20 +48,62 @@ from api.models import (
     ClassificationOutput,
     GapAnalysisOutput,
     AnalyzeResumeOutput,
+    BatchResumeInput,
+    BatchAnalyzeResumeOutput,
     HealthResponse,
     ChatInput,
 
     ChatResponse,
     SessionSchema,
+    SessionSummarySchema,
+    MessagePage,
     CreateSessionResponse,
     RankingInput,
-    RankingOutput
+    RankingOutput,
+    RankingListItem,
+    RankingWeightsInput,
+    RankingWeightsOutput,
+    RerankOutput,
+    TopRankingsOutput,
+    SkillTaxonomy,
+    TaxonomyInfo,
+    JobProfileOutput,
+    CandidateInput,
+    MatchCandidatesInput,
+    MatchCandidatesOutput
 )
 from api import db_models
-from api.database import engine, get_db
-from sqlalchemy.orm import Session
+from api.database import get_db, SessionLocal
+from api.migrations import migrate_database
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
 from fastapi import Depends, Query
-from api.ranking import calculate_ranking_score, SuitabilityLabels
+from fastapi.concurrency import run_in_threadpool
+import json
+from api.ranking import calculate_ranking_score, RankingWeights, SuitabilityLabels
+from api.batching import MicroBatcher
+from api.inference import InferencePool, InferenceSaturated
+from api.cache import ResultCache, create_result_cache, model_fingerprint, normalize_text
+from api.ranking_store import (
+    RERANK_METHODS,
+    bulk_upsert_rankings,
+    load_ranking_weights,
+    query_rankings_page,
+    rerank_job,
+    save_ranking_weights,
+    top_rankings,
+    upsert_ranking
+)
+from api.llm_cache import LLMRequest, LLMResponseCache
+from api.resilience import CircuitBreaker, CircuitOpen, UpstreamTimeout, retry_async
+from api.chat_history import (
+    build_context,
+    chat_role,
+    load_session_history,
+    save_summary,
+    summary_request,
+    turns_to_summarize
+)
 
 
 # Initialize FastAPI app
@@ -68,69 +120,309 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Retry-After"],
 )
 
 
-# Create Tables
-db_models.Base.metadata.create_all(bind=engine)
+# Schema migrations (tables, columns, indexes) run from the startup hook, not at import.
+# Workers starting together take turns and the later ones find nothing to do; set
+# DB_MIGRATE_ON_STARTUP=0 when scripts/migrate_db.py runs once before the workers start
+DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "1") == "1"
 
 # Globals
 
 ner_model = None
 bert_model = None
 bert_tokenizer = None
+fast_model = None
+fast_tokenizer = None
 label_mapping = None
 device = None
 openai_client = None
+embedding_model = None
+
+# Inference worker pool (keeps blocking model calls off the event loop)
+inference_pool = InferencePool(
+    max_workers=int(os.getenv("INFERENCE_WORKERS", "4")),
+    max_queue_depth=int(os.getenv("INFERENCE_MAX_QUEUE", "64")),
+    torch_threads=int(os.getenv("TORCH_NUM_THREADS", "0")) or None,
+    ner_processes=int(os.getenv("NER_PROCESSES", "0")),
+    retry_after=int(os.getenv("INFERENCE_RETRY_AFTER", "1"))
+)
 
+# Cache of NER entities and classification logits, keyed by text + model version
+result_cache = create_result_cache()
 
-# -------------------- STARTUP --------------------
+# Parsed job profiles, cached in memory in front of the job_profiles table
+job_profile_cache = ResultCache(
+    max_entries=int(os.getenv("JOB_PROFILE_CACHE_SIZE", "1000")),
+    ttl_seconds=float(os.getenv("JOB_PROFILE_CACHE_TTL", "300"))
+)
 
+# Interview copilot replies to history-free turns (LLM_CACHE_SIZE=0 disables). The
+# semantic tier reuses the reply to an earlier message whose embedding (computed with
+# JOB_EMBEDDING_MODEL) has at least LLM_CACHE_SIMILARITY cosine similarity (0 disables)
+llm_cache = LLMResponseCache(
+    max_entries=int(os.getenv("LLM_CACHE_SIZE", "1000")),
+    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "3600")),
+    similarity_threshold=float(os.getenv("LLM_CACHE_SIMILARITY", "0"))
+)
 
-@app.on_event("startup")
-async def load_models():
-    global ner_model, bert_model, bert_tokenizer, label_mapping, device, openai_client
+# Partial credit for skills covered via the taxonomy hierarchy (0 disables)
+SKILL_PARTIAL_CREDIT = float(os.getenv("SKILL_PARTIAL_CREDIT", "0"))
+
+# Candidates scored between progress updates in /jobs/{job_id}/match-candidates
+MATCH_CHUNK_SIZE = int(os.getenv("MATCH_CHUNK_SIZE", "64"))
+
+# GET /rankings page size when a cursor is sent without a limit
+RANKINGS_PAGE_SIZE = int(os.getenv("RANKINGS_PAGE_SIZE", "50"))
+
+# BERT classifier backend: torch (fp32), int8 (dynamic quantization) or onnx (onnxruntime)
+BERT_BACKEND = os.getenv("BERT_BACKEND", "torch")
+BERT_ONNX_PATH = os.getenv("BERT_ONNX_PATH") or None
+
+# Memory-map BERT weights straight from model.safetensors, so all workers on a
+# machine share one copy in the page cache (torch backend on CPU)
+BERT_MMAP_WEIGHTS = os.getenv("BERT_MMAP_WEIGHTS", "1") == "1"
+
+# Interview copilot LLM (any OpenAI-compatible endpoint)
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+CHAT_MODEL = os.getenv("CHAT_MODEL", "meta-llama/llama-3.1-8b-instruct")
+
+# OpenRouter HTTP client: keep-alive connection pool and timeouts (seconds). Transient
+# failures (timeouts, connection errors, 429, 5xx) are retried with jittered backoff;
+# the circuit breaker fails fast with 503 while the upstream error rate is too high
+OPENROUTER_MAX_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "50"))
+OPENROUTER_MAX_KEEPALIVE = int(os.getenv("OPENROUTER_MAX_KEEPALIVE", "20"))
+OPENROUTER_KEEPALIVE_EXPIRY = float(os.getenv("OPENROUTER_KEEPALIVE_EXPIRY", "30"))
+OPENROUTER_CONNECT_TIMEOUT = float(os.getenv("OPENROUTER_CONNECT_TIMEOUT", "5"))
+OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "30"))
+OPENROUTER_MAX_RETRIES = int(os.getenv("OPENROUTER_MAX_RETRIES", "2"))
+OPENROUTER_RETRY_BASE_DELAY = float(os.getenv("OPENROUTER_RETRY_BASE_DELAY", "0.5"))
+OPENROUTER_RETRY_MAX_DELAY = float(os.getenv("OPENROUTER_RETRY_MAX_DELAY", "8"))
+
+openrouter_breaker = CircuitBreaker(
+    "OpenRouter",
+    failure_threshold=float(os.getenv("OPENROUTER_CIRCUIT_THRESHOLD", "0.5")),
+    window=int(os.getenv("OPENROUTER_CIRCUIT_WINDOW", "20")),
+    min_calls=int(os.getenv("OPENROUTER_CIRCUIT_MIN_CALLS", "10")),
+    reset_timeout=float(os.getenv("OPENROUTER_CIRCUIT_RESET", "30"))
+)
 
+# Server-side chat history: estimated prompt token budget per turn. When older turns
+# no longer fit, they are folded into the session's rolling summary together with
+# enough recent ones to leave CHAT_SUMMARY_KEEP_TOKENS of turns verbatim
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "3000"))
+CHAT_SUMMARY_KEEP_TOKENS = int(os.getenv("CHAT_SUMMARY_KEEP_TOKENS", str(CHAT_HISTORY_TOKEN_BUDGET // 3)))
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "400"))
+
+# Micro-batching of BERT inference (each tier keeps up to INFERENCE_WORKERS batches in flight)
+BERT_MAX_BATCH_SIZE = int(os.getenv("BERT_MAX_BATCH_SIZE", "16"))
+BERT_MAX_WAIT_MS = float(os.getenv("BERT_MAX_WAIT_MS", "5"))
+
+
+def classify_batch(texts):
+    from api.classifier import classify_texts
+    return classify_texts(
+        texts, bert_model, bert_tokenizer, device, label_mapping,
+        batch_size=BERT_MAX_BATCH_SIZE
+    )
+
+
+# Distilled "fast" tier (scripts/distill_bert_model.py). Tiers: full, fast, or auto
+# (fast first, escalating to the full model when confidence is below the threshold)
+BERT_DEFAULT_TIER = os.getenv("BERT_DEFAULT_TIER", "full")
+BERT_ESCALATION_THRESHOLD = float(os.getenv("BERT_ESCALATION_THRESHOLD", "0.7"))
+
+# Predictions computed per tier, time spent in each, and auto-tier escalations
+tier_stats = {
+    "predictions": {"fast": 0, "full": 0},
+    "seconds": {"fast": 0.0, "full": 0.0},
+    "auto": 0,
+    "escalated": 0
+}
+
+
+def classify_fast_batch(texts):
+    from api.classifier import classify_texts
+    return classify_texts(
+        texts, fast_model, fast_tokenizer, device, label_mapping,
+        batch_size=BERT_MAX_BATCH_SIZE
+    )
+
+
+# Chunked (sliding-window) classification of long resumes
+BERT_MAX_CHUNKS = int(os.getenv("BERT_MAX_CHUNKS", "8"))
+BERT_CHUNK_STRIDE = int(os.getenv("BERT_CHUNK_STRIDE", "128"))
+
+
+def classify_chunked_batch(texts, aggregation="mean"):
+    from api.classifier import classify_chunked
+    return classify_chunked(
+        texts, bert_model, bert_tokenizer, device, label_mapping,
+        aggregation=aggregation,
+        stride=BERT_CHUNK_STRIDE,
+        max_chunks=BERT_MAX_CHUNKS,
+        batch_size=BERT_MAX_BATCH_SIZE
+    )
+
+
+bert_batcher = MicroBatcher(
+    classify_batch,
+    max_batch_size=BERT_MAX_BATCH_SIZE,
+    max_wait_ms=BERT_MAX_WAIT_MS,
+    runner=inference_pool.run,
+    max_concurrent_batches=inference_pool.max_workers
+)
+
+fast_batcher = MicroBatcher(
+    classify_fast_batch,
+    max_batch_size=BERT_MAX_BATCH_SIZE,
+    max_wait_ms=BERT_MAX_WAIT_MS,
+    runner=inference_pool.run,
+    max_concurrent_batches=inference_pool.max_workers
+)
+
+
+@app.exception_handler(InferenceSaturated)
+async def inference_saturated_handler(request: Request, exc: InferenceSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Inference queue is full, retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
+
+# -------------------- STARTUP --------------------
+# torch, transformers, spaCy and openai are imported when models are loaded, not
+# when this module is imported, so a new worker answers /health right away.
+# Models load in the background (MODEL_WARMUP=blocking waits for them at startup)
+# and /ready reports when they can serve traffic.
+#
+# With PRELOAD_MODELS=1 the weights are loaded at import time instead, so running
+#   gunicorn api.main:app -k uvicorn.workers.UvicornWorker --preload -w 4
+# loads them once in the master and forked workers share them copy-on-write.
+
+BASE_DIR = Path(__file__).parent.parent
+NER_PATH = BASE_DIR / "models/ner_model_best"
+BERT_PATH = BASE_DIR / "models/bert_classifier_best"
+FAST_PATH = BASE_DIR / "models/bert_classifier_fast"
+LABEL_PATH = BASE_DIR / "data/label_mapping.pkl"
+
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "background")
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "0") == "1"
+
+model_status = {
+    "ready": False,
+    "preloaded": False,
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "error": None
+}
+warmup_future = None
+
+
+def load_model_weights():
+    """Load the NER model, BERT tiers, label mapping and optional embedding model (blocking, runs once)"""
+    global ner_model, bert_model, bert_tokenizer, fast_model, fast_tokenizer
+    global label_mapping, device, embedding_model
+
+    if model_status["load_seconds"] is not None:
+        return
+
+    start = time.perf_counter()
     print("🔹 Loading models...")
 
+    import torch
+    from api.classifier import load_classifier
+
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
     print(f"🔹 Device: {device}")
 
     # NER
-    base_dir = Path(__file__).parent.parent
-    ner_path = base_dir / "models/ner_model_best"
-    if ner_path.exists():
-        ner_model = spacy.load(ner_path)
+    if NER_PATH.exists():
+        ner_model = load_ner_model(NER_PATH)
         print("✅ NER loaded")
     else:
         print("⚠️ NER model not found")
 
     # BERT
-    bert_path = base_dir / "models/bert_classifier_best"
-    if bert_path.exists():
-        bert_tokenizer = BertTokenizer.from_pretrained(bert_path)
-        bert_model = BertForSequenceClassification.from_pretrained(bert_path)
-        bert_model.to(device).eval()
-        print("✅ BERT loaded")
+    if BERT_PATH.exists():
+        try:
+            bert_model, bert_tokenizer = load_classifier(
+                BERT_PATH,
+                backend=BERT_BACKEND,
+                device=device,
+                onnx_path=BERT_ONNX_PATH,
+                num_threads=inference_pool.torch_threads,
+                mmap_weights=BERT_MMAP_WEIGHTS
+            )
+            if BERT_BACKEND != "torch":
+                # Quantized and ONNX backends run on CPU
+                device = torch.device("cpu")
+            print(f"✅ BERT loaded ({BERT_BACKEND} backend)")
+        except Exception as e:
+            print(f"❌ Failed to load BERT ({BERT_BACKEND} backend): {e}")
     else:
         print("⚠️ BERT model not found")
 
+    # Distilled fast tier (optional)
+    if FAST_PATH.exists():
+        try:
+            fast_model, fast_tokenizer = load_classifier(
+                FAST_PATH,
+                backend=BERT_BACKEND,
+                device=device,
+                num_threads=inference_pool.torch_threads,
+                mmap_weights=BERT_MMAP_WEIGHTS
+            )
+            print(f"✅ Fast BERT tier loaded (default tier: {BERT_DEFAULT_TIER})")
+        except Exception as e:
+            print(f"❌ Failed to load fast BERT tier: {e}")
+
     # Labels
-    label_path = base_dir / "data/label_mapping.pkl"
-    if label_path.exists():
-        label_mapping = load_pickle(label_path)
+    if LABEL_PATH.exists():
+        label_mapping = load_pickle(LABEL_PATH)
         print(f"✅ Label mapping loaded ({len(label_mapping)})")
     else:
         print("⚠️ Label mapping not found")
 
+    # Optional job embeddings for stored job profiles
+    embedding_name = os.getenv("JOB_EMBEDDING_MODEL")
+    if embedding_name:
+        try:
+            from sentence_transformers import SentenceTransformer
+            embedding_model = SentenceTransformer(embedding_name, device=str(device))
+            llm_cache.set_embedder(embedding_model.encode)
+            print(f"✅ Job embedding model loaded ({embedding_name})")
+        except Exception as e:
+            print(f"⚠️ Job embedding model unavailable: {e}")
+
+    model_status["load_seconds"] = round(time.perf_counter() - start, 3)
+
+
+def init_openai_client():
+    global openai_client
+
     # OpenRouter (OpenAI Compatible)
     api_key = os.getenv("OPENROUTER_API_KEY")
     if api_key:
         try:
-            openai_client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
+            import httpx
+            from openai import AsyncOpenAI
+            openai_client = AsyncOpenAI(
+                base_url=OPENROUTER_BASE_URL,
                 api_key=api_key,
+                # Retries are done by create_chat_completion, under the circuit breaker
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=OPENROUTER_MAX_CONNECTIONS,
+                        max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE,
+                        keepalive_expiry=OPENROUTER_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=httpx.Timeout(OPENROUTER_TIMEOUT, connect=OPENROUTER_CONNECT_TIMEOUT)
+                )
             )
             print("✅ OpenRouter (OpenAI) initialized")
         except Exception as e:
@@ -139,6 +431,103 @@ async def load_models():
         print("⚠️ OPENROUTER_API_KEY missing")
 
 
+def warm_up_models():
+    """Run each model once so the first request does not pay for lazy initialization"""
+    sample = "Python developer with 5 years of experience in machine learning, SQL and Docker."
+    if ner_model:
+        extract_entities(ner_model, sample)
+    if bert_model and label_mapping:
+        classify_batch([sample])
+    if fast_model and label_mapping:
+        classify_fast_batch([sample])
+
+
+def prepare_models():
+    """Load (unless preloaded) and warm up the models, then mark the service ready once the required ones are loaded"""
+    try:
+        load_model_weights()
+
+        # Entries produced by other model versions are invalidated
+        # (the backend is part of the version, as quantization slightly changes logits;
+        # the ONNX export may live outside BERT_PATH and be re-exported on its own)
+        model_files = [NER_PATH, BERT_PATH, FAST_PATH, LABEL_PATH, BERT_ONNX_PATH or BERT_PATH / "model.onnx"]
+        result_cache.set_model_version(f"{model_fingerprint(model_files)}-{BERT_BACKEND}")
+        print(f"✅ Result cache ready (model version {result_cache.model_version})")
+
+        init_openai_client()
+
+        start = time.perf_counter()
+        warm_up_models()
+        model_status["warmup_seconds"] = round(time.perf_counter() - start, 3)
+
+        # load_model_weights only warns about missing models; without these nothing can be served
+        required = {"ner": ner_model, "bert": bert_model, "label_mapping": label_mapping}
+        missing = [name for name, value in required.items() if value is None]
+        if missing:
+            model_status["error"] = f"Required models not loaded: {', '.join(missing)}"
+            print(f"❌ Not ready: {model_status['error']}")
+            return
+
+        model_status["ready"] = True
+        print("✅ Models ready")
+    except Exception as e:
+        model_status["error"] = str(e)
+        print(f"❌ Model warm-up failed: {e}")
+
+
+if PRELOAD_MODELS:
+    load_model_weights()
+    model_status["preloaded"] = True
+    # Keep the garbage collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+
+
+@app.exception_handler(CircuitOpen)
+async def circuit_open_handler(request: Request, exc: CircuitOpen):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after + 0.5))}
+    )
+
+
+@app.exception_handler(UpstreamTimeout)
+async def upstream_timeout_handler(request: Request, exc: UpstreamTimeout):
+    return JSONResponse(
+        status_code=504,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.5)))}
+    )
+
+
+@app.on_event("startup")
+async def load_models():
+    global warmup_future
+
+    if DB_MIGRATE_ON_STARTUP:
+        await run_in_threadpool(migrate_database)
+        print("✅ Database schema up to date")
+
+    # Executors are per process, so they are created here rather than before a fork
+    inference_pool.start(NER_PATH if NER_PATH.exists() else None)
+    print(f"✅ Inference pool ready ({inference_pool.max_workers} threads, {inference_pool.ner_processes} NER processes)")
+
+    loop = asyncio.get_running_loop()
+    warmup_future = loop.run_in_executor(None, prepare_models)
+    if MODEL_WARMUP == "blocking":
+        await warmup_future
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await bert_batcher.close()
+    await fast_batcher.close()
+    inference_pool.shutdown()
+    result_cache.close()
+    if openai_client:
+        await openai_client.close()
+
+
 # -------------------- BASIC --------------------
 
 @app.get("/")
@@ -149,6 +538,62 @@ async def root():
     }
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return {"results": result_cache.stats(), "llm": llm_cache.stats()}
+
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """OpenRouter circuit breaker state and client settings"""
+    return {
+        "circuit": openrouter_breaker.stats(),
+        "client": {
+            "max_connections": OPENROUTER_MAX_CONNECTIONS,
+            "max_keepalive_connections": OPENROUTER_MAX_KEEPALIVE,
+            "connect_timeout": OPENROUTER_CONNECT_TIMEOUT,
+            "timeout": OPENROUTER_TIMEOUT,
+            "max_retries": OPENROUTER_MAX_RETRIES
+        }
+    }
+
+
+@app.get("/classifier/stats")
+async def classifier_stats():
+    """Per-tier prediction counts and throughput, and the auto-tier escalation rate"""
+    return {
+        "default_tier": BERT_DEFAULT_TIER,
+        "fast_tier_loaded": fast_model is not None,
+        "escalation_threshold": BERT_ESCALATION_THRESHOLD,
+        "tiers": {
+            tier: {
+                "predictions": count,
+                "docs_per_sec": round(count / tier_stats["seconds"][tier], 2) if tier_stats["seconds"][tier] else 0.0
+            }
+            for tier, count in tier_stats["predictions"].items()
+        },
+        "auto_predictions": tier_stats["auto"],
+        "escalated": tier_stats["escalated"],
+        "escalation_rate": round(tier_stats["escalated"] / tier_stats["auto"], 4) if tier_stats["auto"] else 0.0
+    }
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once models are loaded and warmed up, 503 before (use /health for liveness)"""
+    return JSONResponse(
+        status_code=200 if model_status["ready"] else 503,
+        content={
+            **model_status,
+            "models_loaded": {
+                "ner": ner_model is not None,
+                "bert": bert_model is not None,
+                "bert_fast": fast_model is not None
+            }
+        }
+    )
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health():
     return {
@@ -156,6 +601,7 @@ async def health():
         "models_loaded": {
             "ner": ner_model is not None,
             "bert": bert_model is not None,
+            "bert_fast": fast_model is not None,
             "openai": openai_client is not None
         }
     }
@@ -248,93 +694,503 @@ def calculate_ats_score(text: str, skills: list, role: str) -> dict:
         "feedback": feedback
     }
 
+def build_ner_output(text: str, entities: list) -> NEROutput:
+    skills, experience, designations = [], [], []
+    for ent_text, label, _, _ in entities:
+        if label == "SKILLS":
+            skills.append(ent_text)
+        elif label == "EXPERIENCE":
+            experience.append(ent_text)
+        elif label == "DESIGNATION":
+            designations.append(ent_text)
+
+    # Hybrid skill extraction
+    keywords = extract_skills_keywords(text)
+    skills = list(set(skills + keywords))
+
+    return NEROutput(
+        entities=[],
+        skills=skills,
+        experience=experience,
+        designations=designations
+    )
+
+
+def build_analysis(
+    text: str,
+    ner_output: NEROutput,
+    prediction: dict,
+    top_predictions: Optional[list] = None,
+    include_logits: bool = False
+) -> AnalyzeResumeOutput:
+    classification = ClassificationOutput(
+        predicted_role=prediction["predicted_role"],
+        confidence=prediction["confidence"],
+        top_predictions=top_predictions or [],
+        chunks_used=prediction.get("chunks_used", 1),
+        tier=prediction.get("tier", "full"),
+        escalated=prediction.get("escalated", False),
+        logits=prediction["logits"] if include_logits else None
+    )
+
+    # Calculate ATS Score
+    ats_result = calculate_ats_score(text, ner_output.skills, classification.predicted_role)
+
+    return AnalyzeResumeOutput(
+        ner_results=ner_output,
+        classification=classification,
+        ats_score=ats_result["score"],
+        ats_level=ats_result["level"],
+        feedback=ats_result["feedback"]
+    )
+
+
+def get_top_predictions(resumes: List[ResumeInput], predictions: List[dict]) -> List[list]:
+    """Top-k roles for each resume from the (possibly cached) logits, in one pass"""
+    from api.classifier import top_k_predictions
+    tops = top_k_predictions(
+        [p["logits"] for p in predictions],
+        label_mapping,
+        k=max(r.top_k for r in resumes)
+    )
+    return [top[:r.top_k] for r, top in zip(resumes, tops)]
+
+
+def resolve_tier(resume: ResumeInput) -> str:
+    """Tier that serves a resume (chunked mode and a missing fast model fall back to full)"""
+    tier = resume.tier or BERT_DEFAULT_TIER
+    if resume.chunked or fast_model is None:
+        return "full"
+    return tier
+
+
+def prediction_namespace(resume: ResumeInput) -> str:
+    """Cache namespace for a classification (chunked settings and the tier change the result)"""
+    if resume.chunked:
+        return f"cls:chunked:{resume.chunk_aggregation}:{BERT_MAX_CHUNKS}:{BERT_CHUNK_STRIDE}"
+    tier = resolve_tier(resume)
+    if tier == "fast":
+        return "cls:fast"
+    if tier == "auto":
+        return f"cls:auto:{BERT_ESCALATION_THRESHOLD}"
+    return "cls"
+
+
+async def classify_on_tier(texts: List[str], tier: str) -> List[dict]:
+    """Classify with the fast or full model; single texts are coalesced by the tier's batcher"""
+    start = time.perf_counter()
+    if len(texts) == 1:
+        batcher = fast_batcher if tier == "fast" else bert_batcher
+        predictions = [await batcher.submit(texts[0])]
+    else:
+        fn = classify_fast_batch if tier == "fast" else classify_batch
+        predictions = await inference_pool.run(fn, texts)
+
+    tier_stats["predictions"][tier] += len(texts)
+    tier_stats["seconds"][tier] += time.perf_counter() - start
+    return [{**prediction, "tier": tier} for prediction in predictions]
+
+
+async def get_entities(texts: List[str]) -> List[list]:
+    """NER entities for each text, served from the result cache where possible"""
+    entities = [result_cache.get("ner", text) for text in texts]
+    misses = [i for i, ents in enumerate(entities) if ents is None]
+
+    if misses:
+        if len(misses) == 1:
+            computed = [await inference_pool.run_ner(ner_model, texts[misses[0]])]
+        else:
+            computed = await inference_pool.run_ner_many(ner_model, [texts[i] for i in misses])
+        for i, ents in zip(misses, computed):
+            result_cache.set("ner", texts[i], ents)
+            entities[i] = ents
+
+    return entities
+
+
+async def get_predictions(resumes: List[ResumeInput]) -> List[dict]:
+    """Role predictions for each resume, served from the result cache where possible"""
+    predictions = [result_cache.get(prediction_namespace(r), r.text) for r in resumes]
+
+    # Chunked resumes and each tier are classified in separate groups;
+    # each group is bucketed by token length to minimize padding
+    groups = {}
+    for i, resume in enumerate(resumes):
+        if predictions[i] is None:
+            key = f"chunked:{resume.chunk_aggregation}" if resume.chunked else resolve_tier(resume)
+            groups.setdefault(key, []).append(i)
+
+    for key, indices in groups.items():
+        group_texts = [resumes[i].text for i in indices]
+        if key.startswith("chunked:"):
+            computed = await inference_pool.run(classify_chunked_batch, group_texts, key.split(":", 1)[1])
+        elif key == "auto":
+            computed = await classify_on_tier(group_texts, "fast")
+
+            # Only resumes the student is unsure about go to the full model
+            unsure = [j for j, p in enumerate(computed) if p["confidence"] < BERT_ESCALATION_THRESHOLD]
+            if unsure:
+                escalated = await classify_on_tier([group_texts[j] for j in unsure], "full")
+                for j, prediction in zip(unsure, escalated):
+                    computed[j] = {**prediction, "escalated": True}
+
+            tier_stats["auto"] += len(indices)
+            tier_stats["escalated"] += len(unsure)
+        else:
+            computed = await classify_on_tier(group_texts, key)
+
+        for i, prediction in zip(indices, computed):
+            result_cache.set(prediction_namespace(resumes[i]), resumes[i].text, prediction)
+            predictions[i] = prediction
+
+    return predictions
+
+
 @app.post("/analyze-resume", response_model=AnalyzeResumeOutput)
 async def analyze_resume(resume: ResumeInput):
 
     if not ner_model or not bert_model:
         raise HTTPException(status_code=503, detail="Models not loaded")
 
-    try:
-        doc = ner_model(resume.text)
-
-        skills, experience, designations = [], [], []
-        for ent in doc.ents:
-            if ent.label_ == "SKILLS":
-                skills.append(ent.text)
-            elif ent.label_ == "EXPERIENCE":
-                experience.append(ent.text)
-            elif ent.label_ == "DESIGNATION":
-                designations.append(ent.text)
-
-        # Hybrid skill extraction
-        keywords = extract_skills_keywords(resume.text)
-        skills = list(set(skills + keywords))
-
-        ner_output = NEROutput(
-            entities=[],
-            skills=skills,
-            experience=experience,
-            designations=designations
-        )
+    async with inference_pool.slot():
+        try:
+            entities = (await get_entities([resume.text]))[0]
+            prediction = (await get_predictions([resume]))[0]
+            top_predictions = get_top_predictions([resume], [prediction])[0]
+
+            return build_analysis(
+                resume.text,
+                build_ner_output(resume.text, entities),
+                prediction,
+                top_predictions=top_predictions,
+                include_logits=resume.include_logits
+            )
 
-        encoding = bert_tokenizer.encode_plus(
-            resume.text,
-            max_length=512,
-            truncation=True,
-            padding="max_length",
-            return_tensors="pt"
-        )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
-        with torch.no_grad():
-            outputs = bert_model(
-                input_ids=encoding["input_ids"].to(device),
-                attention_mask=encoding["attention_mask"].to(device)
-            )
-            probs = torch.softmax(outputs.logits, dim=1)
 
-        top_prob, top_idx = torch.max(probs, dim=1)
-        role = label_mapping[top_idx.item()]
+@app.post("/analyze-resume/batch", response_model=BatchAnalyzeResumeOutput)
+async def analyze_resume_batch(batch: BatchResumeInput):
 
-        classification = ClassificationOutput(
-            predicted_role=role,
-            confidence=round(top_prob.item(), 4),
-            top_predictions=[]
-        )
-        
-        # Calculate ATS Score
-        ats_result = calculate_ats_score(resume.text, skills, role)
-
-        return AnalyzeResumeOutput(
-            ner_results=ner_output,
-            classification=classification,
-            ats_score=ats_result["score"],
-            ats_level=ats_result["level"],
-            feedback=ats_result["feedback"]
-        )
+    if not ner_model or not bert_model:
+        raise HTTPException(status_code=503, detail="Models not loaded")
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    async with inference_pool.slot():
+        try:
+            texts = [resume.text for resume in batch.resumes]
+
+            entities = await get_entities(texts)
+            predictions = await get_predictions(batch.resumes)
+            top_predictions = get_top_predictions(batch.resumes, predictions)
+
+            return BatchAnalyzeResumeOutput(results=[
+                build_analysis(
+                    resume.text,
+                    build_ner_output(resume.text, ents),
+                    prediction,
+                    top_predictions=top,
+                    include_logits=resume.include_logits
+                )
+                for resume, ents, prediction, top in zip(batch.resumes, entities, predictions, top_predictions)
+            ])
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 # -------------------- MATCHING --------------------
 
 @app.post("/match-job", response_model=GapAnalysisOutput)
-async def match_job(data: ResumeJobInput):
+async def match_job(data: ResumeJobInput, db: Session = Depends(get_db)):
 
     if not ner_model:
         raise HTTPException(status_code=503, detail="NER model not loaded")
 
+    job_requirements = None
+    if data.job_id:
+        profile = await run_in_threadpool(load_job_profile, data.job_id, db)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Job profile not found")
+        job_requirements = {
+            "required_skills": set(profile["required_skills"]),
+            "required_experience": profile["required_experience"],
+            "job_text": None
+        }
+
+    async with inference_pool.slot():
+        try:
+            entities = (await get_entities([data.resume_text]))[0]
+            report = await inference_pool.run(
+                perform_gap_analysis,
+                resume_text=data.resume_text,
+                job_description=data.job_description,
+                ner_model=ner_model,
+                partial_credit=SKILL_PARTIAL_CREDIT,
+                resume_entities=entities,
+                job_requirements=job_requirements
+            )
+            return report
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+
+# -------------------- JOB PROFILES --------------------
+
+def save_job_profile(job_id: str, job_text: str, db: Session) -> db_models.JobProfile:
+    requirements = parse_job_requirements(job_text)
+
+    embedding = None
+    if embedding_model is not None:
+        embedding = json.dumps(embedding_model.encode(job_text).tolist())
+
+    profile = db.query(db_models.JobProfile).filter(db_models.JobProfile.job_id == job_id).first()
+    if profile is None:
+        profile = db_models.JobProfile(job_id=job_id)
+        db.add(profile)
+
+    profile.job_text = job_text
+    profile.required_skills = ",".join(sorted(requirements["required_skills"]))
+    profile.required_experience = requirements["required_experience"]
+    profile.taxonomy_version = get_skill_matcher().version
+    profile.embedding = embedding
+    profile.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(profile)
+
+    job_profile_cache.set("job", job_id, profile_to_dict(profile))
+    return profile
+
+
+def profile_to_dict(profile: db_models.JobProfile) -> dict:
+    return {
+        "job_id": profile.job_id,
+        "required_skills": profile.required_skills.split(",") if profile.required_skills else [],
+        "required_experience": profile.required_experience or 0,
+        "taxonomy_version": profile.taxonomy_version,
+        "has_embedding": profile.embedding is not None,
+        "updated_at": profile.updated_at.isoformat() if profile.updated_at else None
+    }
+
+
+def load_job_profile(job_id: str, db: Session) -> Optional[dict]:
+    """
+    Stored job profile, served from memory when possible.
+    Profiles parsed with an older skill taxonomy are re-parsed from the stored text.
+    """
+    taxonomy_version = get_skill_matcher().version
+
+    profile = job_profile_cache.get("job", job_id)
+    if profile is not None and profile["taxonomy_version"] == taxonomy_version:
+        return profile
+
+    row = db.query(db_models.JobProfile).filter(db_models.JobProfile.job_id == job_id).first()
+    if row is None:
+        return None
+    if row.taxonomy_version != taxonomy_version:
+        row = save_job_profile(job_id, row.job_text, db)
+
+    profile = profile_to_dict(row)
+    job_profile_cache.set("job", job_id, profile)
+    return profile
+
+
+@app.post("/jobs/{job_id}/profile", response_model=JobProfileOutput)
+def create_job_profile(job_id: str, job: JobInput, db: Session = Depends(get_db)):
+    """
+    Parse a job description once and store its requirements,
+    so /match-job can be called with job_id instead of the full text
+    """
     try:
-        report = perform_gap_analysis(
-            resume_text=data.resume_text,
-            job_description=data.job_description,
-            ner_model=ner_model
-        )
-        return report
+        return profile_to_dict(save_job_profile(job_id, job.description, db))
+    except Exception as e:
+        print(f"Job Profile Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/jobs/{job_id}/profile", response_model=JobProfileOutput)
+def get_job_profile(job_id: str, db: Session = Depends(get_db)):
+    profile = load_job_profile(job_id, db)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Job profile not found")
+    return profile
+
+
+# -------------------- BULK CANDIDATE MATCHING --------------------
+
+def candidate_key(candidate: CandidateInput) -> str:
+    """Candidate id, or a stable hash of the resume text when none is given"""
+    if candidate.candidate_id:
+        return candidate.candidate_id
+    return hashlib.sha256(normalize_text(candidate.resume_text).encode("utf-8")).hexdigest()[:16]
+
+
+def score_candidate(text: str, entities: list, prediction: dict, job_requirements: dict) -> dict:
+    """Skill match, experience, role confidence and ATS score combined into a ranking"""
+    resume_skills = extract_skills_from_text(text, None, entities=entities)
+    skill_match = calculate_skill_match(
+        resume_skills, job_requirements["required_skills"], partial_credit=SKILL_PARTIAL_CREDIT
+    )
+
+    ner_output = build_ner_output(text, entities)
+    ats_result = calculate_ats_score(text, ner_output.skills, prediction["predicted_role"])
+
+    result = calculate_ranking_score(
+        skill_match_percentage=skill_match["match_percentage"],
+        experience_years=estimate_experience_years(text, entities),
+        required_experience=job_requirements["required_experience"],
+        role_confidence=prediction["confidence"],
+        ats_score=ats_result["score"],
+        weights=job_requirements["weights"]
+    )
+    return {"result": result, "missing_skills": skill_match["missing_skills"]}
+
 
+async def match_candidates_events(job_id: str, candidates: List[CandidateInput], job_requirements: dict):
+    """
+    Score candidates chunk by chunk, yielding progress events, then persist all
+    rankings in one transaction and yield the ranked result as the final event
+    """
+    async with inference_pool.slot():
+        total = len(candidates)
+        yield {"event": "started", "job_id": job_id, "total": total}
+
+        scored = []
+        for start in range(0, total, MATCH_CHUNK_SIZE):
+            chunk = candidates[start:start + MATCH_CHUNK_SIZE]
+            texts = [c.resume_text for c in chunk]
+
+            entities = await get_entities(texts)
+            predictions = await get_predictions([ResumeInput(text=text) for text in texts])
+            rankings = await inference_pool.run(lambda: [
+                score_candidate(text, ents, prediction, job_requirements)
+                for text, ents, prediction in zip(texts, entities, predictions)
+            ])
+
+            for candidate, ranking in zip(chunk, rankings):
+                ranking["candidate_id"] = candidate_key(candidate)
+                scored.append(ranking)
+            yield {"event": "progress", "processed": len(scored), "total": total}
+
+    created_at = datetime.utcnow()
+
+    def persist():
+        with SessionLocal() as db:
+            return bulk_upsert_rankings(db, job_id, scored, created_at=created_at)
+
+    await run_in_threadpool(persist)
+
+    # Duplicate candidate ids keep their last score, as in the database
+    latest = {ranking["candidate_id"]: ranking for ranking in scored}
+    ranked = sorted(latest.values(), key=lambda r: r["result"]["score"], reverse=True)
+
+    yield {"event": "result", "result": MatchCandidatesOutput(
+        job_id=job_id,
+        total_candidates=len(ranked),
+        rankings=[
+            RankingOutput(
+                candidate_id=r["candidate_id"],
+                job_id=job_id,
+                total_score=r["result"]["score"],
+                suitability_label=r["result"]["label"],
+                details=r["result"]["details"],
+                missing_skills=r["missing_skills"],
+                created_at=created_at
+            )
+            for r in ranked
+        ]
+    ).model_dump(mode="json")}
+
+
+@app.post("/jobs/{job_id}/match-candidates", response_model=MatchCandidatesOutput)
+async def match_candidates(
+    job_id: str,
+    data: MatchCandidatesInput,
+    stream: bool = Query(False, description="Stream NDJSON progress events, ending with the ranked result"),
+    db: Session = Depends(get_db)
+):
+    """
+    Score one job against many resumes and persist the rankings in one transaction
+    """
+    if not ner_model or not bert_model:
+        raise HTTPException(status_code=503, detail="Models not loaded")
+
+    if data.job_description:
+        profile = profile_to_dict(await run_in_threadpool(save_job_profile, job_id, data.job_description, db))
+    else:
+        profile = await run_in_threadpool(load_job_profile, job_id, db)
+        if profile is None:
+            raise HTTPException(status_code=404, detail="Job profile not found")
+
+    job_requirements = {
+        "required_skills": set(profile["required_skills"]),
+        "required_experience": profile["required_experience"],
+        "weights": await run_in_threadpool(load_ranking_weights, db, job_id)
+    }
+    events = match_candidates_events(job_id, data.candidates, job_requirements)
+
+    # The first event is produced once an inference slot is acquired,
+    # so saturation still surfaces as a 503 before any output is streamed
+    first = await events.__anext__()
+
+    # Whenever we stop pulling events (client gone, result returned, error),
+    # close the generator so its inference slot is released right away
+    if stream:
+        async def ndjson():
+            try:
+                yield json.dumps(first) + "\n"
+                async for event in events:
+                    yield json.dumps(event) + "\n"
+            except Exception as e:
+                print(f"Match Candidates Error: {e}")
+                yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+            finally:
+                await events.aclose()
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    try:
+        async for event in events:
+            if event["event"] == "result":
+                return event["result"]
     except Exception as e:
+        print(f"Match Candidates Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await events.aclose()
+
+
+# -------------------- ADMIN --------------------
 
+def verify_admin(x_admin_token: Optional[str] = Header(default=None)):
+    expected = os.getenv("ADMIN_TOKEN")
+    if expected and x_admin_token != expected:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def taxonomy_info(matcher) -> TaxonomyInfo:
+    return TaxonomyInfo(version=matcher.version, **matcher.size)
+
+
+@app.get("/admin/skill-taxonomy", response_model=TaxonomyInfo, dependencies=[Depends(verify_admin)])
+def get_skill_taxonomy():
+    return taxonomy_info(get_skill_matcher())
+
+
+@app.put("/admin/skill-taxonomy", response_model=TaxonomyInfo, dependencies=[Depends(verify_admin)])
+def update_skill_taxonomy(taxonomy: SkillTaxonomy):
+    """
+    Swap in a new skill taxonomy without restarting.
+    In-flight requests finish on the previous version; other workers pick up
+    the persisted file within SKILL_TAXONOMY_CHECK_INTERVAL seconds.
+    """
+    try:
+        matcher = set_taxonomy(taxonomy.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return taxonomy_info(matcher)
 
 
 # -------------------- CHAT SESSIONS --------------------
@@ -350,47 +1206,97 @@ def create_session(title: str = "New Interview", applicant_id: str = None, db: S
     db.refresh(session)
     return session
 
-@app.get("/chat/sessions", response_model=list[SessionSchema])
+@app.get("/chat/sessions", response_model=list[SessionSummarySchema])
 def get_sessions(applicant_id: str = None, db: Session = Depends(get_db)):
+    """
+    Session list for an applicant, newest first
+
+    Message counts and last message times come from one aggregate query
+    instead of loading every session's messages.
+    """
     if not applicant_id:
         raise HTTPException(status_code=400, detail="applicant_id is required")
-    
-    start_time = datetime.utcnow()
-    # Filter by applicant_id and sort by ID desc (newest first)
-    sessions = db.query(db_models.ChatSession).filter(
+
+    stats = db.query(
+        db_models.ChatMessage.session_id.label("session_id"),
+        func.count(db_models.ChatMessage.id).label("message_count"),
+        func.max(db_models.ChatMessage.timestamp).label("last_message_at")
+    ).group_by(db_models.ChatMessage.session_id).subquery()
+
+    rows = db.query(
+        db_models.ChatSession,
+        func.coalesce(stats.c.message_count, 0),
+        stats.c.last_message_at
+    ).outerjoin(
+        stats, stats.c.session_id == db_models.ChatSession.id
+    ).filter(
         db_models.ChatSession.applicant_id == applicant_id
     ).order_by(db_models.ChatSession.id.desc()).all()
-    print(f"Fetched {len(sessions)} sessions for applicant {applicant_id} in {(datetime.utcnow() - start_time).total_seconds()}s")
-    return sessions
 
-@app.get("/chat/sessions/{session_id}", response_model=SessionSchema)
-def get_session(session_id: int, applicant_id: str = None, db: Session = Depends(get_db)):
+    return [
+        SessionSummarySchema(
+            id=session.id,
+            applicant_id=session.applicant_id,
+            title=session.title,
+            created_at=session.created_at,
+            message_count=message_count,
+            last_message_at=last_message_at
+        )
+        for session, message_count, last_message_at in rows
+    ]
+
+def get_owned_session(db: Session, session_id: int, applicant_id: Optional[str], *options) -> db_models.ChatSession:
+    """Session by id, or 400/404/403 when applicant_id is missing, the session does not exist or is not theirs"""
     if not applicant_id:
         raise HTTPException(status_code=400, detail="applicant_id is required")
-    
-    session = db.query(db_models.ChatSession).filter(db_models.ChatSession.id == session_id).first()
+
+    session = db.query(db_models.ChatSession).options(*options).filter(db_models.ChatSession.id == session_id).first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+
     # Verify ownership
     if session.applicant_id != applicant_id:
         raise HTTPException(status_code=403, detail="Access denied: Session belongs to another applicant")
-    
+
     return session
 
+@app.get("/chat/sessions/{session_id}", response_model=SessionSchema)
+def get_session(session_id: int, applicant_id: str = None, db: Session = Depends(get_db)):
+    """Session with all its messages (prefer /messages for long sessions)"""
+    return get_owned_session(db, session_id, applicant_id, selectinload(db_models.ChatSession.messages))
+
+@app.get("/chat/sessions/{session_id}/messages", response_model=MessagePage)
+def get_session_messages(
+    session_id: int,
+    applicant_id: str = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    before_id: Optional[int] = Query(default=None, description="Return messages older than this message id"),
+    db: Session = Depends(get_db)
+):
+    """
+    Page of a session's messages, newest page first
+
+    Messages within a page are oldest first; follow next_before_id to load older pages.
+    """
+    get_owned_session(db, session_id, applicant_id)
+
+    query = db.query(db_models.ChatMessage).filter(db_models.ChatMessage.session_id == session_id)
+    if before_id is not None:
+        query = query.filter(db_models.ChatMessage.id < before_id)
+    # One extra row tells whether an older page exists
+    rows = query.order_by(db_models.ChatMessage.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    messages = list(reversed(rows[:limit]))
+    return MessagePage(
+        messages=messages,
+        has_more=has_more,
+        next_before_id=messages[0].id if has_more else None
+    )
+
 @app.delete("/chat/sessions/{session_id}")
 def delete_session(session_id: int, applicant_id: str = None, db: Session = Depends(get_db)):
-    if not applicant_id:
-        raise HTTPException(status_code=400, detail="applicant_id is required")
-    
-    session = db.query(db_models.ChatSession).filter(db_models.ChatSession.id == session_id).first()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    # Verify ownership
-    if session.applicant_id != applicant_id:
-        raise HTTPException(status_code=403, detail="Access denied: Session belongs to another applicant")
-    
+    session = get_owned_session(db, session_id, applicant_id)
     db.delete(session)
     db.commit()
     return {"message": "Session deleted"}
@@ -398,61 +1304,269 @@ def delete_session(session_id: int, applicant_id: str = None, db: Session = Depe
 
 # -------------------- INTERVIEW COPILOT --------------------
 
-@app.post("/interview-chat", response_model=ChatResponse)
-async def interview_chat(chat_input: ChatInput, session_id: int = None, db: Session = Depends(get_db)):
-
-    if not openai_client:
-        raise HTTPException(status_code=503, detail="OpenRouter client not initialized")
-
-    try:
-        # Save User Message if session exists
-        if session_id:
-            user_msg = db_models.ChatMessage(session_id=session_id, sender="user", content=chat_input.message)
-            db.add(user_msg)
-            db.commit()
-
-        # Convert history to OpenAI format
-        messages = [
-            {"role": "system", "content": """You are an expert technical interviewer. Your goal is to help candidates improve their answers.
+INTERVIEWER_PROMPT = """You are an expert technical interviewer. Your goal is to help candidates improve their answers.
 When providing feedback:
 1. Acknowledge what the candidate got right.
 2. ONLY provide 'Suggestions for improvement' if the candidate missed key concepts or made mistakes.
 3. CRITICAL: DO NOT suggest points the candidate has already mentioned in their answer.
-4. If the answer is accurate and complete, simply state that it is excellent and move to the next question."""}
-        ]
-        
-        for msg in chat_input.history:
-            role = "user" if msg.role == "user" else "assistant"
-            messages.append({"role": role, "content": msg.content})
+4. If the answer is accurate and complete, simply state that it is excellent and move to the next question."""
 
-        user_content = chat_input.message
-        if chat_input.context:
-            user_content = f"Context:\n{chat_input.context}\n\nUser Question:\n{chat_input.message}"
-            
-        messages.append({"role": "user", "content": user_content})
+CHAT_CONFIDENCE = 0.85
+
+
+def prepare_chat_turn(chat_input: ChatInput, session_id: Optional[int]):
+    """
+    Build the OpenAI chat messages for one turn (called from the threadpool)
+
+    With a session, earlier turns come from the database (chat_input.history is
+    ignored) and the user message is saved; without one, from chat_input.history.
+    Either way the prompt is kept within CHAT_HISTORY_TOKEN_BUDGET.
+
+    Returns:
+        (messages, summary_job): summary_job is (summary, turns) when turns fell
+        out of the budget and should be folded into the rolling summary, else None
+    """
+    user_content = chat_input.message
+    if chat_input.context:
+        user_content = f"Context:\n{chat_input.context}\n\nUser Question:\n{chat_input.message}"
+
+    if not session_id:
+        history = [{"role": chat_role(msg.role), "content": msg.content} for msg in chat_input.history]
+        messages, _ = build_context(INTERVIEWER_PROMPT, None, history, user_content, CHAT_HISTORY_TOKEN_BUDGET)
+        return messages, None
+
+    with SessionLocal() as db:
+        session, turns = load_session_history(db, session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        summary = session.summary
+
+        db.add(db_models.ChatMessage(session_id=session_id, sender="user", content=chat_input.message))
+        db.commit()
+
+    messages, dropped = build_context(INTERVIEWER_PROMPT, summary, turns, user_content, CHAT_HISTORY_TOKEN_BUDGET)
+    if not dropped:
+        return messages, None
+    return messages, (summary, turns[:max(dropped, turns_to_summarize(turns, CHAT_SUMMARY_KEEP_TOKENS))])
+
+
+def chat_cache_request(chat_input: ChatInput, messages: list) -> Optional[LLMRequest]:
+    """
+    Cache key for turns whose prompt is only the system prompt and the current
+    message (no earlier turns, no summary), so the reply depends on nothing else
+    """
+    if not llm_cache.enabled or len(messages) != 2:
+        return None
+    return LLMRequest(CHAT_MODEL, INTERVIEWER_PROMPT, chat_input.context or "", chat_input.message)
+
+
+def upstream_timeout(e: BaseException) -> bool:
+    """Timeouts from the client call, or raw httpx ones raised while reading a stream"""
+    import httpx
+    import openai
+    return isinstance(e, (openai.APITimeoutError, httpx.TimeoutException))
+
+
+def upstream_failure(e: BaseException) -> bool:
+    """Errors reflecting OpenRouter health (retried, and counted by the circuit breaker)"""
+    import openai
+    if isinstance(e, openai.APIConnectionError) or upstream_timeout(e):
+        return True
+    status = getattr(e, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def upstream_retry_after(e: BaseException) -> Optional[float]:
+    response = getattr(e, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+async def create_chat_completion(**kwargs):
+    """
+    openai_client.chat.completions.create through the circuit breaker, retrying
+    transient failures with jittered exponential backoff
+
+    Raises:
+        CircuitOpen: The circuit is open (503)
+        UpstreamTimeout: The last retry timed out too (504)
+    """
+    try:
+        return await openrouter_breaker.call(
+            lambda: retry_async(
+                lambda: openai_client.chat.completions.create(model=CHAT_MODEL, **kwargs),
+                is_retryable=upstream_failure,
+                max_retries=OPENROUTER_MAX_RETRIES,
+                base_delay=OPENROUTER_RETRY_BASE_DELAY,
+                max_delay=OPENROUTER_RETRY_MAX_DELAY,
+                retry_after=upstream_retry_after,
+                on_retry=lambda e, delay: print(f"⚠️ OpenRouter call failed ({e}), retrying in {delay:.2f}s")
+            ),
+            is_failure=upstream_failure
+        )
+    except Exception as e:
+        if upstream_timeout(e):
+            raise UpstreamTimeout("OpenRouter", OPENROUTER_RETRY_MAX_DELAY) from e
+        raise
+
+
+def save_chat_message(session_id: int, sender: str, content: str):
+    """Persist one chat message in its own session (called from the threadpool)"""
+    with SessionLocal() as db:
+        db.add(db_models.ChatMessage(session_id=session_id, sender=sender, content=content))
+        db.commit()
+
+
+def store_chat_summary(session_id: int, summary: str, through_message_id: int):
+    with SessionLocal() as db:
+        save_summary(db, session_id, summary, through_message_id)
 
-        response = openai_client.chat.completions.create(
-            model="meta-llama/llama-3.1-8b-instruct",
-            messages=messages,
+
+async def update_chat_summary(session_id: int, summary: Optional[str], turns: list):
+    """
+    Fold turns that no longer fit the prompt budget into the session's rolling
+    summary; runs after the response, so the next turn sees it
+    """
+    try:
+        response = await create_chat_completion(
+            messages=summary_request(summary, turns),
+            max_tokens=CHAT_SUMMARY_MAX_TOKENS,
         )
+        new_summary = (response.choices[0].message.content or "").strip()
+        if new_summary:
+            await run_in_threadpool(store_chat_summary, session_id, new_summary, turns[-1]["id"])
+    except Exception as e:
+        # The turns stay unsummarized and are retried with the next overflow
+        print(f"⚠️ Chat summary update failed: {e}")
 
-        ai_message_text = response.choices[0].message.content
+
+def sse_event(data: dict, event: str = None) -> str:
+    """Format one server-sent event"""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@app.post("/interview-chat", response_model=ChatResponse)
+async def interview_chat(chat_input: ChatInput, background_tasks: BackgroundTasks, session_id: int = None):
+
+    if not openai_client:
+        raise HTTPException(status_code=503, detail="OpenRouter client not initialized")
+
+    # Saves the user message if the session exists
+    messages, summary_job = await run_in_threadpool(prepare_chat_turn, chat_input, session_id)
+    if summary_job:
+        background_tasks.add_task(update_chat_summary, session_id, *summary_job)
+
+    async def generate():
+        response = await create_chat_completion(messages=messages)
+        return response.choices[0].message.content or ""
+
+    try:
+        cache_request = chat_cache_request(chat_input, messages)
+        if cache_request:
+            # Identical concurrent requests share one upstream call
+            ai_message_text, source = await llm_cache.get_or_generate(cache_request, generate)
+        else:
+            ai_message_text, source = await generate(), "miss"
 
         # Save AI Message if session exists
         if session_id:
-            ai_msg = db_models.ChatMessage(session_id=session_id, sender="ai", content=ai_message_text)
-            db.add(ai_msg)
-            db.commit()
+            await run_in_threadpool(save_chat_message, session_id, "ai", ai_message_text)
 
         return ChatResponse(
             response=ai_message_text,
-            confidence=0.85
+            confidence=CHAT_CONFIDENCE,
+            cached=source != "miss"
         )
 
+    except (CircuitOpen, UpstreamTimeout):
+        raise
+    except Exception as e:
+        print(f"OpenRouter Error: {e}")
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+
+@app.post("/interview-chat/stream")
+async def interview_chat_stream(chat_input: ChatInput, background_tasks: BackgroundTasks, session_id: int = None):
+    """
+    Same as /interview-chat, streamed as server-sent events: one `data: {"token": ...}`
+    event per generated chunk, then an `event: done` with the full response.
+    The AI message is persisted once the stream completes.
+    Cached replies are sent as a single token event.
+    """
+    if not openai_client:
+        raise HTTPException(status_code=503, detail="OpenRouter client not initialized")
+
+    messages, summary_job = await run_in_threadpool(prepare_chat_turn, chat_input, session_id)
+    if summary_job:
+        background_tasks.add_task(update_chat_summary, session_id, *summary_job)
+
+    cache_request = chat_cache_request(chat_input, messages)
+    # The first of identical concurrent requests streams from upstream and fills the cache
+    cached_text, future, leader = await llm_cache.claim(cache_request) if cache_request else (None, None, False)
+
+    try:
+        if future is not None and not leader:
+            cached_text = await llm_cache.wait(future)
+        if cached_text is None:
+            # Opened before responding, so upstream errors still surface as an HTTP error
+            stream = await create_chat_completion(messages=messages, stream=True)
     except Exception as e:
+        if leader:
+            llm_cache.release(cache_request, e, future)
+        if isinstance(e, (CircuitOpen, UpstreamTimeout)):
+            raise
         print(f"OpenRouter Error: {e}")
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
+    async def events():
+        try:
+            if cached_text is not None:
+                parts = [cached_text]
+                yield sse_event({"token": cached_text})
+            else:
+                parts = []
+                try:
+                    async for chunk in stream:
+                        token = chunk.choices[0].delta.content if chunk.choices else None
+                        if token:
+                            parts.append(token)
+                            yield sse_event({"token": token})
+                except Exception as e:
+                    if upstream_failure(e):
+                        openrouter_breaker.record_failure()
+                    print(f"OpenRouter Error: {e}")
+                    # The response has started, so the status travels in the event
+                    status = 504 if upstream_timeout(e) else 502
+                    yield sse_event({"detail": f"Chat failed: {str(e)}", "status": status}, event="error")
+                    return
+                finally:
+                    await stream.close()
+
+            ai_message_text = "".join(parts)
+            if leader:
+                await llm_cache.store(cache_request, ai_message_text, future)
+            if session_id:
+                await run_in_threadpool(save_chat_message, session_id, "ai", ai_message_text)
+
+            yield sse_event(
+                {"response": ai_message_text, "confidence": CHAT_CONFIDENCE, "cached": cached_text is not None},
+                event="done"
+            )
+        finally:
+            if leader:
+                # Error or client disconnect before store(); a no-op once the reply is cached
+                llm_cache.release(cache_request, RuntimeError("Chat stream ended before the reply was complete"), future)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 # -------------------- RANKING & TRANSPARENCY --------------------
 
@@ -468,106 +1582,134 @@ def calculate_ranking(input_data: RankingInput, db: Session = Depends(get_db)):
             experience_years=input_data.experience_years,
             required_experience=input_data.required_experience,
             role_confidence=input_data.role_confidence,
-            ats_score=input_data.ats_score
+            ats_score=input_data.ats_score,
+            weights=load_ranking_weights(db, input_data.job_id)
         )
         
-        # Check if ranking exists
-        existing_ranking = db.query(db_models.CandidateRanking).filter(
-            db_models.CandidateRanking.candidate_id == input_data.candidate_id,
-            db_models.CandidateRanking.job_id == input_data.job_id
-        ).first()
-        
-        if existing_ranking:
-            # Update existing
-            existing_ranking.total_score = ranking_result["score"]
-            existing_ranking.suitability_label = ranking_result["label"]
-            existing_ranking.skill_score = ranking_result["details"]["skill_score"]
-            existing_ranking.experience_score = ranking_result["details"]["experience_score"]
-            existing_ranking.role_confidence_score = ranking_result["details"]["role_confidence_score"]
-            existing_ranking.ats_score = ranking_result["details"]["ats_score"]
-            existing_ranking.missing_skills = ",".join(input_data.missing_skills)
-            existing_ranking.created_at = datetime.utcnow()
-            
-            db.commit()
-            db.refresh(existing_ranking)
-            db_obj = existing_ranking
-        else:
-            # Create new
-            db_obj = db_models.CandidateRanking(
-                candidate_id=input_data.candidate_id,
-                job_id=input_data.job_id,
-                total_score=ranking_result["score"],
-                suitability_label=ranking_result["label"],
-                skill_score=ranking_result["details"]["skill_score"],
-                experience_score=ranking_result["details"]["experience_score"],
-                role_confidence_score=ranking_result["details"]["role_confidence_score"],
-                ats_score=ranking_result["details"]["ats_score"],
-                missing_skills=",".join(input_data.missing_skills)
-            )
-            db.add(db_obj)
-            db.commit()
-            db.refresh(db_obj)
-            
+        row = upsert_ranking(
+            db,
+            candidate_id=input_data.candidate_id,
+            job_id=input_data.job_id,
+            result=ranking_result,
+            missing_skills=input_data.missing_skills
+        )
+
         return RankingOutput(
-            candidate_id=db_obj.candidate_id,
-            job_id=db_obj.job_id,
-            total_score=db_obj.total_score,
-            suitability_label=db_obj.suitability_label,
-            details={
-                "skill_score": db_obj.skill_score,
-                "experience_score": db_obj.experience_score,
-                "role_confidence_score": db_obj.role_confidence_score,
-                "ats_score": db_obj.ats_score
-            },
-            missing_skills=db_obj.missing_skills.split(",") if db_obj.missing_skills else [],
-            created_at=db_obj.created_at
+            candidate_id=row["candidate_id"],
+            job_id=row["job_id"],
+            total_score=row["total_score"],
+            suitability_label=row["suitability_label"],
+            details=ranking_result["details"],
+            missing_skills=input_data.missing_skills,
+            created_at=row["created_at"]
         )
         
     except Exception as e:
         print(f"Ranking Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/rankings", response_model=List[RankingOutput])
+@app.get("/rankings", response_model=List[RankingListItem], response_model_exclude_unset=True)
 def get_rankings(
-    job_id: Optional[str] = None, 
+    response: Response,
+    job_id: Optional[str] = None,
     min_score: Optional[float] = None,
-    sort_by: str = Query("score_desc", regex="^(score_asc|score_desc|date_desc)$"),
+    sort_by: str = Query("score_desc", pattern="^(score_asc|score_desc|date_desc)$"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description=f"Page size ({RANKINGS_PAGE_SIZE} when only cursor is given; all rows when neither is)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. candidate_id,total_score,suitability_label"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(db_models.CandidateRanking)
-    
-    if job_id:
-        query = query.filter(db_models.CandidateRanking.job_id == job_id)
-        
-    if min_score is not None:
-        query = query.filter(db_models.CandidateRanking.total_score >= min_score)
-        
-    if sort_by == "score_desc":
-        query = query.order_by(db_models.CandidateRanking.total_score.desc())
-    elif sort_by == "score_asc":
-        query = query.order_by(db_models.CandidateRanking.total_score.asc())
-    else:
-        query = query.order_by(db_models.CandidateRanking.created_at.desc())
-        
-    results = query.all()
-    
-    return [
-        RankingOutput(
-            candidate_id=r.candidate_id,
-            job_id=r.job_id,
-            total_score=r.total_score,
-            suitability_label=r.suitability_label,
-            details={
-                "skill_score": r.skill_score,
-                "experience_score": r.experience_score,
-                "role_confidence_score": r.role_confidence_score,
-                "ats_score": r.ats_score
-            },
-            missing_skills=r.missing_skills.split(",") if r.missing_skills else [],
-            created_at=r.created_at
+    """
+    One page of rankings; the X-Next-Cursor response header holds the cursor
+    of the next page and is absent on the last page. Without limit and cursor
+    every ranking is returned unpaginated, as before pagination was added.
+    """
+    if limit is None and cursor:
+        limit = RANKINGS_PAGE_SIZE
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        rows, next_cursor = query_rankings_page(
+            db, job_id=job_id, min_score=min_score, sort_by=sort_by,
+            limit=limit, cursor=cursor, fields=requested
         )
-        for r in results
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+@app.get("/rankings/top", response_model=TopRankingsOutput)
+def get_top_rankings(
+    k: int = Query(20, ge=1, le=1000, description="Rankings to return (per job when per_job)"),
+    job_id: Optional[List[str]] = Query(None, description="Only these jobs (repeat the parameter); all jobs when omitted"),
+    suitability_label: Optional[List[str]] = Query(None, description="Only these labels (repeat the parameter)"),
+    min_score: Optional[float] = None,
+    per_job: bool = Query(False, description="Top k of each job instead of top k overall"),
+    db: Session = Depends(get_db)
+):
+    """
+    Best candidates across jobs, streamed through a bounded heap instead of
+    sorting every ranking in memory
+    """
+    groups, scanned = top_rankings(
+        db, k, job_ids=job_id, labels=suitability_label, min_score=min_score, per_job=per_job
+    )
+    if per_job:
+        return TopRankingsOutput(k=k, scanned=scanned, by_job=groups)
+    return TopRankingsOutput(k=k, scanned=scanned, rankings=groups.get(None, []))
+
+def weights_output(job_id: str, weights: RankingWeights, row: Optional[db_models.JobRankingWeights] = None, **extra) -> RankingWeightsOutput:
+    return RankingWeightsOutput(
+        job_id=job_id,
+        **asdict(weights),
+        is_default=row is None,
+        updated_at=row.updated_at if row is not None else None,
+        **extra
+    )
+
+def run_rerank(db: Session, job_id: str, weights: RankingWeights, method: str) -> RerankOutput:
+    start = time.perf_counter()
+    candidates = rerank_job(db, job_id, weights, method=method)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"🔹 Re-ranked {candidates} candidates for job {job_id} ({method}) in {elapsed_ms:.1f} ms")
+    return RerankOutput(job_id=job_id, method=method, candidates=candidates, elapsed_ms=round(elapsed_ms, 2), weights=asdict(weights))
+
+@app.get("/jobs/{job_id}/ranking-weights", response_model=RankingWeightsOutput)
+def get_ranking_weights(job_id: str, db: Session = Depends(get_db)):
+    """Weights used to rank the job's candidates (the defaults when none are stored)"""
+    row = db.query(db_models.JobRankingWeights).filter(db_models.JobRankingWeights.job_id == job_id).first()
+    return weights_output(job_id, load_ranking_weights(db, job_id), row)
+
+@app.put("/jobs/{job_id}/ranking-weights", response_model=RankingWeightsOutput)
+def put_ranking_weights(
+    job_id: str,
+    data: RankingWeightsInput,
+    rerank: bool = Query(True, description="Re-rank the job's stored rankings under the new weights"),
+    db: Session = Depends(get_db)
+):
+    """
+    Store the job's weight profile; new rankings of the job use it, and existing
+    ones are re-ranked unless rerank=false
+    """
+    weights = RankingWeights(**data.model_dump())
+    row = save_ranking_weights(db, job_id, weights)
+    return weights_output(job_id, weights, row, rerank=run_rerank(db, job_id, weights, "vectorized") if rerank else None)
+
+@app.post("/jobs/{job_id}/rerank", response_model=RerankOutput)
+def rerank(
+    job_id: str,
+    method: str = Query("vectorized", description=f"One of {', '.join(RERANK_METHODS)}"),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute the total scores and labels of the job's stored rankings under its
+    current weights, from the stored component scores (no resume is re-analyzed)
+    """
+    if method not in RERANK_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {', '.join(RERANK_METHODS)}")
+    return run_rerank(db, job_id, load_ranking_weights(db, job_id), method)
 
 
 # -------------------- ENTRY --------------------
@@ -0,0 +1,31 @@
+"""
+Schema migration: tables, late-added columns and indexes
+Runs once per deployment, either from the API startup hook or ahead of the workers
+with scripts/migrate_db.py. Every step is idempotent and the whole migration holds
+a cross-process lock, so workers starting together find the schema already in place.
+"""
+
+from sqlalchemy.orm import Session
+
+from api import db_models
+from api.database import add_missing_columns, ensure_indexes, has_index, schema_migration
+from api.ranking_store import remove_duplicate_rankings
+
+
+def migrate_database() -> None:
+    """Bring the database schema up to date with db_models"""
+    with schema_migration() as conn:
+        db_models.Base.metadata.create_all(bind=conn)
+        add_missing_columns(db_models.ChatSession.__table__, conn)
+        ensure_indexes(db_models.ChatMessage.__table__, conn)
+
+        # The unique (candidate_id, job_id) index cannot be added over duplicate rows;
+        # once it exists there is nothing to clean up
+        rankings = db_models.CandidateRanking.__table__
+        unique = [index.name for index in rankings.indexes if index.unique]
+        if not all(has_index(conn, rankings.name, name) for name in unique):
+            with Session(bind=conn) as db:
+                removed = remove_duplicate_rankings(db)
+            if removed:
+                print(f"⚠️ Removed {removed} duplicate candidate rankings")
+        ensure_indexes(rankings, conn)
@@ -1,17 +1,24 @@
 """
 Pydantic models for API request/response validation
 """
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Dict, Optional, Any, Literal
 from datetime import datetime
 class ResumeInput(BaseModel):
     """Input model for resume analysis"""
     text: str = Field(..., description="Resume text content", min_length=50)
+    chunked: bool = Field(default=False, description="Classify the full text with overlapping 512-token windows instead of truncating")
+    chunk_aggregation: Literal["mean", "max", "attention"] = Field(default="mean", description="How window logits are combined in chunked mode")
+    tier: Optional[Literal["fast", "full", "auto"]] = Field(default=None, description="Classifier tier: distilled fast model, full model, or fast with escalation when unsure (defaults to BERT_DEFAULT_TIER)")
+    top_k: int = Field(default=3, description="Number of top role predictions to return", ge=1, le=50)
+    include_logits: bool = Field(default=False, description="Return the raw class logits")
     
     class Config:
         json_schema_extra = {
             "example": {
-                "text": "Experienced Python developer with 5 years in ML..."
+                "text": "Experienced Python developer with 5 years in ML...",
+                "chunked": False,
+                "chunk_aggregation": "mean"
             }
         }
 
@@ -29,9 +36,16 @@ class JobInput(BaseModel):
 
 
 class ResumeJobInput(BaseModel):
-    """Input model for resume-job matching"""
+    """Input model for resume-job matching (job given as raw text or as a stored profile id)"""
     resume_text: str = Field(..., description="Resume text content", min_length=50)
-    job_description: str = Field(..., description="Job description text", min_length=20)
+    job_description: Optional[str] = Field(default=None, description="Job description text", min_length=20)
+    job_id: Optional[str] = Field(default=None, description="Job with a stored profile (see POST /jobs/{job_id}/profile)")
+    
+    @model_validator(mode="after")
+    def check_job(self):
+        if not self.job_description and not self.job_id:
+            raise ValueError("Either job_description or job_id is required")
+        return self
     
     class Config:
         json_schema_extra = {
@@ -42,6 +56,16 @@ class ResumeJobInput(BaseModel):
         }
 
 
+class JobProfileOutput(BaseModel):
+    """Parsed, stored job requirements"""
+    job_id: str
+    required_skills: List[str] = []
+    required_experience: int = 0
+    taxonomy_version: Optional[str] = None
+    has_embedding: bool = False
+    updated_at: Optional[datetime] = None
+
+
 class Entity(BaseModel):
     """Extracted entity"""
     text: str = Field(..., description="Entity text")
@@ -74,7 +98,11 @@ class ClassificationOutput(BaseModel):
     """Output model for role classification"""
     predicted_role: str = Field(..., description="Predicted job role/category")
     confidence: float = Field(..., description="Prediction confidence score", ge=0.0, le=1.0)
-    top_predictions: List[Dict[str, float]] = Field(..., description="Top 3 predictions with scores")
+    top_predictions: List[Dict[str, float]] = Field(..., description="Top-k predictions with scores (k=3 by default)")
+    chunks_used: int = Field(default=1, description="Number of 512-token windows classified")
+    tier: str = Field(default="full", description="Classifier tier that produced the prediction")
+    escalated: bool = Field(default=False, description="Whether the fast tier was unsure and the full model decided")
+    logits: Optional[List[float]] = Field(default=None, description="Raw class logits (when include_logits is set)")
     
     class Config:
         json_schema_extra = {
@@ -85,7 +113,8 @@ class ClassificationOutput(BaseModel):
                     {"Data Scientist": 0.92},
                     {"ML Engineer": 0.05},
                     {"Software Engineer": 0.02}
-                ]
+                ],
+                "chunks_used": 1
             }
         }
 
@@ -95,6 +124,7 @@ class SkillMatch(BaseModel):
     match_percentage: float = Field(..., description="Percentage of required skills matched")
     matched_skills: List[str] = Field(..., description="Skills that match")
     missing_skills: List[str] = Field(..., description="Required skills not found in resume")
+    partial_matches: List[str] = Field(default=[], description="Required skills only covered by a more specific skill (partial credit)")
     additional_skills: List[str] = Field(..., description="Extra skills from resume")
     total_required: int = Field(..., description="Total required skills")
     total_matched: int = Field(..., description="Total matched skills")
@@ -160,6 +190,26 @@ class AnalyzeResumeOutput(BaseModel):
         }
 
 
+class BatchResumeInput(BaseModel):
+    """Input model for batch resume analysis"""
+    resumes: List[ResumeInput] = Field(..., description="Resumes to analyze", min_length=1, max_length=2000)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "resumes": [
+                    {"text": "Experienced Python developer with 5 years in ML..."},
+                    {"text": "Senior accountant with 8 years of experience in audit..."}
+                ]
+            }
+        }
+
+
+class BatchAnalyzeResumeOutput(BaseModel):
+    """Batch output for resume analysis (same order as input)"""
+    results: List[AnalyzeResumeOutput] = Field(..., description="Per-resume analysis results")
+
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = Field(..., description="Service status")
@@ -182,7 +232,10 @@ class ChatMessage(BaseModel):
 
 
 class ChatInput(BaseModel):
-    history: List[ChatMessage] = Field(default=[], description="Chat history")
+    history: List[ChatMessage] = Field(
+        default=[],
+        description="Chat history; ignored when a session_id is given (the server uses the stored messages)"
+    )
     message: str = Field(..., description="Current user message")
     context: Optional[str] = Field(default=None, description="Optional context like resume or job description")
     
@@ -199,6 +252,7 @@ class ChatInput(BaseModel):
 class ChatResponse(BaseModel):
     response: str = Field(..., description="AI response text")
     confidence: float = Field(default=0.0, description="Confidence score")
+    cached: bool = Field(default=False, description="Served from the LLM response cache")
 
 
 class MessageSchema(BaseModel):
@@ -220,6 +274,24 @@ class SessionSchema(BaseModel):
     class Config:
         from_attributes = True
 
+class SessionSummarySchema(BaseModel):
+    """Session list entry: metadata only, message bodies come from the messages endpoint"""
+    id: int
+    applicant_id: str
+    title: str
+    created_at: datetime
+    message_count: int = Field(default=0, description="Number of messages in the session")
+    last_message_at: Optional[datetime] = Field(default=None, description="Timestamp of the latest message")
+
+    class Config:
+        from_attributes = True
+
+class MessagePage(BaseModel):
+    """One page of a session's messages, oldest first"""
+    messages: List[MessageSchema]
+    has_more: bool = Field(..., description="Older messages exist before this page")
+    next_before_id: Optional[int] = Field(default=None, description="Pass as before_id to fetch the previous page")
+
 class CreateSessionResponse(BaseModel):
     id: int
     applicant_id: str
@@ -227,6 +299,38 @@ class CreateSessionResponse(BaseModel):
     created_at: datetime
 
 
+class TaxonomySkill(BaseModel):
+    """One skill in the skill taxonomy"""
+    name: str = Field(..., description="Canonical skill name", min_length=1)
+    category: str = Field(default="", description="Display category")
+    aliases: List[str] = Field(default=[], description="Alternative spellings mapped to this skill")
+    parents: List[str] = Field(default=[], description="Broader skills this one implies (e.g. PyTorch -> Deep Learning)")
+
+
+class SkillTaxonomy(BaseModel):
+    """Versioned skill taxonomy"""
+    version: str = Field(..., description="Taxonomy version", min_length=1)
+    skills: List[TaxonomySkill] = Field(..., description="Skills in the taxonomy")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "version": "1.2.0",
+                "skills": [
+                    {"name": "Deep Learning", "category": "AI/ML/Data", "aliases": [], "parents": []},
+                    {"name": "PyTorch", "category": "AI/ML/Data", "aliases": ["torch"], "parents": ["Deep Learning"]}
+                ]
+            }
+        }
+
+
+class TaxonomyInfo(BaseModel):
+    """Currently active skill taxonomy"""
+    version: str
+    skills: int
+    aliases: int
+
+
 class RankingInput(BaseModel):
     """Input for calculating candidate ranking"""
     candidate_id: str = Field(..., description="Candidate Identifier")
@@ -252,3 +356,92 @@ class RankingOutput(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class TopRankingsOutput(BaseModel):
+    """Best rankings overall (rankings) or per job (by_job)"""
+    k: int
+    scanned: int = Field(..., description="Rankings streamed from the database")
+    rankings: List[RankingOutput] = Field(default=[], description="Top k overall, best first (per_job=false)")
+    by_job: Dict[str, List[RankingOutput]] = Field(default={}, description="Top k of each job, best first (per_job=true)")
+
+
+class RankingWeightsInput(BaseModel):
+    """Component weights of a job's ranking score"""
+    skill_match: float = Field(..., ge=0, le=1, description="Weight of the skill match score")
+    experience_match: float = Field(..., ge=0, le=1, description="Weight of the experience score")
+    role_confidence: float = Field(..., ge=0, le=1, description="Weight of the role confidence score")
+    ats_score: float = Field(..., ge=0, le=1, description="Weight of the ATS score")
+
+    @model_validator(mode="after")
+    def check_sum(self):
+        total = self.skill_match + self.experience_match + self.role_confidence + self.ats_score
+        if abs(total - 1.0) > 1e-6:
+            raise ValueError(f"Weights must sum to 1 (got {total:g})")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {"skill_match": 0.30, "experience_match": 0.45, "role_confidence": 0.15, "ats_score": 0.10}
+        }
+
+
+class RerankOutput(BaseModel):
+    """Result of re-ranking a job's stored rankings"""
+    job_id: str
+    method: str
+    candidates: int = Field(..., description="Rankings updated")
+    elapsed_ms: float = Field(..., description="Time taken by the re-rank")
+    weights: Dict[str, float]
+
+
+class RankingWeightsOutput(BaseModel):
+    """Weight profile used to rank a job's candidates"""
+    job_id: str
+    skill_match: float
+    experience_match: float
+    role_confidence: float
+    ats_score: float
+    is_default: bool = Field(default=False, description="No profile is stored; the default weights apply")
+    updated_at: Optional[datetime] = None
+    rerank: Optional[RerankOutput] = Field(default=None, description="Re-rank performed after saving")
+
+
+class RankingListItem(BaseModel):
+    """GET /rankings entry; only the requested fields are present when `fields` is given"""
+    candidate_id: Optional[str] = None
+    job_id: Optional[str] = None
+    total_score: Optional[float] = None
+    suitability_label: Optional[str] = None
+    details: Optional[Dict[str, Optional[float]]] = None
+    missing_skills: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+
+
+class CandidateInput(BaseModel):
+    """One applicant in a bulk matching request"""
+    candidate_id: Optional[str] = Field(default=None, description="Candidate Identifier (defaults to a hash of the resume text)")
+    resume_text: str = Field(..., description="Resume text content", min_length=50)
+
+
+class MatchCandidatesInput(BaseModel):
+    """Input for scoring one job against many resumes"""
+    candidates: List[CandidateInput] = Field(..., description="Applicants to score", min_length=1, max_length=2000)
+    job_description: Optional[str] = Field(default=None, description="Job description text (stored as the job profile; defaults to the existing profile)", min_length=20)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "candidates": [
+                    {"candidate_id": "c-101", "resume_text": "Experienced Python developer with 5 years in ML..."},
+                    {"resume_text": "Data engineer with 3 years of Spark and SQL experience..."}
+                ]
+            }
+        }
+
+
+class MatchCandidatesOutput(BaseModel):
+    """Ranked applicants for a job"""
+    job_id: str
+    total_candidates: int
+    rankings: List[RankingOutput]
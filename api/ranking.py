@@ -1,23 +1,35 @@
+from dataclasses import dataclass
 from typing import Dict, List, Optional
 from pydantic import BaseModel
+import numpy as np
 
+@dataclass(frozen=True)
 class RankingWeights:
-    SKILL_MATCH = 0.40
-    EXPERIENCE_MATCH = 0.30
-    ROLE_CONFIDENCE = 0.20
-    ATS_SCORE = 0.10
+    """Weights of the component scores in the total score (they sum to 1)"""
+    skill_match: float = 0.40
+    experience_match: float = 0.30
+    role_confidence: float = 0.20
+    ats_score: float = 0.10
+
+# Used for jobs without a stored weight profile
+DEFAULT_WEIGHTS = RankingWeights()
 
 class SuitabilityLabels:
     HIGHLY_SUITABLE = "Highly Suitable"
     SUITABLE = "Suitable"
     NEEDS_IMPROVEMENT = "Needs Improvement"
 
+# Minimum (unrounded) total score for each label
+HIGHLY_SUITABLE_MIN_SCORE = 80
+SUITABLE_MIN_SCORE = 60
+
 def calculate_ranking_score(
     skill_match_percentage: float,
     experience_years: float,
     required_experience: float,
     role_confidence: float,
-    ats_score: float
+    ats_score: float,
+    weights: RankingWeights = DEFAULT_WEIGHTS
 ) -> Dict[str, any]:
     """
     Calculate the weighted ranking score for a candidate.
@@ -28,6 +40,7 @@ def calculate_ranking_score(
         required_experience (float): Job's required years of experience.
         role_confidence (float): 0-1 confidence score from BERT classifier.
         ats_score (float): 0-100 ATS score.
+        weights (RankingWeights): Component weights (the job's profile).
         
     Returns:
         Dict containing total_score, component_scores, and suitability_label.
@@ -46,20 +59,20 @@ def calculate_ranking_score(
     role_score = role_confidence * 100.0
     
     # Calculate Weighted Score
-    # Weights: Skills (40%), Experience (30%), Role (20%), ATS (10%)
-    ws = RankingWeights
+    # Default weights: Skills (40%), Experience (30%), Role (20%), ATS (10%)
+    ws = weights
     
     total_score = (
-        (skill_match_percentage * ws.SKILL_MATCH) +
-        (exp_score * ws.EXPERIENCE_MATCH) +
-        (role_score * ws.ROLE_CONFIDENCE) +
-        (ats_score * ws.ATS_SCORE)
+        (skill_match_percentage * ws.skill_match) +
+        (exp_score * ws.experience_match) +
+        (role_score * ws.role_confidence) +
+        (ats_score * ws.ats_score)
     )
     
     # Determine Suitability Label
-    if total_score >= 80:
+    if total_score >= HIGHLY_SUITABLE_MIN_SCORE:
         label = SuitabilityLabels.HIGHLY_SUITABLE
-    elif total_score >= 60:
+    elif total_score >= SUITABLE_MIN_SCORE:
         label = SuitabilityLabels.SUITABLE
     else:
         label = SuitabilityLabels.NEEDS_IMPROVEMENT
@@ -74,3 +87,148 @@ def calculate_ranking_score(
             "ats_score": round(ats_score, 2)
         }
     }
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round a float64 array with exactly the results of Python's round(x, ndigits)
+
+    np.round scales, rounds and unscales, which can differ from Python's
+    correctly rounded decimal result in the last bit or at .5 ties. Here the
+    scaled value is rounded half-to-even and divided back (both exact IEEE
+    operations); elements whose scaled value is too close to a tie for that to
+    be certain are rounded with Python's round instead.
+
+    Args:
+        values (np.ndarray): float64 values.
+        ndigits (int): Decimal digits to keep (>= 0).
+
+    Returns:
+        np.ndarray: Rounded float64 values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = values * scale
+        rounded = np.rint(scaled) / scale
+        # Distance from a .5 tie, compared with the rounding error of the multiplication
+        uncertain = np.abs(scaled - np.floor(scaled) - 0.5) <= 2 * np.spacing(scaled)
+    # Beyond 2**52 the scaled value has no fraction left to round (and may overflow)
+    uncertain |= np.isfinite(values) & ~(np.abs(scaled) < 2.0 ** 52)
+
+    for i in np.flatnonzero(uncertain):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+    return rounded
+
+
+def suitability_labels(total_score: np.ndarray) -> np.ndarray:
+    """Label per unrounded total score, as chosen by calculate_ranking_score"""
+    return np.select(
+        [total_score >= HIGHLY_SUITABLE_MIN_SCORE, total_score >= SUITABLE_MIN_SCORE],
+        [SuitabilityLabels.HIGHLY_SUITABLE, SuitabilityLabels.SUITABLE],
+        default=SuitabilityLabels.NEEDS_IMPROVEMENT
+    )
+
+
+def weighted_scores(
+    skill_score: np.ndarray,
+    experience_score: np.ndarray,
+    role_confidence_score: np.ndarray,
+    ats_score: np.ndarray,
+    weights: RankingWeights = DEFAULT_WEIGHTS
+) -> Dict[str, np.ndarray]:
+    """
+    Total scores and labels from normalized (0-100) component scores.
+
+    Also re-ranks stored rankings: CandidateRanking keeps the component scores,
+    so new weights need no resume re-analysis. Stored components are rounded to
+    2 decimals, so totals recomputed from them can differ from a fresh
+    calculation by at most 0.005.
+
+    Args:
+        skill_score (np.ndarray): 0-100 skill match.
+        experience_score (np.ndarray): 0-100 normalized experience.
+        role_confidence_score (np.ndarray): 0-100 role confidence.
+        ats_score (np.ndarray): 0-100 ATS score.
+        weights (RankingWeights): Component weights.
+
+    Returns:
+        Dict of arrays: score (rounded like calculate_ranking_score) and label.
+    """
+    ws = weights
+    total_score = (
+        (np.asarray(skill_score, dtype=np.float64) * ws.skill_match) +
+        (np.asarray(experience_score, dtype=np.float64) * ws.experience_match) +
+        (np.asarray(role_confidence_score, dtype=np.float64) * ws.role_confidence) +
+        (np.asarray(ats_score, dtype=np.float64) * ws.ats_score)
+    )
+    return {"score": round_like_python(total_score, 2), "label": suitability_labels(total_score)}
+
+
+def calculate_ranking_scores(
+    skill_match_percentage: np.ndarray,
+    experience_years: np.ndarray,
+    required_experience: np.ndarray,
+    role_confidence: np.ndarray,
+    ats_score: np.ndarray,
+    weights: RankingWeights = DEFAULT_WEIGHTS
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar calculate_ranking_score: score many candidates in one vectorized pass.
+
+    Every value is bit-identical to calling calculate_ranking_score per candidate
+    (same operation order in float64, same comparisons, Python rounding).
+
+    Args:
+        skill_match_percentage (np.ndarray): 0-100 skill match per candidate.
+        experience_years (np.ndarray): Years of experience per candidate.
+        required_experience (np.ndarray): Required years of experience (array or scalar).
+        role_confidence (np.ndarray): 0-1 BERT confidence per candidate.
+        ats_score (np.ndarray): 0-100 ATS score per candidate.
+        weights (RankingWeights): Component weights (the job's profile).
+
+    Returns:
+        Dict of arrays: score, label, skill_score, experience_score,
+        role_confidence_score and ats_score.
+    """
+    skill = np.asarray(skill_match_percentage, dtype=np.float64)
+    experience = np.asarray(experience_years, dtype=np.float64)
+    required = np.broadcast_to(np.asarray(required_experience, dtype=np.float64), experience.shape)
+    role_confidence = np.asarray(role_confidence, dtype=np.float64)
+    ats = np.asarray(ats_score, dtype=np.float64)
+
+    # Normalize Experience Score (0-100); where() instead of minimum() keeps min(100.0, nan) == 100.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (experience / required) * 100.0
+    exp_score = np.where(required <= 0, 100.0, np.where(ratio < 100.0, ratio, 100.0))
+
+    role_score = role_confidence * 100.0
+
+    return {
+        **weighted_scores(skill, exp_score, role_score, ats, weights),
+        "skill_score": round_like_python(skill, 2),
+        "experience_score": round_like_python(exp_score, 2),
+        "role_confidence_score": round_like_python(role_score, 2),
+        "ats_score": round_like_python(ats, 2)
+    }
+
+
+def ranking_results(scores: Dict[str, np.ndarray]) -> List[Dict[str, any]]:
+    """calculate_ranking_scores output as a list of calculate_ranking_score dicts"""
+    details = zip(
+        scores["skill_score"].tolist(), scores["experience_score"].tolist(),
+        scores["role_confidence_score"].tolist(), scores["ats_score"].tolist()
+    )
+    return [
+        {
+            "score": score,
+            "label": label,
+            "details": {
+                "skill_score": skill,
+                "experience_score": experience,
+                "role_confidence_score": role,
+                "ats_score": ats
+            }
+        }
+        for score, label, (skill, experience, role, ats) in zip(scores["score"].tolist(), scores["label"].tolist(), details)
+    ]
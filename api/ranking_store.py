@@ -0,0 +1,503 @@
+"""
+Persistence helpers for candidate rankings
+Upserts CandidateRanking rows with INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE
+(one row, or thousands in one executemany), reads them back one keyset-paginated
+page at a time or as a streamed top-K, and stores per-job ranking weights and
+re-ranks a job under them
+"""
+
+import base64
+import heapq
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, bindparam, case, func, or_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from api import db_models
+from api.ranking import (
+    DEFAULT_WEIGHTS,
+    HIGHLY_SUITABLE_MIN_SCORE,
+    SUITABLE_MIN_SCORE,
+    RankingWeights,
+    SuitabilityLabels,
+    weighted_scores
+)
+
+# Columns overwritten when a (candidate_id, job_id) ranking already exists
+UPSERT_COLUMNS = [
+    "total_score", "suitability_label", "skill_score", "experience_score",
+    "role_confidence_score", "ats_score", "missing_skills", "created_at"
+]
+
+
+def ranking_row(
+    candidate_id: str,
+    job_id: str,
+    result: Dict,
+    missing_skills: List[str],
+    created_at: datetime
+) -> Dict:
+    """CandidateRanking column values for a calculate_ranking_score result"""
+    return {
+        "candidate_id": candidate_id,
+        "job_id": job_id,
+        "total_score": result["score"],
+        "suitability_label": result["label"],
+        "skill_score": result["details"]["skill_score"],
+        "experience_score": result["details"]["experience_score"],
+        "role_confidence_score": result["details"]["role_confidence_score"],
+        "ats_score": result["details"]["ats_score"],
+        "missing_skills": ",".join(missing_skills),
+        "created_at": created_at
+    }
+
+
+def upsert_statement(db: Session):
+    """
+    INSERT that updates the existing ranking on a (candidate_id, job_id) conflict
+
+    Executed with a list of rows it is one executemany: SQLite reuses a single
+    prepared statement and PyMySQL rewrites it into multi-row INSERTs.
+
+    Raises:
+        ValueError: Database dialect without a supported upsert
+    """
+    table = db_models.CandidateRanking.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        statement = sqlite_insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=["candidate_id", "job_id"],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+        )
+    if dialect in ("mysql", "mariadb"):
+        statement = mysql_insert(table)
+        return statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in UPSERT_COLUMNS}
+        )
+    raise ValueError(f"Ranking upsert is not supported for the {dialect} dialect")
+
+
+def upsert_ranking(
+    db: Session,
+    candidate_id: str,
+    job_id: str,
+    result: Dict,
+    missing_skills: List[str],
+    created_at: Optional[datetime] = None
+) -> Dict:
+    """
+    Insert or update one ranking in a single statement and commit
+
+    Args:
+        db: Database session
+        candidate_id: Candidate identifier
+        job_id: Job identifier
+        result: calculate_ranking_score output
+        missing_skills: Skills the candidate lacks
+        created_at: Timestamp stored on the row (defaults to now)
+
+    Returns:
+        The stored column values
+    """
+    row = ranking_row(candidate_id, job_id, result, missing_skills, created_at or datetime.utcnow())
+    try:
+        db.execute(upsert_statement(db), row)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    # Every column except id was just written, so no read back is needed
+    return row
+
+
+def bulk_upsert_rankings(
+    db: Session,
+    job_id: str,
+    rankings: List[Dict],
+    created_at: Optional[datetime] = None
+) -> int:
+    """
+    Insert or update the rankings of many candidates for one job
+
+    All rows are written by one executemany and committed together.
+
+    Args:
+        db: Database session
+        job_id: Job the candidates applied to
+        rankings: Dicts with candidate_id, the calculate_ranking_score output
+            under "result" and a missing_skills list (later duplicates win)
+        created_at: Timestamp stored on every row (defaults to now)
+
+    Returns:
+        Number of rows written
+    """
+    created_at = created_at or datetime.utcnow()
+    # Later duplicates win, as if the rankings were written one by one
+    by_candidate = {}
+    for ranking in rankings:
+        by_candidate[ranking["candidate_id"]] = ranking_row(
+            ranking["candidate_id"], job_id, ranking["result"], ranking.get("missing_skills", []), created_at
+        )
+    rows = list(by_candidate.values())
+
+    try:
+        if rows:
+            db.execute(upsert_statement(db), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return len(rows)
+
+
+def remove_duplicate_rankings(db: Session) -> int:
+    """
+    Keep only the newest row of each (candidate_id, job_id) pair
+
+    Databases created before the unique index may hold duplicates from
+    concurrent recalculations, which would make creating the index fail.
+
+    Returns:
+        Number of rows deleted
+    """
+    model = db_models.CandidateRanking
+    duplicated = db.query(model.candidate_id, model.job_id, func.max(model.id)).group_by(
+        model.candidate_id, model.job_id
+    ).having(func.count(model.id) > 1).all()
+
+    deleted = 0
+    for candidate_id, job_id, keep_id in duplicated:
+        deleted += db.query(model).filter(
+            model.candidate_id == candidate_id, model.job_id == job_id, model.id != keep_id
+        ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+# -------------------- PAGINATED READS --------------------
+
+# sort_by -> (sort column, descending); ties are broken by id in the same direction
+RANKING_SORTS = {
+    "score_desc": ("total_score", True),
+    "score_asc": ("total_score", False),
+    "date_desc": ("created_at", True)
+}
+
+# Response field -> columns it is built from
+RANKING_FIELDS = {
+    "candidate_id": ["candidate_id"],
+    "job_id": ["job_id"],
+    "total_score": ["total_score"],
+    "suitability_label": ["suitability_label"],
+    "details": ["skill_score", "experience_score", "role_confidence_score", "ats_score"],
+    "missing_skills": ["missing_skills"],
+    "created_at": ["created_at"]
+}
+
+
+def encode_cursor(sort_by: str, value: Any, row_id: int) -> str:
+    """Opaque cursor pointing just after the row with this sort value and id"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, int]:
+    """
+    (sort value, id) of a cursor returned by encode_cursor
+
+    Raises:
+        ValueError: Malformed cursor, or a cursor issued for another sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort_by:
+        raise ValueError(f"Cursor was issued for sort_by={cursor_sort}")
+    if RANKING_SORTS[sort_by][0] == "created_at":
+        value = datetime.fromisoformat(value)
+    return value, int(row_id)
+
+
+def ranking_columns(fields: Optional[Sequence[str]]) -> List[str]:
+    """
+    Columns to select for the requested response fields (all fields when None)
+
+    Raises:
+        ValueError: Unknown field name
+    """
+    fields = list(RANKING_FIELDS) if fields is None else fields
+    unknown = [f for f in fields if f not in RANKING_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(RANKING_FIELDS)})")
+    columns = []
+    for field in fields:
+        columns.extend(c for c in RANKING_FIELDS[field] if c not in columns)
+    return columns
+
+
+def ranking_fields(row: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """Response dict holding the requested fields of a selected row"""
+    output = {}
+    for field in (list(RANKING_FIELDS) if fields is None else fields):
+        if field == "details":
+            output["details"] = {c: row[c] for c in RANKING_FIELDS["details"]}
+        elif field == "missing_skills":
+            output["missing_skills"] = row["missing_skills"].split(",") if row["missing_skills"] else []
+        else:
+            output[field] = row[field]
+    return output
+
+
+def query_rankings_page(
+    db: Session,
+    job_id: Optional[str] = None,
+    min_score: Optional[float] = None,
+    sort_by: str = "score_desc",
+    limit: Optional[int] = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of rankings in a stable order
+
+    Pages are addressed by the (sort value, id) of the last row seen rather than
+    an offset, so with a job_id filter every page is a range scan of the
+    (job_id, total_score) or (job_id, created_at) index, however deep it is.
+
+    Args:
+        db: Database session
+        job_id: Only rankings for this job
+        min_score: Only rankings with total_score >= min_score
+        sort_by: One of RANKING_SORTS
+        limit: Page size (None returns every remaining row as one page)
+        cursor: next_cursor of the previous page
+        fields: Response fields to return (all when None)
+
+    Returns:
+        (rows as response dicts, next_cursor or None on the last page)
+
+    Raises:
+        ValueError: Invalid cursor or field name
+    """
+    sort_name, descending = RANKING_SORTS[sort_by]
+    model = db_models.CandidateRanking
+    sort_column = getattr(model, sort_name)
+
+    selected = ["id", sort_name] + [c for c in ranking_columns(fields) if c != sort_name]
+    query = db.query(*[getattr(model, c) for c in selected])
+
+    if job_id:
+        query = query.filter(model.job_id == job_id)
+    if min_score is not None:
+        query = query.filter(model.total_score >= min_score)
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by)
+        if descending:
+            # The first condition alone is an index range; the second skips ties already returned
+            query = query.filter(sort_column <= value, or_(sort_column < value, and_(sort_column == value, model.id < last_id)))
+        else:
+            query = query.filter(sort_column >= value, or_(sort_column > value, and_(sort_column == value, model.id > last_id)))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), model.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), model.id.asc())
+
+    if limit is None:
+        return [ranking_fields(row._asdict(), fields) for row in query.all()], None
+
+    # One extra row tells whether another page exists
+    rows = [row._asdict() for row in query.limit(limit + 1).all()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(sort_by, rows[-1][sort_name], rows[-1]["id"])
+
+    return [ranking_fields(row, fields) for row in rows], next_cursor
+
+
+# -------------------- TOP-K --------------------
+
+# Rows fetched per round trip while streaming rankings
+TOP_K_BATCH_SIZE = 1000
+# Keeps IN (...) lists below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+def top_rankings(
+    db: Session,
+    k: int,
+    job_ids: Optional[Sequence[str]] = None,
+    labels: Optional[Sequence[str]] = None,
+    min_score: Optional[float] = None,
+    per_job: bool = False,
+    batch_size: int = TOP_K_BATCH_SIZE
+) -> Tuple[Dict[Optional[str], List[Dict]], int]:
+    """
+    Best k rankings overall or per job, streamed from the database
+
+    Only (total_score, id, job_id) of the matching rows is streamed, batch_size
+    rows per round trip (yield_per), through a bounded min-heap per group; the
+    winners' full rows are loaded afterwards by id. Memory grows with k (times
+    the number of jobs when per_job) instead of with the table. Ties are broken
+    by id, newest first, as in GET /rankings?sort_by=score_desc.
+
+    Args:
+        db: Database session
+        k: Rankings to keep per group
+        job_ids: Only rankings of these jobs (all jobs when None)
+        labels: Only rankings with one of these suitability labels
+        min_score: Only rankings with total_score >= min_score
+        per_job: Keep k rankings per job instead of k overall
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        ({job_id: rankings} when per_job, else {None: rankings}, rows scanned),
+        rankings as response dicts, best first
+    """
+    model = db_models.CandidateRanking
+    query = db.query(model.total_score, model.id, model.job_id).filter(model.total_score.isnot(None))
+    if job_ids:
+        query = query.filter(model.job_id.in_(job_ids))
+    if labels:
+        query = query.filter(model.suitability_label.in_(labels))
+    if min_score is not None:
+        query = query.filter(model.total_score >= min_score)
+
+    heaps: Dict[Optional[str], list] = {}
+    scanned = 0
+    for score, row_id, job_id in query.yield_per(batch_size).tuples():
+        scanned += 1
+        heap = heaps.setdefault(job_id if per_job else None, [])
+        if len(heap) < k:
+            heapq.heappush(heap, (score, row_id))
+        elif (score, row_id) > heap[0]:
+            heapq.heapreplace(heap, (score, row_id))
+
+    winners = [row_id for heap in heaps.values() for _, row_id in heap]
+    columns = [getattr(model, c) for c in ["id"] + ranking_columns(None)]
+    rows = {}
+    for start in range(0, len(winners), LOOKUP_CHUNK_SIZE):
+        chunk = winners[start:start + LOOKUP_CHUNK_SIZE]
+        for row in db.query(*columns).filter(model.id.in_(chunk)):
+            rows[row.id] = ranking_fields(row._asdict(), None)
+
+    return {
+        group: [rows[row_id] for _, row_id in sorted(heap, reverse=True) if row_id in rows]
+        for group, heap in heaps.items()
+    }, scanned
+
+# -------------------- RANKING WEIGHTS --------------------
+
+RERANK_METHODS = ("vectorized", "sql")
+
+
+def load_ranking_weights(db: Session, job_id: str) -> RankingWeights:
+    """Weight profile of a job, or DEFAULT_WEIGHTS when none is stored"""
+    row = db.query(db_models.JobRankingWeights).filter(db_models.JobRankingWeights.job_id == job_id).first()
+    if row is None:
+        return DEFAULT_WEIGHTS
+    return RankingWeights(
+        skill_match=row.skill_match,
+        experience_match=row.experience_match,
+        role_confidence=row.role_confidence,
+        ats_score=row.ats_score
+    )
+
+
+def save_ranking_weights(db: Session, job_id: str, weights: RankingWeights) -> db_models.JobRankingWeights:
+    """Create or replace the weight profile of a job"""
+    row = db.query(db_models.JobRankingWeights).filter(db_models.JobRankingWeights.job_id == job_id).first()
+    if row is None:
+        row = db_models.JobRankingWeights(job_id=job_id)
+        db.add(row)
+
+    row.skill_match = weights.skill_match
+    row.experience_match = weights.experience_match
+    row.role_confidence = weights.role_confidence
+    row.ats_score = weights.ats_score
+    row.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(row)
+    return row
+
+
+def rerank_job(db: Session, job_id: str, weights: RankingWeights, method: str = "vectorized") -> int:
+    """
+    Recompute total scores and labels of every ranking of a job from the stored
+    component scores, without re-analyzing any resume
+
+    Args:
+        db: Database session
+        job_id: Job to re-rank
+        weights: New component weights
+        method: "vectorized" loads the components, scores them with NumPy
+            (rounding exactly like calculate_ranking_score) and writes them back
+            with one executemany UPDATE by primary key; "sql" runs a single
+            UPDATE ... SET computed in the database (no rows transferred, but
+            rounding follows the database's ROUND)
+
+    Returns:
+        Number of rankings updated
+    """
+    model = db_models.CandidateRanking
+    try:
+        if method == "sql":
+            total = (
+                (model.skill_score * weights.skill_match) +
+                (model.experience_score * weights.experience_match) +
+                (model.role_confidence_score * weights.role_confidence) +
+                (model.ats_score * weights.ats_score)
+            )
+            updated = db.query(model).filter(model.job_id == job_id).update({
+                model.total_score: func.round(total, 2),
+                model.suitability_label: case(
+                    (total >= HIGHLY_SUITABLE_MIN_SCORE, SuitabilityLabels.HIGHLY_SUITABLE),
+                    (total >= SUITABLE_MIN_SCORE, SuitabilityLabels.SUITABLE),
+                    else_=SuitabilityLabels.NEEDS_IMPROVEMENT
+                )
+            }, synchronize_session=False)
+            db.commit()
+            return updated
+
+        if method != "vectorized":
+            raise ValueError(f"Unknown re-rank method {method} (expected one of {', '.join(RERANK_METHODS)})")
+
+        rows = db.query(
+            model.id, model.skill_score, model.experience_score, model.role_confidence_score, model.ats_score
+        ).filter(model.job_id == job_id).all()
+        if not rows:
+            return 0
+
+        ids, skill, experience, role, ats = zip(*rows)
+        scores = weighted_scores(
+            np.array(skill, dtype=np.float64), np.array(experience, dtype=np.float64),
+            np.array(role, dtype=np.float64), np.array(ats, dtype=np.float64), weights
+        )
+        # Core executemany: one prepared UPDATE, without the ORM's per-row bookkeeping
+        table = model.__table__
+        statement = update(table).where(table.c.id == bindparam("row_id")).values(
+            total_score=bindparam("score"), suitability_label=bindparam("label")
+        )
+        db.connection().execute(statement, [
+            {"row_id": row_id, "score": score, "label": label}
+            for row_id, score, label in zip(ids, scores["score"].tolist(), scores["label"].tolist())
+        ])
+        db.commit()
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
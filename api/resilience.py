@@ -0,0 +1,191 @@
+"""
+Resilience helpers for calls to external services (the OpenRouter LLM API)
+Bounded retries with jittered exponential backoff, and a circuit breaker that fails
+fast while the upstream error rate is above a threshold
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open), retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class UpstreamTimeout(Exception):
+    """Raised when an upstream call still times out after the last retry"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} timed out, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base * 2^attempt)]"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[Any]],
+    is_retryable: Callable[[BaseException], bool],
+    max_retries: int = 2,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_after: Optional[Callable[[BaseException], Optional[float]]] = None,
+    on_retry: Optional[Callable[[BaseException, float], None]] = None
+) -> Any:
+    """
+    Await call(), retrying retryable failures up to max_retries times
+
+    Args:
+        call: Coroutine factory (a new coroutine per attempt)
+        is_retryable: Whether an exception is transient (e.g. 429, 5xx, timeout)
+        max_retries: Retries after the first attempt
+        base_delay: Backoff scale in seconds
+        max_delay: Backoff cap in seconds
+        retry_after: Server-requested delay for an exception (Retry-After header), if any
+        on_retry: Called with (exception, delay) before each retry
+
+    Returns:
+        The result of the first successful attempt
+    """
+    attempt = 0
+    while True:
+        try:
+            return await call()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            requested = retry_after(e) if retry_after else None
+            if requested is not None:
+                delay = min(max(delay, requested), max_delay)
+            if on_retry:
+                on_retry(e, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+class CircuitBreaker:
+    """
+    Closed -> open when at least failure_threshold of the last `window` calls
+    failed (with at least min_calls recorded); open -> half-open after
+    reset_timeout seconds, where one trial call decides between closing and
+    re-opening. Used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0
+    ):
+        """
+        Args:
+            name: Upstream name used in errors and stats
+            failure_threshold: Failure ratio over the window that opens the circuit
+            window: Number of most recent calls considered
+            min_calls: Calls needed in the window before the circuit can open
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._outcomes = deque(maxlen=window)  # True = failure
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._stats = {"calls": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpen unless a call may go upstream now"""
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self._stats["rejected"] += 1
+        remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        raise CircuitOpen(self.name, max(remaining, 1.0))
+
+    def record_success(self) -> None:
+        self._stats["calls"] += 1
+        if self._opened_at is not None:
+            # Trial call succeeded
+            self._opened_at = None
+            self._trial_in_flight = False
+            self._outcomes.clear()
+        self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        self._stats["calls"] += 1
+        self._stats["failures"] += 1
+        if self._opened_at is not None:
+            # Trial call failed: stay open for another reset_timeout
+            self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+            return
+
+        self._outcomes.append(True)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+            print(f"⚠️ Circuit for {self.name} opened ({sum(self._outcomes)}/{len(self._outcomes)} calls failed)")
+
+    def release_trial(self) -> None:
+        """The trial call ended without an upstream verdict (e.g. a client error)"""
+        self._trial_in_flight = False
+
+    async def call(self, call: Callable[[], Awaitable[Any]], is_failure: Callable[[BaseException], bool]) -> Any:
+        """
+        Await call() through the breaker
+
+        Args:
+            call: Coroutine factory
+            is_failure: Whether an exception reflects upstream health (timeouts,
+                429, 5xx) rather than a bad request
+        """
+        self.before_call()
+        try:
+            result = await call()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self.release_trial()
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the upstream
+            self.release_trial()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        failures = sum(self._outcomes)
+        return {
+            **self._stats,
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failure_rate": round(failures / len(self._outcomes), 4) if self._outcomes else 0.0
+        }
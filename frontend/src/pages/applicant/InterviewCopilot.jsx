@@ -17,10 +17,12 @@ const InterviewCopilot = () => {
     const [input, setInput] = useState('');
     const [confidence, setConfidence] = useState(0);
     const [isLoading, setIsLoading] = useState(false);
+    const [isStreaming, setIsStreaming] = useState(false);
 
     // State for sessions
     const [sessions, setSessions] = useState([]);
     const [currentSessionId, setCurrentSessionId] = useState(null);
+    const [olderBeforeId, setOlderBeforeId] = useState(null);
     const [sessionsLoading, setSessionsLoading] = useState(true);
 
     // Create Modal State
@@ -108,6 +110,7 @@ const InterviewCopilot = () => {
             });
             setSessions(prev => [res.data, ...prev]);
             setCurrentSessionId(res.data.id);
+            setOlderBeforeId(null);
             setMessages([{ id: Date.now(), sender: 'ai', text: "Ready for a new session! What topic shall we cover?" }]);
             setCreateModal({ show: false });
         } catch (err) {
@@ -139,6 +142,7 @@ const InterviewCopilot = () => {
             // If deleted session was active, reset view
             if (currentSessionId === sessionId) {
                 setCurrentSessionId(null);
+                setOlderBeforeId(null);
                 setMessages([{ id: Date.now(), sender: 'ai', text: "Session deleted. Start a new one!" }]);
             }
             setDeleteModal({ show: false, sessionId: null });
@@ -150,6 +154,29 @@ const InterviewCopilot = () => {
         }
     };
 
+    const MESSAGE_PAGE_SIZE = 50;
+
+    const toUiMessage = (m) => ({
+        id: m.id,
+        sender: m.sender,
+        text: m.content
+    });
+
+    const loadOlderMessages = async () => {
+        const userId = getUserId();
+        if (!userId || !currentSessionId || !olderBeforeId) return;
+
+        try {
+            const res = await axios.get(`http://localhost:8000/chat/sessions/${currentSessionId}/messages`, {
+                params: { applicant_id: userId, limit: MESSAGE_PAGE_SIZE, before_id: olderBeforeId }
+            });
+            setOlderBeforeId(res.data.next_before_id);
+            setMessages(prev => [...res.data.messages.map(toUiMessage), ...prev]);
+        } catch (err) {
+            console.error("Failed to load older messages", err);
+        }
+    };
+
     const loadSession = async (sessionId) => {
         const userId = getUserId();
         if (!userId) {
@@ -159,17 +186,14 @@ const InterviewCopilot = () => {
 
         try {
             setIsLoading(true);
-            const res = await axios.get(`http://localhost:8000/chat/sessions/${sessionId}`, {
-                params: { applicant_id: userId }
+            const res = await axios.get(`http://localhost:8000/chat/sessions/${sessionId}/messages`, {
+                params: { applicant_id: userId, limit: MESSAGE_PAGE_SIZE }
             });
             setCurrentSessionId(sessionId);
+            setOlderBeforeId(res.data.next_before_id);
 
             // Convert DB messages to UI format
-            const uiMessages = res.data.messages.map(m => ({
-                id: m.id,
-                sender: m.sender,
-                text: m.content
-            }));
+            const uiMessages = res.data.messages.map(toUiMessage);
 
             if (uiMessages.length === 0) {
                 setMessages([{ id: Date.now(), sender: 'ai', text: "History loaded. Resume your practice!" }]);
@@ -188,7 +212,7 @@ const InterviewCopilot = () => {
     };
 
     const handleSend = async () => {
-        if (!input.trim() || isLoading) return;
+        if (!input.trim() || isLoading || isStreaming) return;
 
         const userId = getUserId();
         if (!userId) {
@@ -224,29 +248,64 @@ const InterviewCopilot = () => {
         setIsLoading(true);
 
         try {
-            const history = messages.map(msg => ({
-                role: msg.sender === 'ai' ? 'model' : 'user',
-                content: msg.text
-            }));
-
+            // History is assembled server-side from the session's stored messages
             const payload = {
-                history: history,
                 message: userMessage.text,
                 context: "Candidate is preparing for a technical interview."
             };
 
-            // Pass session_id
-            const response = await axios.post(`http://localhost:8000/interview-chat?session_id=${activeSessionId}`, payload);
+            // Pass session_id; the reply is streamed as server-sent events
+            const response = await fetch(`http://localhost:8000/interview-chat/stream?session_id=${activeSessionId}`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(payload)
+            });
+            if (!response.ok || !response.body) {
+                throw new Error(`Chat failed with status ${response.status}`);
+            }
 
-            if (response.data && response.data.response) {
-                setMessages(prev => [...prev, {
-                    id: Date.now() + 1,
-                    sender: 'ai',
-                    text: response.data.response
-                }]);
+            const aiMessageId = Date.now() + 1;
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let started = false;
+            setIsStreaming(true);
+
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+                for (const rawEvent of events) {
+                    const lines = rawEvent.split('\n');
+                    const eventLine = lines.find(line => line.startsWith('event:'));
+                    const dataLine = lines.find(line => line.startsWith('data:'));
+                    if (!dataLine) continue;
+                    const eventType = eventLine ? eventLine.slice(6).trim() : 'message';
+                    const data = JSON.parse(dataLine.slice(5));
+
+                    if (eventType === 'error') {
+                        throw new Error(data.detail);
+                    }
+                    if (eventType === 'done') {
+                        if (data.confidence) {
+                            setConfidence(Math.round(data.confidence * 100));
+                        }
+                        continue;
+                    }
 
-                if (response.data.confidence) {
-                    setConfidence(Math.round(response.data.confidence * 100));
+                    if (!started) {
+                        // First token: replace the typing indicator with the message
+                        started = true;
+                        setIsLoading(false);
+                        setMessages(prev => [...prev, { id: aiMessageId, sender: 'ai', text: data.token }]);
+                    } else {
+                        setMessages(prev => prev.map(msg =>
+                            msg.id === aiMessageId ? { ...msg, text: msg.text + data.token } : msg
+                        ));
+                    }
                 }
             }
         } catch (error) {
@@ -258,6 +317,7 @@ const InterviewCopilot = () => {
             }]);
         } finally {
             setIsLoading(false);
+            setIsStreaming(false);
         }
     };
 
@@ -302,7 +362,8 @@ const InterviewCopilot = () => {
                                 <div style={{ overflow: 'hidden', flex: 1 }}>
                                     <div style={{ fontWeight: '600', fontSize: '0.9rem', marginBottom: '4px', whiteSpace: 'nowrap', overflow: 'hidden', textOverflow: 'ellipsis' }}>{session.title}</div>
                                     <div style={{ fontSize: '0.8rem', color: 'var(--text-secondary)' }}>
-                                        {new Date(session.created_at || Date.now()).toLocaleDateString()}
+                                        {new Date(session.last_message_at || session.created_at || Date.now()).toLocaleDateString()}
+                                        {session.message_count > 0 && ` · ${session.message_count} messages`}
                                     </div>
                                 </div>
                                 <button
@@ -351,6 +412,14 @@ const InterviewCopilot = () => {
                 </div>
 
                 <div style={{ flex: 1, padding: '20px', overflowY: 'auto', display: 'flex', flexDirection: 'column', gap: '20px' }}>
+                    {olderBeforeId && (
+                        <button
+                            onClick={loadOlderMessages}
+                            style={{ alignSelf: 'center', background: 'none', border: 'none', color: 'var(--primary)', cursor: 'pointer', fontSize: '0.85rem' }}
+                        >
+                            Load earlier messages
+                        </button>
+                    )}
                     {messages.map((msg, index) => (
                         <motion.div
                             initial={{ opacity: 0, y: 10 }}
@@ -0,0 +1,146 @@
+"""
+Accuracy parity, latency and memory of the BERT classifier backends
+Runs each backend (torch, int8, onnx) in a fresh process over data/bert_test.pkl and
+exits non-zero if a backend's macro-F1 falls more than --max-f1-drop below eager PyTorch.
+
+Usage:
+    python scripts/export_bert_onnx.py
+    python scripts/benchmark_bert_backends.py --max-f1-drop 0.01
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).parent))
+
+DATA_DIR = BASE_DIR / "data"
+MODEL_DIR = BASE_DIR / "models" / "bert_classifier_best"
+BACKENDS = ("torch", "int8", "onnx")
+
+
+def read_memory_mb(field: str) -> float:
+    """VmRSS / VmHWM of the current process in MB (Linux)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run_backend(backend: str, args) -> dict:
+    """Measure one backend in the current process"""
+    import torch
+    import transformers  # noqa: F401  loaded before the baseline so only the model counts
+    from sklearn.metrics import accuracy_score, f1_score
+    from common_utils import load_pickle
+    from api.classifier import classify_texts, load_classifier
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    device = torch.device("cpu")
+    rss_start = read_memory_mb("VmRSS")
+
+    model, tokenizer = load_classifier(MODEL_DIR, backend=backend, device=device, num_threads=args.threads)
+    label_mapping = load_pickle(DATA_DIR / "label_mapping.pkl")
+    rss_loaded = read_memory_mb("VmRSS")
+
+    df = load_pickle(DATA_DIR / "bert_test.pkl")
+    if args.limit:
+        df = df.head(args.limit)
+    texts = df["text"].astype(str).tolist()
+    y_true = [label_mapping[i] for i in df["label_encoded"]]
+
+    start = time.perf_counter()
+    predictions = classify_texts(texts, model, tokenizer, device, label_mapping, batch_size=args.batch_size)
+    batch_seconds = time.perf_counter() - start
+    y_pred = [p["predicted_role"] for p in predictions]
+
+    # Single-request latency, as seen by /analyze-resume without batching
+    latencies = []
+    for text in texts[:args.latency_samples]:
+        start = time.perf_counter()
+        classify_texts([text], model, tokenizer, device, label_mapping)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "backend": backend,
+        "accuracy": accuracy_score(y_true, y_pred),
+        "macro_f1": f1_score(y_true, y_pred, average="macro", zero_division=0),
+        "docs_per_sec": len(texts) / batch_seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "model_mb": rss_loaded - rss_start,
+        "peak_rss_mb": read_memory_mb("VmHWM")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BERT backend parity / latency / memory benchmark")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N test resumes")
+    parser.add_argument("--latency-samples", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 keeps the default)")
+    parser.add_argument("--max-f1-drop", type=float, default=0.01, help="Allowed macro-F1 drop vs torch")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args)))
+        return
+
+    # Each backend runs in its own process so RSS numbers are not polluted by the others
+    results = {}
+    passthrough = [
+        "--batch-size", str(args.batch_size),
+        "--limit", str(args.limit),
+        "--latency-samples", str(args.latency_samples),
+        "--threads", str(args.threads)
+    ]
+    for backend in args.backends:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", backend] + passthrough,
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"❌ {backend} failed:\n{proc.stderr[-2000:]}")
+            sys.exit(1)
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print("=" * 88)
+    print("BERT BACKEND BENCHMARK")
+    print("=" * 88)
+    print(f"{'backend':<10}{'accuracy':>10}{'macro-F1':>10}{'docs/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'model MB':>11}{'peak MB':>10}")
+    for r in results.values():
+        print(
+            f"{r['backend']:<10}{r['accuracy']:>10.4f}{r['macro_f1']:>10.4f}{r['docs_per_sec']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['model_mb']:>11.1f}{r['peak_rss_mb']:>10.1f}"
+        )
+
+    if "torch" not in results:
+        return
+
+    baseline = results["torch"]["macro_f1"]
+    failed = [
+        name for name, r in results.items()
+        if baseline - r["macro_f1"] > args.max_f1_drop
+    ]
+    print(f"\nParity (macro-F1 drop <= {args.max_f1_drop} vs torch {baseline:.4f}):")
+    for name, r in results.items():
+        status = "❌ FAIL" if name in failed else "✅ OK"
+        print(f"  {name:<8} {r['macro_f1'] - baseline:+.4f}  {status}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark chunked (sliding-window) classification of long resumes
+Reports accuracy, macro-F1, windows per resume and CPU time on data/bert_test.pkl
+for truncation at 512 tokens versus each chunk aggregation mode.
+
+Usage:
+    python scripts/benchmark_chunked.py --max-chunks 8 --stride 128
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from sklearn.metrics import accuracy_score, f1_score
+from transformers import BertTokenizer, BertForSequenceClassification
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).parent))
+
+from common_utils import load_pickle
+from api.classifier import classify_texts, classify_chunked, CHUNK_AGGREGATIONS
+
+DATA_DIR = BASE_DIR / "data"
+MODEL_DIR = BASE_DIR / "models" / "bert_classifier_best"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked classification cost vs accuracy")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-chunks", type=int, default=8)
+    parser.add_argument("--stride", type=int, default=128)
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N test resumes")
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    tokenizer = BertTokenizer.from_pretrained(MODEL_DIR)
+    model = BertForSequenceClassification.from_pretrained(MODEL_DIR).to(device).eval()
+    label_mapping = load_pickle(DATA_DIR / "label_mapping.pkl")
+
+    df = load_pickle(DATA_DIR / "bert_test.pkl")
+    if args.limit:
+        df = df.head(args.limit)
+    texts = df["text"].astype(str).tolist()
+    y_true = [label_mapping[i] for i in df["label_encoded"]]
+
+    runs = {"truncate": lambda: classify_texts(
+        texts, model, tokenizer, device, label_mapping, batch_size=args.batch_size
+    )}
+    for aggregation in CHUNK_AGGREGATIONS:
+        runs[f"chunked-{aggregation}"] = lambda aggregation=aggregation: classify_chunked(
+            texts, model, tokenizer, device, label_mapping,
+            aggregation=aggregation,
+            stride=args.stride,
+            max_chunks=args.max_chunks,
+            batch_size=args.batch_size
+        )
+
+    print("=" * 72)
+    print(f"CHUNKED CLASSIFICATION BENCHMARK ({len(texts)} resumes)")
+    print("=" * 72)
+    print(f"{'mode':<18}{'accuracy':>10}{'macro-F1':>10}{'avg chunks':>12}{'seconds':>10}{'docs/s':>10}")
+
+    for name, run in runs.items():
+        start = time.perf_counter()
+        predictions = run()
+        elapsed = time.perf_counter() - start
+
+        y_pred = [p["predicted_role"] for p in predictions]
+        chunks = np.mean([p.get("chunks_used", 1) for p in predictions])
+        print(
+            f"{name:<18}"
+            f"{accuracy_score(y_true, y_pred):>10.4f}"
+            f"{f1_score(y_true, y_pred, average='macro', zero_division=0):>10.4f}"
+            f"{chunks:>12.2f}"
+            f"{elapsed:>10.2f}"
+            f"{len(texts) / elapsed:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark NER throughput over data/ner_val.spacy
+Compares one-document-at-a-time calls with the full pipeline against
+nlp.pipe batching with 1, 2, 4 and 8 processes.
+
+Usage:
+    python scripts/benchmark_ner_pipe.py --batch-size 32 --repeat 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from spacy.tokens import DocBin
+
+sys.path.append(str(Path(__file__).parent))
+from ner_pipeline import load_ner_model, pipe_entities, entities_from_doc
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_PATH = BASE_DIR / "data" / "ner_val.spacy"
+MODEL_DIR = BASE_DIR / "models" / "ner_model_best"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NER nlp.pipe throughput benchmark")
+    parser.add_argument("--model", default=str(MODEL_DIR))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=4, help="Times the validation set is repeated to form the corpus")
+    args = parser.parse_args()
+
+    nlp = load_ner_model(args.model)
+    texts = [doc.text for doc in DocBin().from_disk(DATA_PATH).get_docs(nlp.vocab)] * args.repeat
+
+    print("=" * 60)
+    print(f"NER THROUGHPUT BENCHMARK ({len(texts)} docs, batch size {args.batch_size})")
+    print(f"Active components: {nlp.pipe_names}")
+    print("=" * 60)
+    print(f"{'mode':<20}{'seconds':>10}{'docs/s':>10}{'speedup':>10}")
+
+    start = time.perf_counter()
+    reference = [entities_from_doc(nlp(text)) for text in texts]
+    baseline = time.perf_counter() - start
+    print(f"{'nlp(text) loop':<20}{baseline:>10.2f}{len(texts) / baseline:>10.1f}{1.0:>10.2f}")
+
+    for n_process in args.processes:
+        start = time.perf_counter()
+        entities = pipe_entities(nlp, texts, batch_size=args.batch_size, n_process=n_process)
+        elapsed = time.perf_counter() - start
+
+        mismatch = "" if entities == reference else "  (entities differ!)"
+        print(
+            f"{f'pipe n_process={n_process}':<20}"
+            f"{elapsed:>10.2f}"
+            f"{len(texts) / elapsed:>10.1f}"
+            f"{baseline / elapsed:>10.2f}{mismatch}"
+        )
+
+
+if __name__ == "__main__":
+    main()
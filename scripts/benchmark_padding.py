@@ -0,0 +1,103 @@
+"""
+Benchmark padding overhead of BERT batches
+Compares tokens wasted on padding (and optionally CPU inference time) for:
+  - padding="max_length" (every resume padded to 512 tokens)
+  - dynamic padding to the longest sequence in each batch
+  - dynamic padding with length bucketing
+
+Usage:
+    python scripts/benchmark_padding.py --batch-size 16 [--time 256]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import torch
+from transformers import BertTokenizer, BertForSequenceClassification
+
+sys.path.append(str(Path(__file__).parent))
+from common_utils import load_pickle, length_buckets
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+MODEL_DIR = BASE_DIR / "models" / "bert_classifier_best"
+
+
+def padded_tokens(lengths, batches, max_length=None):
+    """Total tokens processed when each batch is padded to max_length or to its longest item"""
+    total = 0
+    for batch in batches:
+        width = max_length or max(lengths[i] for i in batch)
+        total += width * len(batch)
+    return total
+
+
+def sequential_batches(n, batch_size):
+    return [list(range(i, min(i + batch_size, n))) for i in range(0, n, batch_size)]
+
+
+def time_forward(model, tokenizer, encodings, batches, max_length=None):
+    start = time.perf_counter()
+    with torch.no_grad():
+        for batch in batches:
+            padded = tokenizer.pad(
+                {
+                    "input_ids": [encodings["input_ids"][i] for i in batch],
+                    "attention_mask": [encodings["attention_mask"][i] for i in batch]
+                },
+                padding="max_length" if max_length else True,
+                max_length=max_length,
+                return_tensors="pt"
+            )
+            model(input_ids=padded["input_ids"], attention_mask=padded["attention_mask"])
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Padding waste benchmark")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-length", type=int, default=512)
+    parser.add_argument("--time", type=int, default=0, help="Also time CPU inference on the first N resumes")
+    args = parser.parse_args()
+
+    tokenizer = BertTokenizer.from_pretrained(MODEL_DIR if MODEL_DIR.exists() else "bert-base-uncased")
+
+    for split in ["bert_val.pkl", "bert_test.pkl"]:
+        df = load_pickle(DATA_DIR / split)
+        texts = df["text"].astype(str).tolist()
+        encodings = tokenizer(texts, max_length=args.max_length, truncation=True)
+        lengths = [len(ids) for ids in encodings["input_ids"]]
+        real = sum(lengths)
+
+        strategies = {
+            "max_length": padded_tokens(lengths, sequential_batches(len(lengths), args.batch_size), args.max_length),
+            "dynamic": padded_tokens(lengths, sequential_batches(len(lengths), args.batch_size)),
+            "bucketed": padded_tokens(lengths, length_buckets(lengths, args.batch_size)),
+        }
+
+        print("\n" + "=" * 60)
+        print(f"{split}: {len(texts)} resumes, {real} real tokens, batch size {args.batch_size}")
+        print("=" * 60)
+        for name, total in strategies.items():
+            wasted = total - real
+            print(f"{name:<12} processed={total:>9} wasted={wasted:>9} ({wasted / total:6.1%})")
+
+        if args.time and MODEL_DIR.exists():
+            n = min(args.time, len(texts))
+            subset = {k: v[:n] for k, v in encodings.items()}
+            model = BertForSequenceClassification.from_pretrained(MODEL_DIR).eval()
+
+            timings = {
+                "max_length": time_forward(model, tokenizer, subset, sequential_batches(n, args.batch_size), args.max_length),
+                "dynamic": time_forward(model, tokenizer, subset, sequential_batches(n, args.batch_size)),
+                "bucketed": time_forward(model, tokenizer, subset, length_buckets(lengths[:n], args.batch_size)),
+            }
+            print(f"\nCPU inference on {n} resumes:")
+            for name, seconds in timings.items():
+                print(f"{name:<12} {seconds:8.2f}s ({n / seconds:6.1f} resumes/s)")
+
+
+if __name__ == "__main__":
+    main()
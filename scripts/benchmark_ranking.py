@@ -0,0 +1,108 @@
+"""
+Benchmark for candidate ranking
+Scores synthetic candidates with the scalar calculate_ranking_score (one call per
+candidate) and the vectorized calculate_ranking_scores, checks that every score,
+component score and label is bit-identical, and reports timings per size.
+
+Usage:
+    python scripts/benchmark_ranking.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from api.ranking import RankingWeights, calculate_ranking_score, calculate_ranking_scores, ranking_results
+
+FIELDS = ["score", "skill_score", "experience_score", "role_confidence_score", "ats_score"]
+
+
+def synthetic_candidates(n: int, seed: int = 0):
+    """Realistic ranges plus the edge cases the scalar path handles specially"""
+    rng = np.random.default_rng(seed)
+    # Skill match is matched/required * 100, so mostly non-terminating decimals
+    required_skills = rng.integers(1, 21, n)
+    columns = {
+        "skill_match_percentage": rng.integers(0, required_skills + 1) / required_skills * 100,
+        "experience_years": rng.integers(0, 20, n).astype(np.float64) + rng.choice([0.0, 0.5], n),
+        "required_experience": rng.integers(-1, 10, n).astype(np.float64),
+        "role_confidence": rng.uniform(0, 1, n),
+        "ats_score": np.round(rng.uniform(0, 100, n), 1)
+    }
+    # Scores landing exactly on label thresholds and on .xx5 rounding ties
+    edge = n // 100
+    columns["skill_match_percentage"][:edge] = 100.0
+    columns["experience_years"][:edge] = 5.0
+    columns["required_experience"][:edge] = 5.0
+    columns["role_confidence"][:edge] = rng.choice([0.5, 0.75, 1.0], edge)
+    columns["ats_score"][:edge] = rng.choice([0.0, 0.05, 0.125, 2.675], edge)
+    return columns
+
+
+def scalar(columns, weights=RankingWeights()):
+    return [
+        calculate_ranking_score(*values, weights=weights)
+        for values in zip(*(columns[k].tolist() for k in (
+            "skill_match_percentage", "experience_years", "required_experience", "role_confidence", "ats_score"
+        )))
+    ]
+
+
+def identical(expected, actual: dict) -> bool:
+    """Bitwise comparison of scalar results with vectorized columns"""
+    for field in FIELDS:
+        values = [r["score"] if field == "score" else r["details"][field] for r in expected]
+        reference = np.array(values, dtype=np.float64)
+        if not np.array_equal(reference.view(np.int64), actual[field].view(np.int64)):
+            return False
+    return [r["label"] for r in expected] == actual["label"].tolist()
+
+
+def best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized ranking benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"  {'candidates':>10} {'scalar ms':>10} {'vector ms':>10} {'+ dicts ms':>11} {'speedup':>8}  identical")
+    all_identical = True
+    for n in args.sizes:
+        columns = synthetic_candidates(n)
+        scalar_time, expected = best_of(lambda: scalar(columns), 1 if n >= 1_000_000 else args.repeat)
+        vector_time, actual = best_of(lambda: calculate_ranking_scores(**columns), args.repeat)
+        dicts_time, _ = best_of(lambda: ranking_results(calculate_ranking_scores(**columns)), args.repeat)
+
+        same = identical(expected, actual) and ranking_results(actual) == expected
+        all_identical &= same
+        print(
+            f"  {n:>10,} {scalar_time * 1000:>10.1f} {vector_time * 1000:>10.1f} {dicts_time * 1000:>11.1f} "
+            f"{scalar_time / vector_time:>7.0f}x  {'✅' if same else '❌'}"
+        )
+
+    # A senior-role profile, as stored per job
+    weights = RankingWeights(skill_match=0.30, experience_match=0.45, role_confidence=0.15, ats_score=0.10)
+    columns = synthetic_candidates(min(args.sizes), seed=1)
+    same = identical(scalar(columns, weights), calculate_ranking_scores(**columns, weights=weights))
+    all_identical &= same
+    print(f"\n{'✅' if same else '❌'} Identical with custom weights {weights}")
+
+    if not all_identical:
+        sys.exit(1)
+    print("\n✅ Vectorized results are bit-identical to calculate_ranking_score")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark for GET /rankings pagination
+Seeds a temporary SQLite database with synthetic candidate rankings (one popular job
+holding a large share of them) and reports per-page p50/p99 latency of:
+  - before: the previous unpaginated query (every ranking of the job, ORM rows)
+  - offset: LIMIT/OFFSET pages sampled evenly across the job
+  - keyset: every page of the job through query_rankings_page
+  - keyset + fields: the same with a list-view projection (no missing_skills)
+  - keyset, no index: keyset pages with the composite indexes dropped
+  - HTTP: GET /rankings pages followed through X-Next-Cursor
+
+Usage:
+    python scripts/benchmark_rankings_pagination.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+# The API binds its engine at import time
+TMP_DIR = tempfile.mkdtemp(prefix="benchmark_rankings_")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR}/rankings.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from api import db_models
+from api.database import SessionLocal, engine
+from api.main import app
+from api.migrations import migrate_database
+from api.ranking import SuitabilityLabels
+from api.ranking_store import query_rankings_page
+
+POPULAR_JOB = "job-popular"
+LIST_FIELDS = "candidate_id,total_score,suitability_label,created_at"
+SKILLS = ["Python", "Docker", "Kubernetes", "AWS", "React", "SQL", "Terraform", "GraphQL", "Go", "Redis"]
+INSERT_CHUNK = 50000
+
+
+def seed(rows: int, jobs: int, popular_share: float):
+    rng = random.Random(42)
+    labels = [SuitabilityLabels.HIGHLY_SUITABLE, SuitabilityLabels.SUITABLE, SuitabilityLabels.NEEDS_IMPROVEMENT]
+    start = datetime(2025, 1, 1)
+    table = db_models.CandidateRanking.__table__
+
+    def row(i):
+        job_id = POPULAR_JOB if rng.random() < popular_share else f"job-{rng.randrange(jobs)}"
+        return {
+            "candidate_id": f"cand-{i}",
+            "job_id": job_id,
+            # Rounded like real scores, so ties exercise the id tiebreaker
+            "total_score": round(rng.uniform(0, 100), 1),
+            "suitability_label": rng.choice(labels),
+            "skill_score": round(rng.uniform(0, 100), 2),
+            "experience_score": round(rng.uniform(0, 100), 2),
+            "role_confidence_score": round(rng.uniform(0, 100), 2),
+            "ats_score": round(rng.uniform(0, 100), 2),
+            "missing_skills": ",".join(rng.sample(SKILLS, rng.randrange(0, 6))),
+            "created_at": start + timedelta(seconds=rng.randrange(0, 180 * 86400))
+        }
+
+    with engine.begin() as conn:
+        for chunk_start in range(0, rows, INSERT_CHUNK):
+            conn.execute(insert(table), [row(i) for i in range(chunk_start, min(rows, chunk_start + INSERT_CHUNK))])
+        conn.execute(text("ANALYZE"))
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings) * 1000, p99 * 1000
+
+
+def report(name: str, timings, pages: int):
+    p50, p99 = percentiles(timings)
+    print(f"  {name:<18} {pages:>6} {p50:>9.2f} {p99:>9.2f}")
+    return p50, p99
+
+
+def legacy_rankings(job_id: str):
+    """The previous GET /rankings body: every row of the job as ORM objects"""
+    db = SessionLocal()
+    try:
+        query = db.query(db_models.CandidateRanking).filter(db_models.CandidateRanking.job_id == job_id)
+        rows = query.order_by(db_models.CandidateRanking.total_score.desc()).all()
+        return [
+            {
+                "candidate_id": r.candidate_id,
+                "job_id": r.job_id,
+                "total_score": r.total_score,
+                "suitability_label": r.suitability_label,
+                "details": {
+                    "skill_score": r.skill_score,
+                    "experience_score": r.experience_score,
+                    "role_confidence_score": r.role_confidence_score,
+                    "ats_score": r.ats_score
+                },
+                "missing_skills": r.missing_skills.split(",") if r.missing_skills else [],
+                "created_at": r.created_at
+            }
+            for r in rows
+        ]
+    finally:
+        db.close()
+
+
+def offset_page(job_id: str, page: int, limit: int):
+    db = SessionLocal()
+    try:
+        model = db_models.CandidateRanking
+        return db.query(model).filter(model.job_id == job_id).order_by(
+            model.total_score.desc(), model.id.desc()
+        ).offset(page * limit).limit(limit).all()
+    finally:
+        db.close()
+
+
+def walk_keyset(pages: int, limit: int, fields=None):
+    """Follow next_cursor for up to `pages` pages; returns (timings, rows seen)"""
+    timings, seen, cursor = [], [], None
+    for _ in range(pages):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            rows, cursor = query_rankings_page(
+                db, job_id=POPULAR_JOB, sort_by="score_desc", limit=limit, cursor=cursor, fields=fields
+            )
+            timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+        seen.extend(rows)
+        if not cursor:
+            break
+    return timings, seen
+
+
+def walk_http(client: TestClient, pages: int, limit: int, fields=None):
+    """Follow X-Next-Cursor through the API for up to `pages` pages"""
+    params = {"job_id": POPULAR_JOB, "sort_by": "score_desc", "limit": limit}
+    if fields:
+        params["fields"] = fields
+    timings, cursor = [], None
+    for _ in range(pages):
+        start = time.perf_counter()
+        response = client.get("/rankings", params={**params, **({"cursor": cursor} if cursor else {})})
+        response.raise_for_status()
+        timings.append(time.perf_counter() - start)
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /rankings pagination benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--popular-share", type=float, default=0.2, help="Share of rows for the popular job")
+    parser.add_argument("--offset-samples", type=int, default=200, help="OFFSET pages sampled across the job")
+    parser.add_argument("--http-pages", type=int, default=500, help="Pages fetched through the API")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--legacy-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    migrate_database()
+    print(f"🔹 Seeding {args.rows:,} rankings ({args.popular_share:.0%} for {POPULAR_JOB})...")
+    start = time.perf_counter()
+    seed(args.rows, args.jobs, args.popular_share)
+    client = TestClient(app)
+    with engine.connect() as conn:
+        job_rows = conn.execute(
+            text("SELECT COUNT(*) FROM candidate_rankings WHERE job_id = :job"), {"job": POPULAR_JOB}
+        ).scalar()
+    print(f"   {job_rows:,} rankings for {POPULAR_JOB}, seeded in {time.perf_counter() - start:.1f}s")
+
+    print(f"\n  {'':<18} {'pages':>6} {'p50 ms':>9} {'p99 ms':>9}")
+
+    legacy_timings = []
+    for _ in range(args.legacy_runs):
+        start = time.perf_counter()
+        legacy_rankings(POPULAR_JOB)
+        legacy_timings.append(time.perf_counter() - start)
+    report(f"before ({job_rows:,} rows)", legacy_timings, 1)
+
+    total_pages = -(-job_rows // args.limit)
+    offset_timings = []
+    for sample in range(args.offset_samples):
+        page = sample * total_pages // args.offset_samples
+        start = time.perf_counter()
+        offset_page(POPULAR_JOB, page, args.limit)
+        offset_timings.append(time.perf_counter() - start)
+    report("offset", offset_timings, len(offset_timings))
+
+    keyset_timings, seen = walk_keyset(total_pages, args.limit)
+    report("keyset", keyset_timings, len(keyset_timings))
+    fields_timings, _ = walk_keyset(total_pages, args.limit, fields=LIST_FIELDS.split(","))
+    report("keyset + fields", fields_timings, len(fields_timings))
+
+    http_timings = walk_http(client, args.http_pages, args.limit)
+    report("HTTP", http_timings, len(http_timings))
+    http_fields_timings = walk_http(client, args.http_pages, args.limit, fields=LIST_FIELDS)
+    report("HTTP + fields", http_fields_timings, len(http_fields_timings))
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_candidate_rankings_job_score"))
+        conn.execute(text("DROP INDEX ix_candidate_rankings_job_created"))
+    no_index_timings, _ = walk_keyset(50, args.limit)
+    report("keyset, no index", no_index_timings, len(no_index_timings))
+
+    # Pages must be disjoint and in order
+    scores = [r["total_score"] for r in seen]
+    candidates = [r["candidate_id"] for r in seen]
+    ordered = all(a >= b for a, b in zip(scores, scores[1:]))
+    unique = len(set(candidates)) == len(candidates) == job_rows
+    print(f"\n{'✅' if ordered and unique else '❌'} {len(seen):,} rows over {len(keyset_timings)} pages: "
+          f"{'ordered' if ordered else 'NOT ordered'}, {'complete, no duplicates' if unique else 'missing or duplicate rows'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark for re-ranking a job under new weights
+Seeds a temporary SQLite database with the same synthetic component scores for three
+jobs and re-ranks each one with:
+  - before: per-row ORM updates (load every ranking, recompute it in Python, flush N UPDATEs)
+  - vectorized: rerank_job(method="vectorized"), NumPy scoring + one executemany UPDATE
+  - sql: rerank_job(method="sql"), a single UPDATE ... SET computed by the database
+then checks the results against the per-row recomputation and times
+PUT /jobs/{job_id}/ranking-weights end to end.
+
+Usage:
+    python scripts/benchmark_rerank.py --candidates 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+# The API binds its engine at import time
+TMP_DIR = tempfile.mkdtemp(prefix="benchmark_rerank_")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR}/rankings.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from api import db_models
+from api.database import SessionLocal, engine
+from api.main import app
+from api.migrations import migrate_database
+from api.ranking import HIGHLY_SUITABLE_MIN_SCORE, SUITABLE_MIN_SCORE, RankingWeights, SuitabilityLabels
+from api.ranking_store import rerank_job
+
+SENIOR_WEIGHTS = RankingWeights(skill_match=0.30, experience_match=0.45, role_confidence=0.15, ats_score=0.10)
+JOBS = {"orm": "job-rerank-orm", "vectorized": "job-rerank-vectorized", "sql": "job-rerank-sql"}
+
+
+def seed(candidates: int):
+    rng = random.Random(7)
+    created_at = datetime(2025, 1, 1)
+    components = [
+        {
+            "skill_score": round(rng.uniform(0, 100), 2),
+            "experience_score": round(min(100.0, rng.uniform(0, 150)), 2),
+            "role_confidence_score": round(rng.uniform(0, 100), 2),
+            "ats_score": round(rng.uniform(0, 100), 2)
+        }
+        for _ in range(candidates)
+    ]
+    with engine.begin() as conn:
+        for job_id in JOBS.values():
+            conn.execute(insert(db_models.CandidateRanking.__table__), [
+                {
+                    "candidate_id": f"cand-{i}", "job_id": job_id, "total_score": 0.0,
+                    "suitability_label": "", "missing_skills": "", "created_at": created_at, **c
+                }
+                for i, c in enumerate(components)
+            ])
+
+
+def rerank_per_row(job_id: str, weights: RankingWeights) -> int:
+    """Before: every ranking loaded as an ORM object and updated one by one"""
+    ws = weights
+    with SessionLocal() as db:
+        rows = db.query(db_models.CandidateRanking).filter(db_models.CandidateRanking.job_id == job_id).all()
+        for row in rows:
+            total = (
+                (row.skill_score * ws.skill_match) +
+                (row.experience_score * ws.experience_match) +
+                (row.role_confidence_score * ws.role_confidence) +
+                (row.ats_score * ws.ats_score)
+            )
+            row.total_score = round(total, 2)
+            if total >= HIGHLY_SUITABLE_MIN_SCORE:
+                row.suitability_label = SuitabilityLabels.HIGHLY_SUITABLE
+            elif total >= SUITABLE_MIN_SCORE:
+                row.suitability_label = SuitabilityLabels.SUITABLE
+            else:
+                row.suitability_label = SuitabilityLabels.NEEDS_IMPROVEMENT
+        db.commit()
+        return len(rows)
+
+
+def stored(job_id: str):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT candidate_id, total_score, suitability_label FROM candidate_rankings WHERE job_id = :job ORDER BY id"),
+            {"job": job_id}
+        ).all()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-rank benchmark")
+    parser.add_argument("--candidates", type=int, default=100_000)
+    args = parser.parse_args()
+
+    migrate_database()
+    print(f"🔹 Seeding {len(JOBS)} jobs x {args.candidates:,} rankings...")
+    seed(args.candidates)
+
+    print(f"\n  {'method':<12} {'candidates':>10} {'ms':>10}")
+    timings = {}
+    for method, job_id in JOBS.items():
+        if method == "orm":
+            count, timings[method] = timed(lambda: rerank_per_row(job_id, SENIOR_WEIGHTS))
+        else:
+            with SessionLocal() as db:
+                count, timings[method] = timed(lambda: rerank_job(db, job_id, SENIOR_WEIGHTS, method=method))
+        print(f"  {method:<12} {count:>10,} {timings[method]:>10.1f}")
+
+    reference, vectorized, sql = (stored(JOBS[m]) for m in ("orm", "vectorized", "sql"))
+    vectorized_same = [(r[1], r[2]) for r in vectorized] == [(r[1], r[2]) for r in reference]
+    sql_score_diffs = sum(a[1] != b[1] for a, b in zip(sql, reference))
+    sql_labels_same = [r[2] for r in sql] == [r[2] for r in reference]
+
+    client = TestClient(app)
+    response, http_ms = timed(lambda: client.put(
+        f"/jobs/{JOBS['vectorized']}/ranking-weights",
+        json={"skill_match": 0.5, "experience_match": 0.2, "role_confidence": 0.2, "ats_score": 0.1}
+    ))
+    response.raise_for_status()
+    rerank = response.json()["rerank"]
+    print(f"  {'PUT weights':<12} {rerank['candidates']:>10,} {http_ms:>10.1f}   (rerank elapsed_ms {rerank['elapsed_ms']})")
+
+    print(f"\n{'✅' if vectorized_same else '❌'} vectorized scores and labels identical to the per-row recomputation")
+    print(f"{'✅' if sql_labels_same else '❌'} sql labels identical; {sql_score_diffs} scores differ by the database's ROUND")
+    print(f"✅ vectorized {timings['orm'] / timings['vectorized']:.0f}x, sql {timings['orm'] / timings['sql']:.0f}x faster than per-row updates")
+    if not (vectorized_same and sql_labels_same):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark for the interview session list
+Seeds a temporary SQLite database with one applicant's sessions and messages, then
+compares query counts and latency of:
+  - before: the previous /chat/sessions (SessionSchema with messages, lazy-loaded per session)
+  - eager: the same full response with selectinload
+  - summary: the current /chat/sessions (one aggregate query, no message bodies)
+  - messages page: /chat/sessions/{id}/messages (one page of one session)
+
+Usage:
+    python scripts/benchmark_session_listing.py --sessions 200 --messages 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+# The API binds its engine at import time
+TMP_DIR = tempfile.mkdtemp(prefix="benchmark_session_listing_")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR}/chats.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import selectinload
+
+from api import db_models
+from api.database import SessionLocal, engine
+from api.main import app
+from api.migrations import migrate_database
+from api.models import SessionSchema
+
+APPLICANT_ID = "benchmark-sessions"
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the engine"""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def seed(sessions: int, messages: int):
+    start = datetime(2025, 1, 1)
+    db = SessionLocal()
+    try:
+        for i in range(sessions):
+            session = db_models.ChatSession(
+                applicant_id=APPLICANT_ID, title=f"Interview Practice {i}", created_at=start + timedelta(days=i)
+            )
+            session.messages = [
+                db_models.ChatMessage(
+                    sender="user" if j % 2 == 0 else "ai",
+                    content=f"Message {j} of session {i}: " + "lorem ipsum dolor sit amet " * 20,
+                    timestamp=start + timedelta(days=i, minutes=j)
+                )
+                for j in range(messages)
+            ]
+            db.add(session)
+        db.commit()
+    finally:
+        db.close()
+
+
+def serialize(sessions) -> str:
+    return "[" + ",".join(SessionSchema.model_validate(s).model_dump_json() for s in sessions) + "]"
+
+
+def list_lazy():
+    db = SessionLocal()
+    try:
+        sessions = db.query(db_models.ChatSession).filter(
+            db_models.ChatSession.applicant_id == APPLICANT_ID
+        ).order_by(db_models.ChatSession.id.desc()).all()
+        return serialize(sessions)
+    finally:
+        db.close()
+
+
+def list_eager():
+    db = SessionLocal()
+    try:
+        sessions = db.query(db_models.ChatSession).options(
+            selectinload(db_models.ChatSession.messages)
+        ).filter(
+            db_models.ChatSession.applicant_id == APPLICANT_ID
+        ).order_by(db_models.ChatSession.id.desc()).all()
+        return serialize(sessions)
+    finally:
+        db.close()
+
+
+def measure(name: str, fn, counter: QueryCounter, repeat: int):
+    fn()  # Warm-up
+    timings = []
+    for _ in range(repeat):
+        counter.count = 0
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    print(
+        f"  {name:<14} {counter.count:>6} {statistics.median(timings) * 1000:>10.1f} "
+        f"{len(result) / 1024:>10.0f}"
+    )
+    return counter.count, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session listing benchmark")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    migrate_database()
+    print(f"🔹 Seeding {args.sessions} sessions x {args.messages} messages...")
+    seed(args.sessions, args.messages)
+
+    client = TestClient(app)
+    counter = QueryCounter()
+    params = {"applicant_id": APPLICANT_ID}
+    latest_id = client.get("/chat/sessions", params=params).json()[0]["id"]
+
+    def summary():
+        response = client.get("/chat/sessions", params=params)
+        response.raise_for_status()
+        return response.content
+
+    def page():
+        response = client.get(f"/chat/sessions/{latest_id}/messages", params={**params, "limit": 50})
+        response.raise_for_status()
+        return response.content
+
+    print(f"\n  {'':<14} {'queries':>6} {'median ms':>10} {'payload KB':>10}")
+    lazy_queries, lazy_time = measure("before (lazy)", list_lazy, counter, args.repeat)
+    measure("selectinload", list_eager, counter, args.repeat)
+    summary_queries, summary_time = measure("summary", summary, counter, args.repeat)
+    measure("messages page", page, counter, args.repeat)
+
+    print(
+        f"\n✅ Session list: {lazy_queries} -> {summary_queries} queries, "
+        f"{lazy_time * 1000:.1f} -> {summary_time * 1000:.1f} ms ({lazy_time / summary_time:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Microbenchmark for skill extraction
+Compares the legacy six-regex scan with the compiled SkillMatcher over data/bert_test.csv
+and checks that every skill found by the legacy patterns is still found.
+
+Usage:
+    python scripts/benchmark_skill_matcher.py --repeat 5
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+from skill_matcher import get_skill_matcher
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "bert_test.csv"
+
+# Patterns used by extract_skills_keywords before the compiled matcher
+LEGACY_SKILL_PATTERNS = [
+    r'\b(?:Python|Java|JavaScript|TypeScript|C\+\+|C#|\.NET|Go|Ruby|PHP|Swift|Kotlin|Rust|Scala|Perl)\b',
+    r'\b(?:HTML\d?|CSS\d?|React|Angular|Vue|Node\.js|Next\.js|Express|Django|Flask|Spring|ASP\.NET|Blazor)\b',
+    r'\b(?:Machine Learning|Deep Learning|NLP|Computer Vision|AI|TensorFlow|PyTorch|Scikit-learn|Pandas|NumPy|Keras|OpenCV|Spacy|NLTK)\b',
+    r'\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Terraform|Ansible|CircleCI|Git|GitHub|GitLab|CI/CD)\b',
+    r'\b(?:SQL|MySQL|PostgreSQL|MongoDB|Redis|Oracle|Cassandra|DynamoDB|Elasticsearch)\b',
+    r'\b(?:Agile|Scrum|JIRA|Rest API|GraphQL|Microservices|System Design|Unit Testing)\b'
+]
+
+
+def legacy_extract(text):
+    skills = []
+    for pattern in LEGACY_SKILL_PATTERNS:
+        skills.extend(re.findall(pattern, text, re.IGNORECASE))
+    return list(set(skills))
+
+
+def bench(fn, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill extraction microbenchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(DATA_PATH)["text"].astype(str).tolist()
+    matcher = get_skill_matcher()
+
+    # Parity: legacy surface forms mapped to canonical names must all be found
+    missing, extra = 0, 0
+    for text in texts:
+        legacy = {matcher.canonicalize(s) for s in legacy_extract(text)}
+        new = set(matcher.extract(text))
+        missing += len(legacy - new)
+        extra += len(new - legacy)
+
+    legacy_time = bench(legacy_extract, texts, args.repeat)
+    matcher_time = bench(matcher.extract, texts, args.repeat)
+
+    print("=" * 60)
+    print(f"SKILL EXTRACTION BENCHMARK ({len(texts)} resumes, best of {args.repeat})")
+    print("=" * 60)
+    print(f"legacy regex:   {legacy_time * 1000:8.1f} ms ({legacy_time / len(texts) * 1e6:7.1f} us/resume)")
+    print(f"SkillMatcher:   {matcher_time * 1000:8.1f} ms ({matcher_time / len(texts) * 1e6:7.1f} us/resume)")
+    print(f"speedup:        {legacy_time / matcher_time:8.2f}x")
+    print(f"\nParity: {missing} legacy skills missed, {extra} additional skills found (aliases / boundary fixes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cold-start benchmark for the AI service
+Reports module import time, then starts a fresh uvicorn worker and measures time
+until /health answers (liveness), until /ready answers (models loaded and warmed up),
+and until the first /analyze-resume prediction returns.
+
+Usage:
+    python scripts/benchmark_startup.py --runs 3
+    python scripts/benchmark_startup.py --env MODEL_WARMUP=blocking
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+
+SAMPLE_RESUME = (
+    "Experienced Python Developer with 5 years of experience in Django, FastAPI, and React. "
+    "Strong background in AWS and Docker. Education: BS in Computer Science."
+)
+
+
+def measure_import(env) -> float:
+    """Seconds to import api.main in a fresh interpreter"""
+    code = "import time; t = time.perf_counter(); import api.main; print(time.perf_counter() - t)"
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(client, url, deadline, status=200) -> float:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(url).status_code == status:
+                return time.perf_counter()
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} did not return {status} in time")
+
+
+def measure_server(env, timeout) -> dict:
+    """Start one uvicorn worker and time liveness, readiness and the first prediction"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=timeout) as client:
+            deadline = start + timeout
+            live = wait_for(client, "/health", deadline)
+            ready = wait_for(client, "/ready", deadline)
+            status = client.get("/ready").json()
+
+            response = client.post("/analyze-resume", json={"text": SAMPLE_RESUME})
+            response.raise_for_status()
+            first_prediction = time.perf_counter()
+
+        return {
+            "live": live - start,
+            "ready": ready - start,
+            "first_prediction": first_prediction - start,
+            "first_prediction_latency": first_prediction - ready,
+            "model_load": status.get("load_seconds") or 0.0,
+            "warmup": status.get("warmup_seconds") or 0.0
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI service cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--env", nargs="*", default=[], help="Extra KEY=VALUE environment variables")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env.update(item.split("=", 1) for item in args.env)
+
+    imports = [measure_import(env) for _ in range(args.runs)]
+    servers = [measure_server(env, args.timeout) for _ in range(args.runs)]
+
+    print("=" * 60)
+    print(f"STARTUP BENCHMARK (median of {args.runs} runs)")
+    if args.env:
+        print(f"Environment: {' '.join(args.env)}")
+    print("=" * 60)
+    print(f"import api.main:            {statistics.median(imports):8.2f} s")
+    for key, label in [
+        ("live", "spawn -> /health 200:"),
+        ("model_load", "model load:"),
+        ("warmup", "warm-up pass:"),
+        ("ready", "spawn -> /ready 200:"),
+        ("first_prediction_latency", "first prediction latency:"),
+        ("first_prediction", "spawn -> first prediction:")
+    ]:
+        print(f"{label:<28}{statistics.median(r[key] for r in servers):8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
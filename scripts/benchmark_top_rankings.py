@@ -0,0 +1,142 @@
+"""
+Benchmark for top-K candidate retrieval
+Seeds a temporary SQLite database with synthetic rankings across many jobs and
+compares, for global and per-job top-K queries:
+  - before: every matching ranking loaded with .all() and sorted in Python
+  - heap: top_rankings, streaming rows with yield_per through bounded heaps
+reporting time, peak Python memory (tracemalloc) and whether both return the
+same candidates in the same order.
+
+Usage:
+    python scripts/benchmark_top_rankings.py --rows 1000000 --k 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+# The API binds its engine at import time
+TMP_DIR = tempfile.mkdtemp(prefix="benchmark_top_rankings_")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR}/rankings.db"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from api import db_models
+from api.database import SessionLocal, engine
+from api.main import app
+from api.migrations import migrate_database
+from api.ranking import SuitabilityLabels
+from api.ranking_store import top_rankings
+
+LABELS = [SuitabilityLabels.HIGHLY_SUITABLE, SuitabilityLabels.SUITABLE, SuitabilityLabels.NEEDS_IMPROVEMENT]
+INSERT_CHUNK = 50000
+
+
+def seed(rows: int, jobs: int):
+    rng = random.Random(11)
+    start = datetime(2025, 1, 1)
+
+    def row(i):
+        score = round(rng.uniform(0, 100), 1)
+        label = LABELS[0] if score >= 80 else LABELS[1] if score >= 60 else LABELS[2]
+        return {
+            "candidate_id": f"cand-{i}", "job_id": f"job-{rng.randrange(jobs)}",
+            "total_score": score, "suitability_label": label,
+            "skill_score": round(rng.uniform(0, 100), 2), "experience_score": round(rng.uniform(0, 100), 2),
+            "role_confidence_score": round(rng.uniform(0, 100), 2), "ats_score": round(rng.uniform(0, 100), 2),
+            "missing_skills": "Docker,Kubernetes", "created_at": start + timedelta(seconds=i)
+        }
+
+    with engine.begin() as conn:
+        for chunk_start in range(0, rows, INSERT_CHUNK):
+            conn.execute(
+                insert(db_models.CandidateRanking.__table__),
+                [row(i) for i in range(chunk_start, min(rows, chunk_start + INSERT_CHUNK))]
+            )
+
+
+def all_and_sort(k: int, labels=None, per_job=False):
+    """Before: load every matching ranking, sort it, slice the top k"""
+    with SessionLocal() as db:
+        query = db.query(db_models.CandidateRanking)
+        if labels:
+            query = query.filter(db_models.CandidateRanking.suitability_label.in_(labels))
+        rows = sorted(query.all(), key=lambda r: (r.total_score, r.id), reverse=True)
+    if not per_job:
+        return {None: [r.candidate_id for r in rows[:k]]}
+    groups = defaultdict(list)
+    for r in rows:
+        if len(groups[r.job_id]) < k:
+            groups[r.job_id].append(r.candidate_id)
+    return dict(groups)
+
+
+def heap_top(k: int, labels=None, per_job=False):
+    with SessionLocal() as db:
+        groups, _ = top_rankings(db, k, labels=labels, per_job=per_job)
+    return {group: [r["candidate_id"] for r in rankings] for group, rankings in groups.items()}
+
+
+def measure(fn):
+    """(seconds, peak traced MB, result); time and memory come from separate runs"""
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Top-K rankings benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    migrate_database()
+    print(f"🔹 Seeding {args.rows:,} rankings across {args.jobs} jobs...")
+    seed(args.rows, args.jobs)
+
+    cases = [
+        ("global", {}),
+        ("per job", {"per_job": True}),
+        ("global, label filter", {"labels": [SuitabilityLabels.SUITABLE]})
+    ]
+    print(f"\n  {'top ' + str(args.k):<22} {'method':<8} {'seconds':>8} {'peak MB':>9}")
+    all_same = True
+    for name, options in cases:
+        before_time, before_peak, expected = measure(lambda: all_and_sort(args.k, **options))
+        heap_time, heap_peak, actual = measure(lambda: heap_top(args.k, **options))
+        same = expected == actual
+        all_same &= same
+        print(f"  {name:<22} {'before':<8} {before_time:>8.2f} {before_peak:>9.1f}")
+        print(f"  {'':<22} {'heap':<8} {heap_time:>8.2f} {heap_peak:>9.1f}   {'✅ same' if same else '❌ different'} results")
+
+    client = TestClient(app)
+    start = time.perf_counter()
+    response = client.get("/rankings/top", params={"k": args.k, "suitability_label": SuitabilityLabels.HIGHLY_SUITABLE})
+    response.raise_for_status()
+    body = response.json()
+    print(f"\n🔹 GET /rankings/top: {len(body['rankings'])} rankings, {body['scanned']:,} scanned in {time.perf_counter() - start:.2f}s")
+
+    if not all_same:
+        sys.exit(1)
+    print("\n✅ Heap top-K matches .all() + sort")
+
+
+if __name__ == "__main__":
+    main()
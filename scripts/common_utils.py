@@ -6,11 +6,17 @@ Common helpers for data preprocessing, text cleaning, and model utilities
 import re
 import json
 import pickle
+import random
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
-import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+
+try:
+    from skill_matcher import get_skill_matcher
+except ImportError:
+    import sys
+    sys.path.append(str(Path(__file__).parent))
+    from skill_matcher import get_skill_matcher
 
 
 def clean_text(text: str) -> str:
@@ -93,6 +99,8 @@ def create_train_val_split(
     Returns:
         Tuple of (train_data, val_data)
     """
+    from sklearn.model_selection import train_test_split
+
     train_data, val_data = train_test_split(
         data, 
         test_size=val_size, 
@@ -101,44 +109,59 @@ def create_train_val_split(
     return train_data, val_data
 
 
-def extract_skills_keywords(text: str) -> List[str]:
+def length_buckets(
+    lengths: List[int],
+    batch_size: int,
+    shuffle: bool = False,
+    pool_factor: int = 50,
+    seed: int = None
+) -> List[List[int]]:
     """
-    Extract potential skill keywords from text
-    Simple keyword extraction based on common patterns
+    Group sample indices into batches of similar sequence length
+    so that dynamic padding wastes as few tokens as possible
     
     Args:
-        text: Resume or job description text
+        lengths: Token length of each sample
+        batch_size: Samples per batch
+        shuffle: Randomize batches (for training); sorting then happens
+            within pools of batch_size * pool_factor samples
+        pool_factor: Pool size multiplier used when shuffling
+        seed: Random seed
         
     Returns:
-        List of potential skill keywords
+        List of batches, each a list of sample indices
     """
-    # Common skill patterns
-    skill_patterns = [
-        # Programming Languages
-        r'\b(?:Python|Java|JavaScript|TypeScript|C\+\+|C#|\.NET|Go|Ruby|PHP|Swift|Kotlin|Rust|Scala|Perl)\b',
-        
-        # Web Technologies
-        r'\b(?:HTML\d?|CSS\d?|React|Angular|Vue|Node\.js|Next\.js|Express|Django|Flask|Spring|ASP\.NET|Blazor)\b',
-        
-        # AI/ML/Data
-        r'\b(?:Machine Learning|Deep Learning|NLP|Computer Vision|AI|TensorFlow|PyTorch|Scikit-learn|Pandas|NumPy|Keras|OpenCV|Spacy|NLTK)\b',
-        
-        # Cloud & DevOps
-        r'\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Terraform|Ansible|CircleCI|Git|GitHub|GitLab|CI/CD)\b',
-        
-        # Databases
-        r'\b(?:SQL|MySQL|PostgreSQL|MongoDB|Redis|Oracle|Cassandra|DynamoDB|Elasticsearch)\b',
-        
-        # Tools & Concepts
-        r'\b(?:Agile|Scrum|JIRA|Rest API|GraphQL|Microservices|System Design|Unit Testing)\b'
-    ]
+    indices = list(range(len(lengths)))
+    
+    if not shuffle:
+        indices.sort(key=lengths.__getitem__)
+        return [indices[i:i + batch_size] for i in range(0, len(indices), batch_size)]
+    
+    rng = random.Random(seed)
+    rng.shuffle(indices)
     
-    skills = []
-    for pattern in skill_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        skills.extend(matches)
+    pool_size = batch_size * pool_factor
+    batches = []
+    for start in range(0, len(indices), pool_size):
+        pool = sorted(indices[start:start + pool_size], key=lengths.__getitem__)
+        batches.extend(pool[i:i + batch_size] for i in range(0, len(pool), batch_size))
     
-    return list(set(skills))  # Remove duplicates
+    rng.shuffle(batches)
+    return batches
+
+
+def extract_skills_keywords(text: str) -> List[str]:
+    """
+    Extract skill keywords from text using the compiled skill taxonomy
+    (see skill_matcher.py and data/skill_taxonomy.json)
+    
+    Args:
+        text: Resume or job description text
+        
+    Returns:
+        List of unique canonical skill names
+    """
+    return get_skill_matcher().extract(text)
 
 
 def calculate_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
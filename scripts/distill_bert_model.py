@@ -0,0 +1,359 @@
+"""
+Distill the BERT role classifier into a smaller student for high-volume screening
+The student keeps every k-th transformer layer of the teacher (bert_classifier_best)
+and is trained on the teacher's soft labels plus the true labels.
+Saved as models/bert_classifier_fast, which the API serves as its "fast" tier.
+"""
+
+# =========================
+# 🔥 MEMORY & DEVICE SAFETY
+# =========================
+import os
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.optim import AdamW
+from tqdm import tqdm
+from transformers import BertTokenizer, BertForSequenceClassification, get_linear_schedule_with_warmup
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).parent))
+
+from common_utils import load_pickle, ensure_dir, get_device, calculate_metrics
+from train_bert_model import ResumeDataset, make_data_loader, eval_model
+from api.classifier import classify_texts
+
+
+# =========================
+# 📦 DATASET
+# =========================
+class DistillationDataset(ResumeDataset):
+    """ResumeDataset that also yields the teacher's logits for each resume"""
+
+    def __init__(self, texts, labels, tokenizer, teacher_logits, max_length=512):
+        super().__init__(texts, labels, tokenizer, max_length)
+        self.teacher_logits = teacher_logits
+
+    def __getitem__(self, idx):
+        item = super().__getitem__(idx)
+        item["teacher_logits"] = self.teacher_logits[idx]
+        return item
+
+
+def compute_teacher_logits(teacher, dataset, tokenizer, batch_size, device):
+    """Run the teacher once over the training set (cheaper than once per epoch)"""
+    teacher.eval()
+    logits = [None] * len(dataset)
+    loader = make_data_loader(dataset, tokenizer, batch_size)
+
+    # The bucketed sampler reorders resumes, so map results back by index
+    order = [i for bucket in loader.batch_sampler for i in bucket]
+    position = 0
+    with torch.no_grad():
+        for batch in tqdm(loader, desc="Teacher logits"):
+            outputs = teacher(
+                input_ids=batch["input_ids"].to(device),
+                attention_mask=batch["attention_mask"].to(device)
+            )
+            for row in outputs.logits.float().cpu().tolist():
+                logits[order[position]] = row
+                position += 1
+
+    return logits
+
+
+# =========================
+# 🧠 STUDENT
+# =========================
+def build_student(teacher, num_layers):
+    """
+    Student with num_layers transformer layers, initialized from evenly spaced
+    teacher layers (plus the teacher's embeddings, pooler and classifier head)
+    """
+    teacher_layers = teacher.config.num_hidden_layers
+    if not 0 < num_layers <= teacher_layers:
+        raise ValueError(f"num_layers must be between 1 and {teacher_layers}")
+
+    config = copy.deepcopy(teacher.config)
+    config.num_hidden_layers = num_layers
+    student = BertForSequenceClassification(config)
+
+    step = teacher_layers / num_layers
+    kept = [int(round((i + 1) * step)) - 1 for i in range(num_layers)]
+
+    state = teacher.state_dict()
+    student_state = {}
+    for key, value in state.items():
+        if ".encoder.layer." in key:
+            prefix, rest = key.split(".encoder.layer.", 1)
+            layer, suffix = rest.split(".", 1)
+            if int(layer) not in kept:
+                continue
+            key = f"{prefix}.encoder.layer.{kept.index(int(layer))}.{suffix}"
+        student_state[key] = value
+
+    student.load_state_dict(student_state, strict=False)
+    print(f"Student: {num_layers}/{teacher_layers} layers (teacher layers {kept})")
+    return student
+
+
+def distillation_loss(student_logits, teacher_logits, labels, temperature=2.0, alpha=0.5):
+    """
+    alpha * KL(teacher || student) on temperature-softened distributions
+    + (1 - alpha) * cross-entropy with the true labels
+    """
+    soft = F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=1),
+        F.softmax(teacher_logits / temperature, dim=1),
+        reduction="batchmean"
+    ) * (temperature ** 2)
+    hard = F.cross_entropy(student_logits, labels)
+    return alpha * soft + (1 - alpha) * hard
+
+
+# =========================
+# 🔁 TRAIN ONE EPOCH
+# =========================
+def distill_epoch(student, data_loader, optimizer, scheduler, device, temperature, alpha):
+    student.train()
+    losses = []
+
+    for batch in tqdm(data_loader, desc="Distilling"):
+        optimizer.zero_grad()
+
+        outputs = student(
+            input_ids=batch["input_ids"].to(device),
+            attention_mask=batch["attention_mask"].to(device)
+        )
+        loss = distillation_loss(
+            outputs.logits,
+            batch["teacher_logits"].to(device),
+            batch["labels"].to(device),
+            temperature=temperature,
+            alpha=alpha
+        )
+
+        loss.backward()
+        torch.nn.utils.clip_grad_norm_(student.parameters(), 1.0)
+        optimizer.step()
+        scheduler.step()
+        losses.append(loss.item())
+
+    return float(np.mean(losses))
+
+
+# =========================
+# 📊 TIER REPORT
+# =========================
+def tier_report(teacher, student, tokenizer, test_df, label_mapping, device, thresholds, batch_size=16):
+    """
+    Throughput of each tier on the test set, and accuracy / escalation rate of
+    the student-first cascade at each confidence threshold
+    """
+    texts = test_df["text"].astype(str).tolist()
+    y_true = [label_mapping[i] for i in test_df["label_encoded"]]
+
+    tiers = {}
+    for name, model in (("fast", student), ("full", teacher)):
+        start = time.perf_counter()
+        predictions = classify_texts(texts, model, tokenizer, device, label_mapping, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        y_pred = [p["predicted_role"] for p in predictions]
+        tiers[name] = {
+            "predictions": predictions,
+            "docs_per_sec": len(texts) / elapsed,
+            "metrics": calculate_metrics(np.array(y_true), np.array(y_pred))
+        }
+
+    print("\n" + "=" * 60)
+    print("TIER REPORT")
+    print("=" * 60)
+    for name, tier in tiers.items():
+        print(f"{name:<6} {tier['docs_per_sec']:8.1f} docs/s | acc {tier['metrics']['accuracy']:.4f} | F1 {tier['metrics']['f1']:.4f}")
+
+    fast_seconds = len(texts) / tiers["fast"]["docs_per_sec"]
+    full_seconds_per_doc = 1 / tiers["full"]["docs_per_sec"]
+
+    cascade = []
+    print(f"\n{'threshold':>10}{'escalated':>11}{'accuracy':>10}{'F1':>8}{'docs/s':>10}")
+    for threshold in thresholds:
+        y_pred, escalated = [], 0
+        for fast, full in zip(tiers["fast"]["predictions"], tiers["full"]["predictions"]):
+            if fast["confidence"] < threshold:
+                escalated += 1
+                y_pred.append(full["predicted_role"])
+            else:
+                y_pred.append(fast["predicted_role"])
+
+        metrics = calculate_metrics(np.array(y_true), np.array(y_pred))
+        docs_per_sec = len(texts) / (fast_seconds + escalated * full_seconds_per_doc)
+        rate = escalated / len(texts)
+        cascade.append({
+            "threshold": threshold,
+            "escalation_rate": rate,
+            "accuracy": metrics["accuracy"],
+            "f1": metrics["f1"],
+            "docs_per_sec": docs_per_sec
+        })
+        print(f"{threshold:>10.2f}{rate:>11.2%}{metrics['accuracy']:>10.4f}{metrics['f1']:>8.4f}{docs_per_sec:>10.1f}")
+
+    return {
+        "tiers": {
+            name: {
+                "docs_per_sec": tier["docs_per_sec"],
+                "metrics": {k: float(v) for k, v in tier["metrics"].items()}
+            }
+            for name, tier in tiers.items()
+        },
+        "cascade": cascade
+    }
+
+
+# =========================
+# 🚀 DISTILL BERT CLASSIFIER
+# =========================
+def distill_bert_classifier(
+    train_df,
+    val_df,
+    test_df,
+    label_mapping,
+    teacher_dir,
+    output_dir,
+    num_layers=4,
+    temperature=2.0,
+    alpha=0.5,
+    max_length=512,
+    batch_size=16,
+    epochs=5,
+    learning_rate=5e-5,
+    thresholds=(0.5, 0.6, 0.7, 0.8, 0.9)
+):
+    print("=" * 60)
+    print("DISTILLING BERT CLASSIFIER")
+    print("=" * 60)
+
+    device = get_device()
+    print(f"\nUsing device: {device}")
+
+    tokenizer = BertTokenizer.from_pretrained(teacher_dir)
+    teacher = BertForSequenceClassification.from_pretrained(teacher_dir).to(device).eval()
+
+    train_dataset = ResumeDataset(
+        train_df["text"].values, train_df["label_encoded"].values, tokenizer, max_length
+    )
+    teacher_logits = compute_teacher_logits(teacher, train_dataset, tokenizer, batch_size, device)
+    train_dataset = DistillationDataset(
+        train_df["text"].values, train_df["label_encoded"].values, tokenizer, teacher_logits, max_length
+    )
+    val_dataset = ResumeDataset(
+        val_df["text"].values, val_df["label_encoded"].values, tokenizer, max_length
+    )
+
+    train_loader = make_data_loader(train_dataset, tokenizer, batch_size, shuffle=True)
+    val_loader = make_data_loader(val_dataset, tokenizer, batch_size)
+
+    student = build_student(teacher, num_layers).to(device)
+
+    optimizer = AdamW(student.parameters(), lr=learning_rate)
+    total_steps = len(train_loader) * epochs
+    scheduler = get_linear_schedule_with_warmup(
+        optimizer,
+        num_warmup_steps=int(0.1 * total_steps),
+        num_training_steps=total_steps
+    )
+
+    best_path = Path(output_dir) / "bert_classifier_fast"
+    best_val_f1 = -1.0
+    history = {"train_loss": [], "val_loss": [], "val_acc": [], "val_f1": []}
+
+    for epoch in range(epochs):
+        print(f"\nEpoch {epoch + 1}/{epochs}")
+
+        train_loss = distill_epoch(student, train_loader, optimizer, scheduler, device, temperature, alpha)
+        val_metrics, _, _ = eval_model(student, val_loader, device)
+
+        print(f"Distill Loss: {train_loss:.4f}")
+        print(f"Val Acc: {val_metrics['accuracy']:.4f} | Val F1: {val_metrics['f1']:.4f}")
+
+        history["train_loss"].append(train_loss)
+        history["val_loss"].append(val_metrics["loss"])
+        history["val_acc"].append(val_metrics["accuracy"])
+        history["val_f1"].append(val_metrics["f1"])
+
+        if val_metrics["f1"] > best_val_f1:
+            best_val_f1 = val_metrics["f1"]
+            ensure_dir(best_path)
+            student.save_pretrained(best_path)
+            tokenizer.save_pretrained(best_path)
+
+    # =========================
+    # 🧪 TIER EVALUATION
+    # =========================
+    student = BertForSequenceClassification.from_pretrained(best_path).to(device).eval()
+    report = tier_report(teacher, student, tokenizer, test_df, label_mapping, device, thresholds, batch_size)
+
+    with open(Path(output_dir) / "bert_distill_results.json", "w") as f:
+        json.dump(
+            {
+                "num_layers": num_layers,
+                "temperature": temperature,
+                "alpha": alpha,
+                "best_val_f1": float(best_val_f1),
+                "history": {k: [float(x) for x in v] for k, v in history.items()},
+                **report
+            },
+            f,
+            indent=2
+        )
+
+    return student, report
+
+
+# =========================
+# 🧠 MAIN
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="Distill the BERT classifier into a fast student")
+    parser.add_argument("--data-dir", default=str(BASE_DIR / "data"))
+    parser.add_argument("--output-dir", default=str(BASE_DIR / "models"))
+    parser.add_argument("--num-layers", type=int, default=4)
+    parser.add_argument("--temperature", type=float, default=2.0)
+    parser.add_argument("--alpha", type=float, default=0.5, help="Weight of the soft-label loss")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--learning-rate", type=float, default=5e-5)
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    train_df = load_pickle(data_dir / "bert_train.pkl")
+    val_df = load_pickle(data_dir / "bert_val.pkl")
+    test_df = load_pickle(data_dir / "bert_test.pkl")
+    label_mapping = load_pickle(data_dir / "label_mapping.pkl")
+
+    distill_bert_classifier(
+        train_df, val_df, test_df, label_mapping,
+        teacher_dir=Path(args.output_dir) / "bert_classifier_best",
+        output_dir=args.output_dir,
+        num_layers=args.num_layers,
+        temperature=args.temperature,
+        alpha=args.alpha,
+        batch_size=args.batch_size,
+        epochs=args.epochs,
+        learning_rate=args.learning_rate
+    )
+
+    print("\nDISTILLATION COMPLETE")
+
+
+if __name__ == "__main__":
+    main()
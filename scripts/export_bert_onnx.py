@@ -0,0 +1,101 @@
+"""
+Export the fine-tuned BERT classifier to ONNX
+Writes models/bert_classifier_best/model.onnx with dynamic batch and sequence axes,
+then checks the onnxruntime logits against PyTorch on a few test resumes.
+
+Usage:
+    python scripts/export_bert_onnx.py --opset 17
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import torch
+from transformers import BertTokenizer, BertForSequenceClassification
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).parent))
+
+from common_utils import load_pickle
+from api.classifier import OnnxClassifier
+
+MODEL_DIR = BASE_DIR / "models" / "bert_classifier_best"
+DATA_DIR = BASE_DIR / "data"
+
+
+def export_onnx(model_dir: Path, output_path: Path, opset: int = 17) -> None:
+    """
+    Trace the classifier with a padded two-resume batch and export it
+
+    Args:
+        model_dir: Directory with the saved model and tokenizer
+        output_path: Destination .onnx file
+        opset: ONNX opset version
+    """
+    tokenizer = BertTokenizer.from_pretrained(model_dir)
+    model = BertForSequenceClassification.from_pretrained(model_dir).eval()
+
+    sample = tokenizer(
+        ["Python developer with 5 years of experience", "Accountant"],
+        padding=True,
+        return_tensors="pt"
+    )
+
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        str(output_path),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"}
+        },
+        opset_version=opset,
+        dynamo=False
+    )
+
+
+def check_parity(model_dir: Path, onnx_path: Path, n_samples: int = 8) -> float:
+    """Max absolute logit difference between PyTorch and onnxruntime on test resumes"""
+    tokenizer = BertTokenizer.from_pretrained(model_dir)
+    model = BertForSequenceClassification.from_pretrained(model_dir).eval()
+    session = OnnxClassifier(onnx_path)
+
+    texts = load_pickle(DATA_DIR / "bert_test.pkl")["text"].astype(str).tolist()[:n_samples]
+    batch = tokenizer(texts, max_length=512, truncation=True, padding=True, return_tensors="pt")
+
+    with torch.no_grad():
+        expected = model(input_ids=batch["input_ids"], attention_mask=batch["attention_mask"]).logits
+    actual = session(batch["input_ids"], batch["attention_mask"]).logits
+
+    return float(np.abs(expected.numpy() - actual.numpy()).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the BERT classifier to ONNX")
+    parser.add_argument("--model-dir", default=str(MODEL_DIR))
+    parser.add_argument("--output", default=None, help="Defaults to <model-dir>/model.onnx")
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir)
+    output_path = Path(args.output) if args.output else model_dir / "model.onnx"
+
+    print(f"Exporting {model_dir} -> {output_path}...")
+    export_onnx(model_dir, output_path, opset=args.opset)
+    print(f"✅ Exported ({output_path.stat().st_size / 1e6:.1f} MB)")
+
+    diff = check_parity(model_dir, output_path)
+    print(f"Max |logit difference| vs PyTorch: {diff:.2e}")
+    if diff > 1e-3:
+        print("⚠️ ONNX outputs differ noticeably from PyTorch")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
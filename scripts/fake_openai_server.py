@@ -0,0 +1,166 @@
+"""
+Local fake of an OpenAI-compatible chat completions API (OpenRouter stand-in)
+Answers POST /v1/chat/completions with a canned reply, non-streamed or streamed
+as server-sent events, emitting one token every --token-delay-ms after --first-token-ms.
+GET /v1/requests lists the estimated prompt tokens of every request received.
+Faults can be injected at startup or at runtime through POST /v1/faults: extra latency
+before answering, and a share of requests failing with a given HTTP status.
+
+Usage:
+    python scripts/fake_openai_server.py --port 9100
+    OPENROUTER_API_KEY=test OPENROUTER_BASE_URL=http://127.0.0.1:9100/v1 uvicorn api.main:app
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from api.chat_history import prompt_tokens
+
+app = FastAPI(title="Fake OpenAI API")
+
+settings = {
+    "first_token_ms": 200.0,
+    "token_delay_ms": 20.0,
+    "tokens": 40
+}
+
+# Injected faults
+faults = {
+    "latency_ms": 0.0,      # Added before any response (or error)
+    "error_rate": 0.0,      # Share of requests answered with error_status
+    "error_status": 503,
+    "retry_after": None     # Retry-After header sent with errors, in seconds
+}
+
+# Prompt size of each request received, in arrival order
+request_log = []
+
+
+def fake_reply(messages: list) -> list:
+    """Deterministic reply tokens for the last user message"""
+    question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    words = ["Good", "answer."] + [f"point{i}" for i in range(settings["tokens"])] + [f"({len(question)} chars)"]
+    return [word if i == 0 else " " + word for i, word in enumerate(words)]
+
+
+def completion_chunk(completion_id: str, model: str, content=None, finish_reason=None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "delta": {"content": content} if content is not None else {},
+            "finish_reason": finish_reason
+        }]
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", "fake-model")
+    tokens = fake_reply(body.get("messages", []))
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    usage = {"prompt_tokens": prompt_tokens(body.get("messages", [])), "completion_tokens": len(tokens)}
+    failed = random.random() < faults["error_rate"]
+    request_log.append({
+        "messages": len(body.get("messages", [])),
+        "stream": bool(body.get("stream")),
+        "max_tokens": body.get("max_tokens"),
+        "status": faults["error_status"] if failed else 200,
+        "client_port": request.client.port if request.client else None,
+        **usage
+    })
+
+    if faults["latency_ms"]:
+        await asyncio.sleep(faults["latency_ms"] / 1000)
+    if failed:
+        headers = {"Retry-After": str(faults["retry_after"])} if faults["retry_after"] is not None else None
+        return JSONResponse(
+            status_code=faults["error_status"],
+            content={"error": {"message": "Injected failure", "type": "server_error", "code": faults["error_status"]}},
+            headers=headers
+        )
+
+    if body.get("stream"):
+        async def events():
+            await asyncio.sleep(settings["first_token_ms"] / 1000)
+            for i, token in enumerate(tokens):
+                if i:
+                    await asyncio.sleep(settings["token_delay_ms"] / 1000)
+                yield completion_chunk(completion_id, model, content=token)
+            yield completion_chunk(completion_id, model, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # Non-streamed: the whole generation time passes before anything is returned
+    await asyncio.sleep((settings["first_token_ms"] + settings["token_delay_ms"] * (len(tokens) - 1)) / 1000)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(tokens)},
+            "finish_reason": "stop"
+        }],
+        "usage": {**usage, "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"]}
+    }
+
+
+@app.get("/v1/requests")
+async def list_requests():
+    return request_log
+
+
+@app.delete("/v1/requests")
+async def clear_requests():
+    request_log.clear()
+    return {"cleared": True}
+
+
+@app.post("/v1/faults")
+async def set_faults(request: Request):
+    """Update injected faults, e.g. {"error_rate": 0.5, "error_status": 429}"""
+    updates = await request.json()
+    faults.update({key: value for key, value in updates.items() if key in faults})
+    return faults
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--first-token-ms", type=float, default=settings["first_token_ms"])
+    parser.add_argument("--token-delay-ms", type=float, default=settings["token_delay_ms"])
+    parser.add_argument("--tokens", type=int, default=settings["tokens"], help="Filler tokens per reply")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Injected latency before every response")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    settings.update(first_token_ms=args.first_token_ms, token_delay_ms=args.token_delay_ms, tokens=args.tokens)
+    faults.update(latency_ms=args.latency_ms, error_rate=args.error_rate, error_status=args.error_status)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
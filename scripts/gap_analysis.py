@@ -3,33 +3,45 @@ Gap Analysis Function for Resume-Job Matching
 Compares extracted skills from resume against job requirements
 """
 
-import spacy
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple, FrozenSet
+from functools import lru_cache
 import re
 from pathlib import Path
 
 
 try:
     from common_utils import extract_skills_keywords
+    from skill_matcher import get_skill_matcher
+    from ner_pipeline import extract_entities, load_ner_model
 except ImportError:
  
     import sys
     sys.path.append(str(Path(__file__).parent))
     from common_utils import extract_skills_keywords
+    from skill_matcher import get_skill_matcher
+    from ner_pipeline import extract_entities, load_ner_model
 
 
-def extract_skills_from_text(text: str, ner_model) -> Set[str]:
+def extract_skills_from_text(text: str, ner_model, entities: List[tuple] = None) -> Set[str]:
     """
     Extract skills from text using trained NER model + Keywords
+    
+    Args:
+        text: Resume or job description text
+        ner_model: Loaded NER model (ignored when entities are given)
+        entities: Precomputed (text, label, start, end) entities, e.g. from a cache
     """
     skills = set()
-    
+    matcher = get_skill_matcher()
+
+    if entities is None and ner_model:
+        entities = extract_entities(ner_model, text)
 
-    if ner_model:
-        doc = ner_model(text)
-        for ent in doc.ents:
-            if ent.label_ == "SKILLS":
-                skills.add(ent.text.strip().lower())
+    for ent_text, label, _, _ in entities or []:
+        if label == "SKILLS":
+            # Map known aliases (e.g. "NodeJS") onto the canonical skill
+            skill = matcher.canonicalize(ent_text) or ent_text.strip()
+            skills.add(skill.lower())
 
   
     keyword_skills = extract_skills_keywords(text)
@@ -39,9 +51,26 @@ def extract_skills_from_text(text: str, ner_model) -> Set[str]:
     return skills
 
 
+EXPERIENCE_PATTERN = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)')
+
+
+@lru_cache(maxsize=1024)
+def _parse_job_text(job_description: str, taxonomy_version: str) -> Tuple[FrozenSet[str], int]:
+    # taxonomy_version is part of the cache key so taxonomy reloads re-parse jobs
+    job_text_lower = job_description.lower()
+    required_skills = frozenset(extract_skills_keywords(job_text_lower))
+
+    experience_matches = EXPERIENCE_PATTERN.findall(job_text_lower)
+    required_experience = int(experience_matches[0]) if experience_matches else 0
+
+    return required_skills, required_experience
+
+
 def parse_job_requirements(job_description: str) -> Dict[str, any]:
     """
     Parse job description to extract requirements
+    Results are memoized per (job text, taxonomy version), so matching one job
+    against many resumes parses it once
     
     Args:
         job_description: Job posting text
@@ -49,29 +78,53 @@ def parse_job_requirements(job_description: str) -> Dict[str, any]:
     Returns:
         Dictionary with parsed requirements
     """
-    
-    job_text_lower = job_description.lower()
-    required_skills = set(extract_skills_keywords(job_text_lower))
-    
-
-    experience_pattern = r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
-    experience_matches = re.findall(experience_pattern, job_text_lower)
-    required_experience = int(experience_matches[0]) if experience_matches else 0
+    required_skills, required_experience = _parse_job_text(
+        job_description, get_skill_matcher().version
+    )
     
     return {
-        'required_skills': required_skills,
+        'required_skills': set(required_skills),
         'required_experience': required_experience,
         'job_text': job_description
     }
 
 
-def calculate_skill_match(resume_skills: Set[str], job_skills: Set[str]) -> Dict[str, any]:
+def estimate_experience_years(resume_text: str, entities: List[tuple] = None) -> int:
+    """
+    Estimate a candidate's years of experience
+    Takes the largest "N years of experience" mention in the resume text or
+    in EXPERIENCE entities found by the NER model
+
+    Args:
+        resume_text: Resume text content
+        entities: Precomputed (text, label, start, end) NER entities
+
+    Returns:
+        Estimated years of experience (0 when none are mentioned)
+    """
+    mentions = [resume_text.lower()]
+    mentions += [ent_text.lower() for ent_text, label, _, _ in entities or [] if label == "EXPERIENCE"]
+
+    years = [int(y) for mention in mentions for y in EXPERIENCE_PATTERN.findall(mention)]
+    # Ignore implausible values (e.g. years mistaken for durations)
+    years = [y for y in years if y <= 50]
+    return max(years) if years else 0
+
+
+def calculate_skill_match(
+    resume_skills: Set[str],
+    job_skills: Set[str],
+    partial_credit: float = 0.0
+) -> Dict[str, any]:
     """
     Calculate skill match percentage and identify gaps
     
     Args:
         resume_skills: Set of skills from resume
         job_skills: Set of required skills from job
+        partial_credit: Credit (0-1) for a required skill the resume only covers
+            through a more specific skill in the taxonomy hierarchy
+            (e.g. PyTorch for Deep Learning); 0 disables partial matches
         
     Returns:
         Dictionary with match analysis
@@ -84,9 +137,18 @@ def calculate_skill_match(resume_skills: Set[str], job_skills: Set[str]) -> Dict
     missing_skills = job_skills_norm - resume_skills_norm
     extra_skills = resume_skills_norm - job_skills_norm
     
+    partial_matches = set()
+    if partial_credit > 0 and missing_skills:
+        matcher = get_skill_matcher()
+        implied = set()
+        for skill in resume_skills_norm:
+            implied |= matcher.ancestors(skill)
+        partial_matches = missing_skills & implied
+        missing_skills = missing_skills - partial_matches
 
     if len(job_skills_norm) > 0:
-        match_percentage = (len(matched_skills) / len(job_skills_norm)) * 100
+        credited = len(matched_skills) + partial_credit * len(partial_matches)
+        match_percentage = (credited / len(job_skills_norm)) * 100
     else:
         match_percentage = 0.0
     
@@ -94,6 +156,7 @@ def calculate_skill_match(resume_skills: Set[str], job_skills: Set[str]) -> Dict
         'match_percentage': round(match_percentage, 2),
         'matched_skills': list(matched_skills),
         'missing_skills': list(missing_skills),
+        'partial_matches': list(partial_matches),
         'extra_skills': list(extra_skills),
         'total_required': len(job_skills_norm),
         'total_matched': len(matched_skills),
@@ -173,9 +236,12 @@ def generate_smart_suggestions(
 
 def perform_gap_analysis(
     resume_text: str,
-    job_description: str,
+    job_description: str = None,
     ner_model_path: str = None,
-    ner_model = None
+    ner_model = None,
+    partial_credit: float = 0.0,
+    resume_entities: List[tuple] = None,
+    job_requirements: Dict[str, any] = None
 ) -> Dict[str, any]:
     """
     Perform comprehensive gap analysis between resume and job
@@ -185,25 +251,32 @@ def perform_gap_analysis(
         job_description: Job posting text
         ner_model_path: Path to trained NER model (optional if ner_model provided)
         ner_model: Loaded NER model (optional if ner_model_path provided)
+        partial_credit: Credit for skills covered via the taxonomy hierarchy (see calculate_skill_match)
+        resume_entities: Precomputed NER entities for the resume (skips running ner_model)
+        job_requirements: Precomputed output of parse_job_requirements, e.g. a stored
+            job profile (job_description may then be omitted)
         
     Returns:
         Comprehensive gap analysis report
     """
-    if ner_model is None:
+    if ner_model is None and resume_entities is None:
         if ner_model_path is None:
             raise ValueError("Either ner_model or ner_model_path must be provided")
         print(f"Loading NER model from {ner_model_path}...")
-        ner_model = spacy.load(ner_model_path)
+        ner_model = load_ner_model(ner_model_path)
     
     print("Extracting skills from resume...")
-    resume_skills = extract_skills_from_text(resume_text, ner_model)
+    resume_skills = extract_skills_from_text(resume_text, ner_model, entities=resume_entities)
     
-    print("Parsing job requirements...")
-    job_requirements = parse_job_requirements(job_description)
+    if job_requirements is None:
+        if job_description is None:
+            raise ValueError("Either job_description or job_requirements must be provided")
+        print("Parsing job requirements...")
+        job_requirements = parse_job_requirements(job_description)
     job_skills = job_requirements['required_skills']
     
     print("Calculating skill match...")
-    skill_match = calculate_skill_match(resume_skills, job_skills)
+    skill_match = calculate_skill_match(resume_skills, job_skills, partial_credit=partial_credit)
     
     section_gaps = check_missing_sections(resume_text)
     
@@ -221,6 +294,7 @@ def perform_gap_analysis(
         'skill_analysis': {
             'matched_skills': skill_match['matched_skills'],
             'missing_skills': skill_match['missing_skills'],
+            'partial_matches': skill_match['partial_matches'],
             'additional_skills': skill_match['extra_skills'],
             'match_percentage': skill_match['match_percentage'],
             'total_required': skill_match['total_required'],
@@ -0,0 +1,86 @@
+"""
+Load test for the inference worker pool
+Saturates /analyze-resume and samples /health to check the event loop stays responsive
+
+Usage (with the API running):
+    python scripts/load_test_inference.py --concurrency 64 --duration 30
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+BASE_URL = "http://localhost:8000"
+DATA_PATH = Path(__file__).parent.parent / "data" / "bert_test.csv"
+
+
+def percentiles(latencies):
+    if not latencies:
+        return "n/a"
+    arr = np.array(latencies) * 1000
+    return f"p50={np.percentile(arr, 50):.1f}ms p99={np.percentile(arr, 99):.1f}ms (n={len(arr)})"
+
+
+async def sample_health(client, stop_at, interval, latencies):
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        response = await client.get(f"{BASE_URL}/health")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def hammer_analyze(client, stop_at, texts, worker_id, latencies, statuses):
+    i = worker_id
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        response = await client.post(f"{BASE_URL}/analyze-resume", json={"text": texts[i % len(texts)]})
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        elif response.status_code == 503:
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+        i += 1
+
+
+async def run(concurrency, duration, interval):
+    texts = pd.read_csv(DATA_PATH)["text"].astype(str).tolist()
+    limits = httpx.Limits(max_connections=concurrency + 8)
+
+    async with httpx.AsyncClient(timeout=120, limits=limits) as client:
+        print(f"🔹 Baseline: sampling /health for {duration}s...")
+        baseline = []
+        await sample_health(client, time.perf_counter() + duration, interval, baseline)
+
+        print(f"🔹 Saturated: {concurrency} concurrent /analyze-resume clients for {duration}s...")
+        loaded, analyze_latencies = [], []
+        statuses = Counter()
+        stop_at = time.perf_counter() + duration
+        await asyncio.gather(
+            sample_health(client, stop_at, interval, loaded),
+            *[hammer_analyze(client, stop_at, texts, w, analyze_latencies, statuses) for w in range(concurrency)]
+        )
+
+    print("\n" + "=" * 60)
+    print("LOAD TEST RESULTS")
+    print("=" * 60)
+    print(f"/health idle:          {percentiles(baseline)}")
+    print(f"/health saturated:     {percentiles(loaded)}")
+    print(f"/analyze-resume (200): {percentiles(analyze_latencies)}")
+    print(f"/analyze-resume statuses: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event-loop responsiveness under inference load")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between /health probes")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.concurrency, args.duration, args.interval))
@@ -0,0 +1,25 @@
+"""
+Bring the database schema up to date (tables, late-added columns, indexes)
+Run once before starting several API workers, together with DB_MIGRATE_ON_STARTUP=0.
+Uses the same DATABASE_URL / ConnectionStrings__DefaultConnection settings as the API.
+
+Usage:
+    python scripts/migrate_db.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from api.migrations import migrate_database
+
+
+def main():
+    start = time.perf_counter()
+    migrate_database()
+    print(f"✅ Database schema up to date ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
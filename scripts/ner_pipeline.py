@@ -0,0 +1,84 @@
+"""
+Shared NER execution layer for AI Resume Analyzer
+Loads the spaCy model with only the components entity extraction needs and
+runs multi-document work through nlp.pipe (batched, optionally multi-process)
+"""
+
+import os
+from typing import Iterable, List, Tuple
+
+# Components entity extraction depends on; everything else is disabled
+NER_COMPONENTS = ("tok2vec", "transformer", "ner")
+
+# Defaults for nlp.pipe, overridable per call
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "32"))
+NER_N_PROCESS = int(os.getenv("NER_N_PROCESS", "1"))
+
+Entity = Tuple[str, str, int, int]
+
+
+def unused_components(nlp) -> List[str]:
+    """Enabled pipeline components that do not contribute to entity extraction"""
+    return [name for name in nlp.pipe_names if name not in NER_COMPONENTS]
+
+
+def load_ner_model(model_path):
+    """
+    Load a trained NER model with unused components (parser, lemmatizer, ...) disabled
+
+    Args:
+        model_path: Path to the saved spaCy model
+
+    Returns:
+        spaCy Language object
+    """
+    import spacy
+
+    nlp = spacy.load(model_path)
+    disabled = unused_components(nlp)
+    if disabled:
+        nlp.select_pipes(disable=disabled)
+    return nlp
+
+
+def entities_from_doc(doc) -> List[Entity]:
+    """(text, label, start_char, end_char) tuples (picklable, unlike spaCy Docs)"""
+    return [(ent.text, ent.label_, ent.start_char, ent.end_char) for ent in doc.ents]
+
+
+def extract_entities(nlp, text: str) -> List[Entity]:
+    """Run the NER model on one text"""
+    return pipe_entities(nlp, [text], n_process=1)[0]
+
+
+def pipe_entities(
+    nlp,
+    texts: Iterable[str],
+    batch_size: int = None,
+    n_process: int = None
+) -> List[List[Entity]]:
+    """
+    Run the NER model on many texts with nlp.pipe
+
+    Args:
+        nlp: Loaded spaCy model
+        texts: Texts to process
+        batch_size: Texts per pipe batch (defaults to NER_BATCH_SIZE)
+        n_process: Worker processes (defaults to NER_N_PROCESS; use 1 inside
+            servers that already parallelize)
+
+    Returns:
+        Entities for each text, in input order
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    docs = nlp.pipe(
+        texts,
+        batch_size=batch_size or NER_BATCH_SIZE,
+        n_process=min(n_process or NER_N_PROCESS, len(texts)),
+        disable=unused_components(nlp)
+    )
+    return [entities_from_doc(doc) for doc in docs]
+
@@ -0,0 +1,180 @@
+"""
+Prompt-token report for a long mock interview
+Plays a 50-turn session against scripts/fake_openai_server.py twice:
+  - before: the client resends the whole conversation in ChatInput.history every turn
+    (no token budget)
+  - after: the client only sends the new message with a session_id; the server builds
+    the prompt from the stored messages, a rolling summary and CHAT_HISTORY_TOKEN_BUDGET
+and reports request payload sizes and the prompt tokens the LLM received (including
+the summarization calls).
+
+Usage:
+    python scripts/report_chat_tokens.py --turns 50
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+APPLICANT_ID = "report-chat-tokens"
+
+TOPICS = [
+    "Docker image layers", "Python generators", "database indexing", "REST API versioning",
+    "Kubernetes rolling updates", "CAP theorem", "React state management", "CI/CD pipelines"
+]
+
+
+def candidate_answer(turn: int) -> str:
+    """Deterministic answer of about 90 words"""
+    topic = TOPICS[turn % len(TOPICS)]
+    return (
+        f"Answer {turn}: regarding {topic}, I would start by explaining the core idea, then walk "
+        f"through a concrete example from my last project where we applied {topic} in production. "
+        "We measured the impact before and after the change, documented the trade-offs, and "
+        "added monitoring so regressions would be caught early. If I had more time I would also "
+        "discuss the failure modes, how to test them, and how the approach scales as the team "
+        "and the traffic grow over the next year."
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{what} did not start in time")
+
+
+def run_session(env: dict, fake_url: str, turns: int, server_history: bool, timeout: float) -> dict:
+    """Play one session against a fresh API process and collect sizes"""
+    port = free_port()
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            wait_until(lambda: client.get("/health").json()["models_loaded"]["openai"], timeout, "API")
+            httpx.delete(f"{fake_url}/requests")
+
+            params = {}
+            if server_history:
+                session = client.post("/chat/sessions", params={"title": "Token report", "applicant_id": APPLICANT_ID})
+                params["session_id"] = session.json()["id"]
+
+            history, payload_bytes = [], []
+            for turn in range(turns):
+                payload = {
+                    "message": candidate_answer(turn),
+                    "context": "Candidate is preparing for a technical interview."
+                }
+                if not server_history:
+                    payload["history"] = history
+                body = json.dumps(payload).encode()
+                payload_bytes.append(len(body))
+
+                response = client.post(
+                    "/interview-chat", params=params, content=body, headers={"Content-Type": "application/json"}
+                )
+                response.raise_for_status()
+                history = history + [
+                    {"role": "user", "content": payload["message"]},
+                    {"role": "model", "content": response.json()["response"]}
+                ]
+
+            # Summaries are written by background tasks after the last responses
+            time.sleep(1)
+            requests = httpx.get(f"{fake_url}/requests").json()
+    finally:
+        api.terminate()
+        api.wait()
+
+    # Summarization calls are the ones with a max_tokens cap
+    chat_calls = [r for r in requests if r["max_tokens"] is None]
+    return {
+        "payload_bytes": payload_bytes,
+        "calls": len(requests),
+        "prompt_tokens": [r["prompt_tokens"] for r in requests],
+        "last_turn_prompt": chat_calls[-1]["prompt_tokens"] if chat_calls else 0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt tokens with client-sent vs server-side history")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--reply-tokens", type=int, default=150, help="Filler tokens per fake AI reply")
+    parser.add_argument("--budget", type=int, default=None, help="CHAT_HISTORY_TOKEN_BUDGET for the 'after' run")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    fake_port = free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}/v1"
+    tmp_dir = tempfile.mkdtemp(prefix="report_chat_")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env.update(
+        OPENROUTER_API_KEY="test",
+        OPENROUTER_BASE_URL=fake_url,
+        DATABASE_URL=f"sqlite:///{tmp_dir}/chats.db",
+        RESULT_CACHE_PATH=f"{tmp_dir}/cache.db"
+    )
+
+    fake = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_openai_server.py"), "--port", str(fake_port),
+         "--first-token-ms", "0", "--token-delay-ms", "0", "--tokens", str(args.reply_tokens)],
+        env=env
+    )
+    try:
+        wait_until(lambda: httpx.get(f"{fake_url}/requests").status_code == 200, args.timeout, "Fake OpenAI server")
+
+        before_env = dict(env, CHAT_HISTORY_TOKEN_BUDGET=str(10 ** 9))
+        before = run_session(before_env, fake_url, args.turns, server_history=False, timeout=args.timeout)
+
+        after_env = dict(env)
+        if args.budget:
+            after_env["CHAT_HISTORY_TOKEN_BUDGET"] = str(args.budget)
+        after = run_session(after_env, fake_url, args.turns, server_history=True, timeout=args.timeout)
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    print("=" * 72)
+    print(f"CHAT PROMPT TOKENS ({args.turns}-turn session, estimated tokens)")
+    print("=" * 72)
+    print(f"{'':<34}{'client history':>18}{'server history':>18}")
+    rows = [
+        ("request payload, total (KB)", sum(before["payload_bytes"]) / 1024, sum(after["payload_bytes"]) / 1024),
+        ("request payload, last turn (KB)", before["payload_bytes"][-1] / 1024, after["payload_bytes"][-1] / 1024),
+        ("LLM calls (incl. summaries)", before["calls"], after["calls"]),
+        ("prompt tokens, last turn", before["last_turn_prompt"], after["last_turn_prompt"]),
+        ("prompt tokens, whole session", sum(before["prompt_tokens"]), sum(after["prompt_tokens"]))
+    ]
+    for label, b, a in rows:
+        print(f"{label:<34}{b:>18,.1f}{a:>18,.1f}" if isinstance(b, float) else f"{label:<34}{b:>18,}{a:>18,}")
+
+    saved = 1 - sum(after["prompt_tokens"]) / max(sum(before["prompt_tokens"]), 1)
+    print(f"\nPrompt tokens saved over the session: {saved:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Per-worker memory report for multi-worker deployments
+Starts `uvicorn api.main:app --workers N` with memory-mapped weights disabled and
+then enabled, waits for the models to load, and reads /proc/<pid>/smaps_rollup of
+every worker: unique memory (USS = private pages), pages shared with other processes,
+proportional share (PSS) and RSS. From /proc/<pid>/smaps it also reports the resident
+and proportional size of each worker's mappings of model.safetensors: with N workers
+sharing the weights, their PSS is about RSS / N. Linux only.
+
+Usage:
+    python scripts/report_worker_memory.py --workers 4
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+from api.classifier import SAFETENSORS_FILE
+
+
+def read_smaps_rollup(pid: int) -> dict:
+    """Memory counters of one process in MB"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+        "shared": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+        "pss": values.get("Pss", 0),
+        "rss": values.get("Rss", 0),
+        **read_weight_mappings(pid)
+    }
+
+
+def read_weight_mappings(pid: int) -> dict:
+    """Resident and proportional MB of the process's mappings of SAFETENSORS_FILE"""
+    totals = {"weights_rss": 0.0, "weights_pss": 0.0}
+    in_weights = False
+    with open(f"/proc/{pid}/smaps") as f:
+        for line in f:
+            fields = line.split()
+            if not fields[0].endswith(":"):
+                # Mapping header: address range, perms, offset, device, inode[, path]
+                in_weights = fields[-1].endswith(SAFETENSORS_FILE)
+            elif in_weights and fields[0] in ("Rss:", "Pss:"):
+                totals[f"weights_{fields[0][:-1].lower()}"] += int(fields[1]) / 1024
+    return totals
+
+
+def worker_pids(parent_pid: int) -> list:
+    """Uvicorn worker processes (spawned children of the supervisor)"""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/cmdline") as f:
+                cmdline = f.read()
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == parent_pid and "spawn_main" in cmdline:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(workers: int, mmap_weights: bool, timeout: float) -> list:
+    port = free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env["BERT_MMAP_WEIGHTS"] = "1" if mmap_weights else "0"
+    env["MODEL_WARMUP"] = "blocking"
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            while True:
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Server did not become ready in time")
+                try:
+                    if client.get("/ready").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.2)
+
+            # The other workers may still be loading: wait until every worker's RSS settles
+            previous = None
+            while time.monotonic() < deadline:
+                pids = worker_pids(server.pid)
+                current = [round(read_smaps_rollup(pid)["rss"]) for pid in pids]
+                if len(pids) == workers and current == previous:
+                    break
+                previous = current
+                time.sleep(2)
+
+            # Touch the weights in every worker, as real traffic would
+            for _ in range(workers * 4):
+                client.post(
+                    "/analyze-resume",
+                    json={"text": "Python developer with 5 years of experience. " * 5},
+                    headers={"Connection": "close"}
+                )
+
+        return [read_smaps_rollup(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(name: str, stats: list) -> None:
+    n = len(stats)
+    print(f"\n{name} ({n} workers)")
+    for i, s in enumerate(stats):
+        print(
+            f"  worker {i}: USS {s['uss']:7.1f} | shared {s['shared']:7.1f} | PSS {s['pss']:7.1f} | "
+            f"RSS {s['rss']:7.1f} | {SAFETENSORS_FILE} RSS {s['weights_rss']:6.1f}, PSS {s['weights_pss']:6.1f} (MB)"
+        )
+    if n:
+        print(f"  mean unique (USS) per worker: {sum(s['uss'] for s in stats) / n:8.1f} MB")
+        print(f"  total PSS (real footprint):   {sum(s['pss'] for s in stats):8.1f} MB")
+        print(f"  weights resident per worker:  {sum(s['weights_rss'] for s in stats) / n:8.1f} MB, "
+              f"counted once in total: {sum(s['weights_pss'] for s in stats):8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory with and without memory-mapped weights")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    before = measure(args.workers, mmap_weights=False, timeout=args.timeout)
+    after = measure(args.workers, mmap_weights=True, timeout=args.timeout)
+
+    print("=" * 70)
+    print("WORKER MEMORY REPORT")
+    print("=" * 70)
+    summarize("Private weights (from_pretrained)", before)
+    summarize("Memory-mapped weights", after)
+
+    if before and after:
+        saved = sum(s["uss"] for s in before) / len(before) - sum(s["uss"] for s in after) / len(after)
+        print(f"\nUnique memory saved per worker: {saved:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
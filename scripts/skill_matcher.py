@@ -0,0 +1,205 @@
+"""
+Compiled skill matcher for AI Resume Analyzer
+Single-pass, dictionary-driven skill extraction backed by a versioned,
+hot-reloadable taxonomy (data/skill_taxonomy.json) with aliases and a parent hierarchy
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = Path(os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    str(Path(__file__).parent.parent / "data" / "skill_taxonomy.json")
+))
+
+# How often (seconds) each process checks the taxonomy file for changes
+TAXONOMY_CHECK_INTERVAL = float(os.getenv("SKILL_TAXONOMY_CHECK_INTERVAL", "5"))
+
+# Word runs and single punctuation characters, each with the whitespace preceding it.
+# Word runs are maximal, so matches automatically respect word boundaries.
+_TOKEN_RE = re.compile(r"(\s*)(\w+|[^\w\s])")
+
+
+def _term_tokens(text: str) -> List[Tuple[str, str]]:
+    return _TOKEN_RE.findall(text.strip().lower())
+
+
+def _term_key(tokens: List[Tuple[str, str]]) -> str:
+    """
+    Lookup key for a token sequence: tokens are joined without a separator
+    when adjacent and with a single space when whitespace separates them
+    """
+    return "".join((" " if ws and i else "") + tok for i, (ws, tok) in enumerate(tokens))
+
+
+class SkillMatcher:
+    """
+    Skill extractor built once from a taxonomy of canonical skills and aliases.
+
+    Text is tokenized with one regex pass; each token costs a single dictionary
+    lookup unless it starts a known skill, in which case only the few following
+    tokens needed for multi-token skills ("machine learning", "node.js") are checked.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Any]):
+        """
+        Args:
+            taxonomy: Dict with "version" and a "skills" list of
+                {"name", "category", "aliases", "parents"} entries
+
+        Raises:
+            ValueError: If a parent references an unknown skill or the hierarchy has a cycle
+        """
+        self.version = str(taxonomy.get("version", "0"))
+        self.categories: Dict[str, str] = {}
+        self.parents: Dict[str, List[str]] = {}
+        self._index: Dict[str, str] = {}
+        self._first: Dict[str, int] = {}
+
+        for skill in taxonomy.get("skills", []):
+            name = skill["name"]
+            self.categories[name] = skill.get("category", "")
+            self.parents[name] = list(skill.get("parents", []))
+            for surface in [name] + list(skill.get("aliases", [])):
+                tokens = _term_tokens(surface)
+                if not tokens:
+                    continue
+                self._index[_term_key(tokens)] = name
+                first = tokens[0][1]
+                self._first[first] = max(self._first.get(first, 0), len(tokens))
+
+        # Transitive ancestors keyed by lowercased name, precomputed for O(1) lookups
+        self._ancestors: Dict[str, FrozenSet[str]] = {
+            name.lower(): frozenset(a.lower() for a in self._collect_ancestors(name, ()))
+            for name in self.parents
+        }
+
+    def _collect_ancestors(self, name: str, path: Tuple[str, ...]) -> set:
+        ancestors = set()
+        for parent in self.parents[name]:
+            if parent not in self.parents:
+                raise ValueError(f"Skill '{name}' has unknown parent '{parent}'")
+            if parent == name or parent in path:
+                raise ValueError(f"Skill hierarchy has a cycle through '{parent}'")
+            ancestors.add(parent)
+            ancestors |= self._collect_ancestors(parent, path + (name,))
+        return ancestors
+
+    @property
+    def size(self) -> Dict[str, int]:
+        return {"skills": len(self.categories), "aliases": len(self._index)}
+
+    def ancestors(self, skill: str) -> FrozenSet[str]:
+        """Lowercased ancestors of a skill (e.g. "pytorch" -> {"deep learning", "machine learning", "ai"})"""
+        return self._ancestors.get(skill.lower(), frozenset())
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def canonicalize(self, name: str) -> Optional[str]:
+        """Map a skill surface form (e.g. "NodeJS") to its canonical name, if known"""
+        return self._index.get(_term_key(_term_tokens(name)))
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Extract canonical skill names from text (case-insensitive)
+
+        At each token the longest matching skill wins; matches may overlap,
+        so "ASP.NET" yields both ASP.NET and .NET.
+
+        Returns:
+            Unique canonical skill names in order of first appearance
+        """
+        if not text:
+            return []
+
+        tokens = _TOKEN_RE.findall(text.lower())
+        n = len(tokens)
+        index, first = self._index, self._first
+        found = {}
+
+        for i, (_, tok) in enumerate(tokens):
+            max_len = first.get(tok)
+            if max_len is None:
+                continue
+
+            key = tok
+            best = index.get(key)
+            for j in range(i + 1, min(i + max_len, n)):
+                ws, nxt = tokens[j]
+                key = f"{key} {nxt}" if ws else key + nxt
+                hit = index.get(key)
+                if hit is not None:
+                    best = hit
+
+            if best is not None:
+                found[best] = None
+
+        return list(found)
+
+
+# -------------------- SHARED MATCHER --------------------
+# Readers take a reference to the current matcher once per call; reloads build a
+# new matcher off to the side and swap the reference, so in-flight extractions
+# keep using the version they started with and never see a half-built index.
+
+_reload_lock = threading.Lock()
+_default_matcher = SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH)
+_loaded_mtime = os.path.getmtime(DEFAULT_TAXONOMY_PATH)
+_next_check = time.monotonic() + TAXONOMY_CHECK_INTERVAL
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """
+    Shared matcher for the current taxonomy.
+    Picks up changes to the taxonomy file (e.g. written by another worker) every
+    TAXONOMY_CHECK_INTERVAL seconds.
+    """
+    global _next_check
+    if time.monotonic() >= _next_check:
+        _next_check = time.monotonic() + TAXONOMY_CHECK_INTERVAL
+        try:
+            if os.path.getmtime(DEFAULT_TAXONOMY_PATH) != _loaded_mtime:
+                reload_taxonomy()
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skill taxonomy reload failed, keeping version {_default_matcher.version}: {e}")
+    return _default_matcher
+
+
+def reload_taxonomy() -> SkillMatcher:
+    """Rebuild the shared matcher from the taxonomy file"""
+    global _default_matcher, _loaded_mtime
+    with _reload_lock:
+        mtime = os.path.getmtime(DEFAULT_TAXONOMY_PATH)
+        matcher = SkillMatcher.from_file(DEFAULT_TAXONOMY_PATH)
+        _default_matcher, _loaded_mtime = matcher, mtime
+    return matcher
+
+
+def set_taxonomy(taxonomy: Dict[str, Any]) -> SkillMatcher:
+    """
+    Validate a new taxonomy, persist it atomically and swap it in
+
+    Other processes sharing the taxonomy file pick it up on their next check.
+
+    Raises:
+        ValueError: If the taxonomy is invalid (nothing is written in that case)
+    """
+    global _default_matcher, _loaded_mtime
+    matcher = SkillMatcher(taxonomy)
+
+    with _reload_lock:
+        tmp_path = DEFAULT_TAXONOMY_PATH.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(taxonomy, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, DEFAULT_TAXONOMY_PATH)
+        _default_matcher, _loaded_mtime = matcher, os.path.getmtime(DEFAULT_TAXONOMY_PATH)
+
+    return matcher
@@ -10,10 +10,11 @@ import os
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 import torch
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, Sampler
 from transformers import (
     BertTokenizer,
     BertForSequenceClassification,
+    DataCollatorWithPadding,
     get_linear_schedule_with_warmup
 )
 from torch.optim import AdamW
@@ -27,40 +28,71 @@ import json
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
-from common_utils import load_pickle, ensure_dir, get_device, calculate_metrics
+from common_utils import load_pickle, ensure_dir, get_device, calculate_metrics, length_buckets
 
 
 # =========================
 # 📦 DATASET
 # =========================
 class ResumeDataset(Dataset):
-    """PyTorch Dataset for resume classification"""
+    """
+    PyTorch Dataset for resume classification
+
+    Texts are tokenized once up front without padding; batches are padded
+    to their longest sequence by the DataLoader's collate_fn.
+    """
 
     def __init__(self, texts, labels, tokenizer, max_length=512):
         self.texts = texts
         self.labels = labels
         self.tokenizer = tokenizer
         self.max_length = max_length
+        self.encodings = tokenizer(
+            [str(text) for text in texts],
+            max_length=max_length,
+            truncation=True
+        )
+        self.lengths = [len(ids) for ids in self.encodings["input_ids"]]
 
     def __len__(self):
         return len(self.texts)
 
     def __getitem__(self, idx):
-        encoding = self.tokenizer(
-            str(self.texts[idx]),
-            max_length=self.max_length,
-            padding="max_length",
-            truncation=True,
-            return_tensors="pt"
-        )
-
         return {
-            "input_ids": encoding["input_ids"].squeeze(0),
-            "attention_mask": encoding["attention_mask"].squeeze(0),
-            "labels": torch.tensor(self.labels[idx], dtype=torch.long),
+            "input_ids": self.encodings["input_ids"][idx],
+            "attention_mask": self.encodings["attention_mask"][idx],
+            "labels": int(self.labels[idx]),
         }
 
 
+class LengthBucketSampler(Sampler):
+    """Batch sampler grouping resumes of similar token length to minimize padding"""
+
+    def __init__(self, lengths, batch_size, shuffle=False, seed=42):
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.epoch = 0
+
+    def __iter__(self):
+        seed = self.seed + self.epoch if self.shuffle else None
+        self.epoch += 1
+        return iter(length_buckets(self.lengths, self.batch_size, shuffle=self.shuffle, seed=seed))
+
+    def __len__(self):
+        return (len(self.lengths) + self.batch_size - 1) // self.batch_size
+
+
+def make_data_loader(dataset, tokenizer, batch_size, shuffle=False):
+    """DataLoader with length bucketing and dynamic padding"""
+    return DataLoader(
+        dataset,
+        batch_sampler=LengthBucketSampler(dataset.lengths, batch_size, shuffle=shuffle),
+        collate_fn=DataCollatorWithPadding(tokenizer)
+    )
+
+
 # =========================
 # 🔁 TRAIN ONE EPOCH
 # =========================
@@ -173,9 +205,9 @@ def train_bert_classifier(
         max_length
     )
 
-    train_loader = DataLoader(train_dataset, batch_size=batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=batch_size)
-    test_loader = DataLoader(test_dataset, batch_size=batch_size)
+    train_loader = make_data_loader(train_dataset, tokenizer, batch_size, shuffle=True)
+    val_loader = make_data_loader(val_dataset, tokenizer, batch_size)
+    test_loader = make_data_loader(test_dataset, tokenizer, batch_size)
 
     model = BertForSequenceClassification.from_pretrained(
         model_name,
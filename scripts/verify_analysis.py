@@ -25,5 +25,36 @@ def test_analyze_resume():
         if 'response' in locals():
             print(response.text)
 
+def test_top_predictions():
+    print("\n🔹 Testing top-k predictions...")
+    
+    payload = {
+        "text": "Experienced Python Developer with 5 years of experience in Django, FastAPI, and React. Strong background in AWS and Docker. Education: BS in Computer Science.",
+        "top_k": 5
+    }
+    
+    try:
+        response = requests.post(f"{BASE_URL}/analyze-resume", json=payload)
+        response.raise_for_status()
+        classification = response.json()["classification"]
+        top = classification["top_predictions"]
+        
+        top1_role, top1_score = next(iter(top[0].items()))
+        scores = [next(iter(p.values())) for p in top]
+        
+        assert len(top) == 5, f"expected 5 predictions, got {len(top)}"
+        assert top1_role == classification["predicted_role"], f"top-1 {top1_role} != {classification['predicted_role']}"
+        assert top1_score == classification["confidence"], f"top-1 score {top1_score} != {classification['confidence']}"
+        assert scores == sorted(scores, reverse=True), "predictions are not sorted by score"
+        
+        print("✅ Success!")
+        print(f"   Top-5: {top}")
+        
+    except Exception as e:
+        print(f"❌ Failed: {e}")
+        if 'response' in locals():
+            print(response.text)
+
 if __name__ == "__main__":
     test_analyze_resume()
+    test_top_predictions()
@@ -0,0 +1,127 @@
+"""
+Verify BERT micro-batching
+  - concurrency: with a pool runner, a MicroBatcher keeps up to max_concurrent_batches
+    batches in flight instead of waiting for each one before collecting the next
+  - results: texts classified in padded batches match one-at-a-time classification
+    (same role, logits within --atol; not bit-identical, padding changes the shapes
+    and so the floating-point reduction order)
+
+Usage:
+    python scripts/verify_batching.py --atol 1e-4
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+MODEL_DIR = BASE_DIR / "models" / "bert_classifier_best"
+sys.path.append(str(BASE_DIR))
+sys.path.append(str(Path(__file__).parent))
+
+from api.batching import MicroBatcher
+from api.inference import InferencePool
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+async def run_batches(concurrent_batches: int, items: int, batch_size: int, batch_seconds: float):
+    """(elapsed seconds, most batches seen running at once)"""
+    pool = InferencePool(max_workers=4)
+    pool.start()
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def process(batch):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(batch_seconds)  # Stands in for a forward pass (releases the GIL like torch)
+        with lock:
+            running["now"] -= 1
+        return [item * 2 for item in batch]
+
+    batcher = MicroBatcher(
+        process, max_batch_size=batch_size, max_wait_ms=5, runner=pool.run,
+        max_concurrent_batches=concurrent_batches
+    )
+    start = time.perf_counter()
+    results = await asyncio.gather(*[batcher.submit(i) for i in range(items)])
+    elapsed = time.perf_counter() - start
+    await batcher.close()
+    pool.shutdown()
+    assert results == [i * 2 for i in range(items)], "results out of order"
+    return elapsed, running["peak"]
+
+
+def test_concurrency(items: int, batch_size: int) -> bool:
+    print(f"\n🔹 {items} concurrent submissions, batches of {batch_size}, 4 pool threads...")
+    serial, serial_peak = asyncio.run(run_batches(1, items, batch_size, 0.1))
+    overlapped, peak = asyncio.run(run_batches(4, items, batch_size, 0.1))
+    print(f"   1 batch in flight: {serial:.2f}s; 4 batches in flight: {overlapped:.2f}s")
+    return all([
+        check(serial_peak == 1, f"max_concurrent_batches=1 ran {serial_peak} batch at a time"),
+        check(peak == 4, f"max_concurrent_batches=4 ran {peak} batches at a time"),
+        check(overlapped < serial / 2, f"{serial / overlapped:.1f}x the throughput of one batch in flight")
+    ])
+
+
+def test_results(limit: int, batch_size: int, atol: float) -> bool:
+    if not MODEL_DIR.exists():
+        print(f"\n⚠️ {MODEL_DIR} not found, skipping the batched vs single comparison")
+        return True
+
+    import torch
+    from common_utils import load_pickle
+    from api.classifier import classify_texts, load_classifier
+
+    print(f"\n🔹 Batched (batch size {batch_size}) vs one-at-a-time classification...")
+    device = torch.device("cpu")
+    model, tokenizer = load_classifier(MODEL_DIR, device=device)
+    label_mapping = load_pickle(DATA_DIR / "label_mapping.pkl")
+    texts = load_pickle(DATA_DIR / "bert_test.pkl")["text"].astype(str).tolist()[:limit]
+
+    batched = classify_texts(texts, model, tokenizer, device, label_mapping, batch_size=batch_size)
+    single = [classify_texts([text], model, tokenizer, device, label_mapping)[0] for text in texts]
+
+    diffs = np.array([
+        np.max(np.abs(np.asarray(b["logits"]) - np.asarray(s["logits"]))) for b, s in zip(batched, single)
+    ])
+    roles = sum(b["predicted_role"] == s["predicted_role"] for b, s in zip(batched, single))
+    confidence = max(abs(b["confidence"] - s["confidence"]) for b, s in zip(batched, single))
+    return all([
+        check(roles == len(texts), f"{roles}/{len(texts)} predicted roles match"),
+        check(float(diffs.max()) <= atol, f"max |logit difference| {diffs.max():.2e} (atol {atol:.0e}), "
+              f"{int(np.count_nonzero(diffs))}/{len(texts)} texts not bit-identical"),
+        check(confidence <= atol, f"max |confidence difference| {confidence:.2e}")
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching verification")
+    parser.add_argument("--items", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--limit", type=int, default=64, help="Test resumes compared")
+    parser.add_argument("--atol", type=float, default=1e-4)
+    args = parser.parse_args()
+
+    results = [
+        test_concurrency(args.items, args.batch_size),
+        test_results(args.limit, args.batch_size, args.atol)
+    ]
+    if not all(results):
+        sys.exit(1)
+    print("\n✅ All batching checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Verify the interview copilot against a local fake OpenAI-compatible server
+Starts scripts/fake_openai_server.py and the API (pointed at it through
+OPENROUTER_BASE_URL, with a throwaway SQLite database), then checks that:
+  - /interview-chat/stream delivers the first token long before the reply is complete
+  - the streamed tokens add up to the final response, which is persisted as the AI message
+  - concurrent /interview-chat requests overlap instead of serializing on the event loop
+
+Usage:
+    python scripts/verify_chat_stream.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+APPLICANT_ID = "verify-chat-stream"
+
+PAYLOAD = {
+    "history": [{"role": "user", "content": "Hi"}, {"role": "model", "content": "Hello"}],
+    "message": "How do I optimize Docker images?",
+    "context": "Candidate is applying for DevOps role."
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{what} did not start in time")
+
+
+def read_sse(response):
+    """Yield (event, data) pairs from a server-sent events response"""
+    event, data = "message", []
+    for line in response.iter_lines():
+        if line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield event, json.loads("\n".join(data))
+            event, data = "message", []
+
+
+def test_stream(client, generation_seconds: float) -> bool:
+    print("\n🔹 Testing /interview-chat/stream...")
+    session = client.post("/chat/sessions", params={"title": "Stream check", "applicant_id": APPLICANT_ID}).json()
+
+    start = time.perf_counter()
+    first_token = None
+    tokens, done = [], None
+    with client.stream("POST", "/interview-chat/stream", params={"session_id": session["id"]}, json=PAYLOAD) as response:
+        response.raise_for_status()
+        for event, data in read_sse(response):
+            if event == "error":
+                print(f"❌ Stream error: {data}")
+                return False
+            if event == "done":
+                done = data
+            else:
+                first_token = first_token or time.perf_counter() - start
+                tokens.append(data["token"])
+    total = time.perf_counter() - start
+
+    if first_token is None:
+        print("❌ No tokens were streamed")
+        return False
+
+    ok = True
+    print(f"   time to first token {first_token * 1000:.0f} ms | full reply {total * 1000:.0f} ms | {len(tokens)} tokens")
+    if first_token > total / 2:
+        print("❌ First token did not arrive before the reply was half done")
+        ok = False
+    if not done or done["response"] != "".join(tokens):
+        print("❌ Streamed tokens do not match the final response")
+        ok = False
+    if total < generation_seconds * 0.9:
+        print("❌ Reply arrived faster than the fake server generates it (not streamed from upstream?)")
+        ok = False
+
+    stored = client.get(f"/chat/sessions/{session['id']}", params={"applicant_id": APPLICANT_ID}).json()
+    senders = [m["sender"] for m in stored["messages"]]
+    if senders != ["user", "ai"] or done and stored["messages"][-1]["content"] != done["response"]:
+        print(f"❌ Persisted messages mismatch: {senders}")
+        ok = False
+
+    if ok:
+        print("✅ Streamed, complete and persisted")
+    return ok
+
+
+async def timed_chat(client):
+    start = time.perf_counter()
+    response = await client.post("/interview-chat", json=PAYLOAD)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def concurrent_chats(base_url: str, concurrency: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*[timed_chat(client) for _ in range(concurrency)])
+        return time.perf_counter() - start, latencies
+
+
+def test_concurrency(base_url: str, concurrency: int, generation_seconds: float) -> bool:
+    print(f"\n🔹 Testing {concurrency} concurrent /interview-chat requests...")
+    wall, latencies = asyncio.run(concurrent_chats(base_url, concurrency))
+    print(f"   wall {wall * 1000:.0f} ms | slowest request {max(latencies) * 1000:.0f} ms "
+          f"| one generation {generation_seconds * 1000:.0f} ms")
+
+    # Serialized handlers would take concurrency x generation_seconds
+    if wall > generation_seconds * 2:
+        print("❌ Requests were serialized")
+        return False
+    print("✅ Requests overlapped")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview chat streaming verification")
+    parser.add_argument("--first-token-ms", type=float, default=200)
+    parser.add_argument("--token-delay-ms", type=float, default=40)
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    # Reply = 2 leading words + filler tokens + 1 trailing token
+    generation_seconds = (args.first_token_ms + args.token_delay_ms * (args.tokens + 2)) / 1000
+
+    fake_port, api_port = free_port(), free_port()
+    tmp_dir = tempfile.mkdtemp(prefix="verify_chat_")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env.update(
+        OPENROUTER_API_KEY="test",
+        OPENROUTER_BASE_URL=f"http://127.0.0.1:{fake_port}/v1",
+        DATABASE_URL=f"sqlite:///{tmp_dir}/chats.db",
+        RESULT_CACHE_PATH=f"{tmp_dir}/cache.db"
+    )
+
+    fake = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_openai_server.py"), "--port", str(fake_port),
+         "--first-token-ms", str(args.first_token_ms), "--token-delay-ms", str(args.token_delay_ms),
+         "--tokens", str(args.tokens)],
+        env=env
+    )
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{api_port}"
+    try:
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            wait_until(lambda: httpx.post(f"http://127.0.0.1:{fake_port}/v1/chat/completions",
+                                          json={"messages": []}, timeout=30).status_code == 200,
+                       args.timeout, "Fake OpenAI server")
+            wait_until(lambda: client.get("/health").json()["models_loaded"]["openai"], args.timeout, "API")
+
+            results = [
+                test_stream(client, generation_seconds),
+                test_concurrency(base_url, args.concurrency, generation_seconds)
+            ]
+    finally:
+        api.terminate()
+        fake.terminate()
+        api.wait()
+        fake.wait()
+
+    if not all(results):
+        sys.exit(1)
+    print("\n✅ All chat streaming checks passed")
+
+
+if __name__ == "__main__":
+    main()
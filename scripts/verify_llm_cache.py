@@ -0,0 +1,271 @@
+"""
+Verify the interview copilot LLM response cache
+Runs the API against scripts/fake_openai_server.py and counts upstream calls:
+  - a repeated question (differing only in case/whitespace) is answered from the cache
+  - concurrent identical questions share a single upstream call, streamed or not
+  - turns with history are never cached
+then checks in-process the semantic tier (with a toy bag-of-words embedder) and
+that a late or cancelled leader never fails another leader's coalesced requests.
+
+Usage:
+    python scripts/verify_llm_cache.py
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+from api.llm_cache import LLMRequest, LLMResponseCache
+
+APPLICANT_ID = "verify-llm-cache"
+CONTEXT = "Candidate is applying for DevOps role."
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{what} did not start in time")
+
+
+def upstream_calls(fake_url: str) -> int:
+    return len(httpx.get(f"{fake_url}/requests").json())
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def test_repeat(client, fake_url: str) -> bool:
+    print("\n🔹 Repeated question...")
+    before = upstream_calls(fake_url)
+    first = client.post("/interview-chat", json={"message": "How do I optimize Docker images?", "context": CONTEXT}).json()
+    second = client.post("/interview-chat", json={"message": "  how do I optimize   docker images?", "context": CONTEXT}).json()
+    calls = upstream_calls(fake_url) - before
+    return all([
+        check(calls == 1, f"2 requests -> {calls} upstream call(s)"),
+        check(not first["cached"] and second["cached"], "second reply served from the cache"),
+        check(first["response"] == second["response"], "same reply")
+    ])
+
+
+async def concurrent_requests(base_url: str, message: str, concurrency: int, stream: bool):
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        async def one():
+            payload = {"message": message, "context": CONTEXT}
+            if not stream:
+                response = await client.post("/interview-chat", json=payload)
+                return response.json()["response"]
+            async with client.stream("POST", "/interview-chat/stream", json=payload) as response:
+                body = "".join([chunk async for chunk in response.aiter_text()])
+            done = body.split("event: done\ndata: ")[-1]
+            return json.loads(done)["response"]
+
+        return await asyncio.gather(*[one() for _ in range(concurrency)])
+
+
+def test_coalescing(base_url: str, fake_url: str, concurrency: int) -> bool:
+    ok = True
+    for stream in (False, True):
+        print(f"\n🔹 {concurrency} concurrent identical {'streamed ' if stream else ''}questions...")
+        before = upstream_calls(fake_url)
+        replies = asyncio.run(concurrent_requests(
+            base_url, f"Explain Kubernetes rolling updates ({'stream' if stream else 'plain'})", concurrency, stream
+        ))
+        calls = upstream_calls(fake_url) - before
+        ok &= check(calls == 1, f"{concurrency} requests -> {calls} upstream call(s)")
+        ok &= check(len(set(replies)) == 1, "all requests got the same reply")
+    return ok
+
+
+def test_history_not_cached(client, fake_url: str) -> bool:
+    print("\n🔹 Turns with history...")
+    session = client.post("/chat/sessions", params={"title": "Cache check", "applicant_id": APPLICANT_ID}).json()
+    params = {"session_id": session["id"]}
+    payload = {"message": "What is a Docker layer?", "context": CONTEXT}
+
+    before = upstream_calls(fake_url)
+    client.post("/interview-chat", params=params, json=payload).raise_for_status()
+    second = client.post("/interview-chat", params=params, json=payload).json()
+    calls = upstream_calls(fake_url) - before
+    return all([
+        check(calls == 2, f"same message twice in one session -> {calls} upstream calls"),
+        check(not second["cached"], "turn with history was not served from the cache")
+    ])
+
+
+def bag_of_words(text: str) -> np.ndarray:
+    """Toy embedder: hashed word counts"""
+    vector = np.zeros(256, dtype=np.float32)
+    for word, count in Counter(text.replace("?", " ").split()).items():
+        vector[hash(word) % 256] += count
+    return vector
+
+
+async def semantic_checks() -> bool:
+    cache = LLMResponseCache(similarity_threshold=0.7, embed=bag_of_words)
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return "Use multi-stage builds and a slim base image."
+
+    def request(message, context=CONTEXT):
+        return LLMRequest("model", "system", context, message)
+
+    await cache.get_or_generate(request("How do I optimize Docker images?"), generate)
+    _, similar = await cache.get_or_generate(request("How can I optimize my Docker images?"), generate)
+    _, unrelated = await cache.get_or_generate(request("What is the CAP theorem?"), generate)
+    _, other_context = await cache.get_or_generate(
+        request("How can I optimize my Docker images?", context="Frontend role."), generate
+    )
+    stats = cache.stats()
+
+    return all([
+        check(similar == "hit", "similar wording served by the semantic tier"),
+        check(unrelated == "miss", "unrelated question not matched"),
+        check(other_context == "miss", "no semantic match across different contexts"),
+        check(len(calls) == 3 and stats["semantic_hits"] == 1, f"stats: {stats}")
+    ])
+
+
+async def ownership_checks() -> bool:
+    request = LLMRequest("model", "system", CONTEXT, "What is a Docker layer?")
+
+    # A leader outlives inflight_timeout, so the next identical request takes over
+    cache = LLMResponseCache(inflight_timeout=0.05)
+    _, stale, stale_leader = await cache.claim(request)
+    await asyncio.sleep(0.1)
+    _, current, current_leader = await cache.claim(request)
+    _, joined, joined_leader = await cache.claim(request)
+    cache.release(request, RuntimeError("stale leader failed"), stale)
+    await cache.store(request, "fresh reply", current)
+    replaced = all([
+        check(stale_leader and current_leader and not joined_leader and joined is current,
+              "a stale in-flight call is replaced, later requests join the new leader"),
+        check(current.result() == "fresh reply", "the stale leader's release() left the new leader's future alone")
+    ])
+
+    # The stale leader finishing late caches its reply but leaves the new claim in place
+    cache = LLMResponseCache(inflight_timeout=0.05)
+    _, stale, _ = await cache.claim(request)
+    await asyncio.sleep(0.1)
+    cache._entries.clear()
+    _, current, _ = await cache.claim(request)
+    await cache.store(request, "late reply", stale)
+    late = check(not current.done() and cache.stats()["inflight"] == 1,
+                 "the stale leader's store() left the new leader's claim in flight")
+    cache.release(request, RuntimeError("done"), current)
+
+    # A leader cancelled while its message is being embedded
+    def slow_embed(text):
+        time.sleep(0.3)
+        return bag_of_words(text)
+
+    cache = LLMResponseCache(similarity_threshold=0.7, embed=slow_embed)
+    leader = asyncio.create_task(cache.claim(request))
+    await asyncio.sleep(0.05)
+    _, waiting, _ = await cache.claim(request)
+    leader.cancel()
+    try:
+        await leader
+    except asyncio.CancelledError:
+        pass
+    try:
+        await cache.wait(waiting)
+        follower_error = None
+    except Exception as e:
+        follower_error = e
+    _, _, next_leader = await cache.claim(request)
+    cancelled = all([
+        check(isinstance(follower_error, RuntimeError), f"coalesced request failed fast: {follower_error!r}"),
+        check(next_leader, "the cancelled claim was released, the next request leads")
+    ])
+
+    return replaced and late and cancelled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM response cache verification")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    fake_port, api_port = free_port(), free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}/v1"
+    base_url = f"http://127.0.0.1:{api_port}"
+    tmp_dir = tempfile.mkdtemp(prefix="verify_llm_cache_")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env.update(
+        OPENROUTER_API_KEY="test",
+        OPENROUTER_BASE_URL=fake_url,
+        DATABASE_URL=f"sqlite:///{tmp_dir}/chats.db",
+        RESULT_CACHE_PATH=f"{tmp_dir}/cache.db"
+    )
+
+    fake = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_openai_server.py"), "--port", str(fake_port),
+         "--first-token-ms", "300", "--token-delay-ms", "10"],
+        env=env
+    )
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=args.timeout) as client:
+            wait_until(lambda: httpx.get(f"{fake_url}/requests").status_code == 200, args.timeout, "Fake OpenAI server")
+            wait_until(lambda: client.get("/health").json()["models_loaded"]["openai"], args.timeout, "API")
+
+            results = [
+                test_repeat(client, fake_url),
+                test_coalescing(base_url, fake_url, args.concurrency),
+                test_history_not_cached(client, fake_url)
+            ]
+            print(f"\n🔹 /cache/stats: {client.get('/cache/stats').json()['llm']}")
+    finally:
+        api.terminate()
+        fake.terminate()
+        api.wait()
+        fake.wait()
+
+    print("\n🔹 Semantic tier...")
+    results.append(asyncio.run(semantic_checks()))
+    print("\n🔹 In-flight ownership...")
+    results.append(asyncio.run(ownership_checks()))
+
+    if not all(results):
+        sys.exit(1)
+    print("\n✅ All LLM cache checks passed")
+
+
+if __name__ == "__main__":
+    main()
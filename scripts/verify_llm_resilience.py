@@ -0,0 +1,216 @@
+"""
+Verify the OpenRouter client settings, retries and circuit breaker
+Runs the API against scripts/fake_openai_server.py with injected latency and errors:
+  - sequential calls reuse pooled keep-alive connections
+  - transient 503s and 429s (with Retry-After) are retried and mostly succeed
+  - a hanging upstream fails within the configured timeout instead of blocking, with
+    504 and Retry-After (plain and streamed endpoints)
+  - a failing upstream opens the circuit: requests get 503 immediately without
+    reaching upstream, and the circuit closes again once the upstream recovers
+
+Usage:
+    python scripts/verify_llm_resilience.py
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Small values so the checks run in seconds
+API_SETTINGS = {
+    "LLM_CACHE_SIZE": "0",
+    "OPENROUTER_TIMEOUT": "1",
+    "OPENROUTER_CONNECT_TIMEOUT": "1",
+    "OPENROUTER_MAX_RETRIES": "2",
+    "OPENROUTER_RETRY_BASE_DELAY": "0.05",
+    "OPENROUTER_RETRY_MAX_DELAY": "0.5",
+    "OPENROUTER_CIRCUIT_THRESHOLD": "0.5",
+    "OPENROUTER_CIRCUIT_WINDOW": "10",
+    "OPENROUTER_CIRCUIT_MIN_CALLS": "5",
+    "OPENROUTER_CIRCUIT_RESET": "2"
+}
+NO_FAULTS = {"latency_ms": 0, "error_rate": 0, "error_status": 503, "retry_after": None}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{what} did not start in time")
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+class Upstream:
+    """Control and inspect the fake OpenAI server"""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def faults(self, **faults):
+        httpx.post(f"{self.url}/faults", json={**NO_FAULTS, **faults}).raise_for_status()
+
+    def requests(self) -> list:
+        return httpx.get(f"{self.url}/requests").json()
+
+    def clear(self):
+        httpx.delete(f"{self.url}/requests")
+
+
+def chat(client, i: int):
+    start = time.perf_counter()
+    response = client.post("/interview-chat", json={"message": f"Question {i}: what is a Docker layer?"})
+    return response, time.perf_counter() - start
+
+
+def test_keepalive(client, upstream: Upstream) -> bool:
+    print("\n🔹 Connection reuse...")
+    upstream.faults()
+    upstream.clear()
+    for i in range(10):
+        chat(client, i)[0].raise_for_status()
+    ports = {r["client_port"] for r in upstream.requests()}
+    return check(len(ports) <= 2, f"10 sequential calls used {len(ports)} upstream connection(s)")
+
+
+def test_transient(client, upstream: Upstream, status: int, retry_after=None) -> bool:
+    label = f"{status}" + (f" with Retry-After {retry_after}s" if retry_after is not None else "")
+    print(f"\n🔹 30% of upstream calls fail with {label}...")
+    upstream.faults(error_rate=0.3, error_status=status, retry_after=retry_after)
+    upstream.clear()
+
+    ok = sum(chat(client, 100 + i)[0].status_code == 200 for i in range(20))
+    attempts = len(upstream.requests())
+    return all([
+        check(ok >= 18, f"{ok}/20 requests succeeded"),
+        check(attempts > 20, f"{attempts} upstream attempts (retries happened)")
+    ])
+
+
+def test_timeout(client, upstream: Upstream) -> bool:
+    print("\n🔹 Upstream hangs for 5s (timeout 1s, 2 retries)...")
+    upstream.faults(latency_ms=5000)
+    response, elapsed = chat(client, 200)
+    plain = check(
+        response.status_code == 504 and elapsed < 4.5 and "retry-after" in response.headers,
+        f"failed with {response.status_code} after {elapsed:.2f}s instead of hanging, "
+        f"Retry-After {response.headers.get('retry-after')}"
+    )
+
+    start = time.perf_counter()
+    response = client.post("/interview-chat/stream", json={"message": "Question 201: what is a Docker layer?"})
+    elapsed = time.perf_counter() - start
+    streamed = check(
+        response.status_code == 504 and elapsed < 4.5 and "retry-after" in response.headers,
+        f"stream failed with {response.status_code} after {elapsed:.2f}s, Retry-After {response.headers.get('retry-after')}"
+    )
+    return plain and streamed
+
+
+def test_circuit(client, upstream: Upstream) -> bool:
+    print("\n🔹 Upstream down (every call fails with 500)...")
+    upstream.faults(error_rate=1.0, error_status=500)
+
+    statuses = []
+    for i in range(12):
+        response, _ = chat(client, 300 + i)
+        statuses.append(response.status_code)
+        if response.status_code == 503:
+            break
+    opened = check(statuses[-1] == 503, f"circuit opened after {len(statuses) - 1} failed requests")
+
+    upstream.clear()
+    response, elapsed = chat(client, 400)
+    fast = check(
+        response.status_code == 503 and elapsed < 0.1 and "retry-after" in response.headers,
+        f"open circuit: {response.status_code} in {elapsed * 1000:.0f} ms, Retry-After {response.headers.get('retry-after')}"
+    )
+    untouched = check(not upstream.requests(), "no upstream call while the circuit is open")
+
+    print("\n🔹 Upstream recovers...")
+    upstream.faults()
+    time.sleep(float(API_SETTINGS["OPENROUTER_CIRCUIT_RESET"]) + 0.2)
+    response, _ = chat(client, 500)
+    state = client.get("/llm/stats").json()["circuit"]["state"]
+    recovered = check(response.status_code == 200 and state == "closed", f"trial call {response.status_code}, circuit {state}")
+
+    return all([opened, fast, untouched, recovered])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenRouter client resilience verification")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    fake_port, api_port = free_port(), free_port()
+    upstream = Upstream(f"http://127.0.0.1:{fake_port}/v1")
+    tmp_dir = tempfile.mkdtemp(prefix="verify_llm_resilience_")
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env.update(
+        OPENROUTER_API_KEY="test",
+        OPENROUTER_BASE_URL=upstream.url,
+        DATABASE_URL=f"sqlite:///{tmp_dir}/chats.db",
+        RESULT_CACHE_PATH=f"{tmp_dir}/cache.db",
+        **API_SETTINGS
+    )
+
+    fake = subprocess.Popen(
+        [sys.executable, str(Path(__file__).parent / "fake_openai_server.py"), "--port", str(fake_port),
+         "--first-token-ms", "0", "--token-delay-ms", "0"],
+        env=env
+    )
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{api_port}", timeout=args.timeout) as client:
+            wait_until(lambda: httpx.get(f"{upstream.url}/requests").status_code == 200, args.timeout, "Fake OpenAI server")
+            wait_until(lambda: client.get("/health").json()["models_loaded"]["openai"], args.timeout, "API")
+
+            results = [
+                test_keepalive(client, upstream),
+                test_transient(client, upstream, 503),
+                test_transient(client, upstream, 429, retry_after=0.2),
+                test_timeout(client, upstream),
+                test_circuit(client, upstream)
+            ]
+            print(f"\n🔹 /llm/stats: {client.get('/llm/stats').json()['circuit']}")
+    finally:
+        api.terminate()
+        fake.terminate()
+        api.wait()
+        fake.wait()
+
+    if not all(results):
+        sys.exit(1)
+    print("\n✅ All resilience checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Verify that concurrent ranking writes never create duplicate rows
+  - before: the previous SELECT-then-INSERT path, run from racing threads on a table
+    without the unique index, to show the duplicates it produced
+  - startup migration: a multi-worker API started on that legacy database removes the
+    duplicates and adds the unique index exactly once, without worker errors
+  - /rankings/calculate: concurrent recalculations of the same candidates against the
+    multi-worker API leave exactly one row per (candidate_id, job_id)
+  - bulk_upsert_rankings: concurrent bulk upserts of overlapping candidates, plus
+    insert/update throughput
+
+Usage:
+    python scripts/verify_ranking_upsert.py --candidates 20 --repeats 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.append(str(BASE_DIR))
+
+# The API and api.database bind their engine at import time
+TMP_DIR = tempfile.mkdtemp(prefix="verify_ranking_upsert_")
+os.environ["DATABASE_URL"] = f"sqlite:///{TMP_DIR}/rankings.db"
+
+from sqlalchemy import create_engine, func, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from api import db_models
+from api.database import SessionLocal, engine
+from api.ranking import calculate_ranking_score
+from api.ranking_store import bulk_upsert_rankings
+
+JOB_ID = "verify-upsert"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(check, timeout: float, what: str):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"{what} did not start in time")
+
+
+def check(condition: bool, message: str) -> bool:
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def ranking_counts(session_factory, job_id: str):
+    """(rows, distinct candidates) stored for a job"""
+    with session_factory() as db:
+        model = db_models.CandidateRanking
+        rows = db.query(func.count(model.id)).filter(model.job_id == job_id).scalar()
+        distinct = db.query(func.count(func.distinct(model.candidate_id))).filter(model.job_id == job_id).scalar()
+    return rows, distinct
+
+
+def payload(candidate: int, skill_match: float) -> dict:
+    return {
+        "candidate_id": f"cand-{candidate}",
+        "job_id": JOB_ID,
+        "skill_match": skill_match,
+        "experience_years": 3,
+        "required_experience": 2,
+        "role_confidence": 0.8,
+        "ats_score": 70,
+        "missing_skills": ["Kubernetes"]
+    }
+
+
+def legacy_race(candidates: int, repeats: int) -> int:
+    """Number of duplicate rows left by the previous write path"""
+    print("\n🔹 Before: SELECT-then-INSERT from racing threads, no unique index...")
+    legacy_engine = create_engine(f"sqlite:///{TMP_DIR}/legacy.db", connect_args={"check_same_thread": False, "timeout": 30})
+    db_models.Base.metadata.create_all(bind=legacy_engine, tables=[db_models.CandidateRanking.__table__])
+    with legacy_engine.begin() as conn:
+        conn.execute(text("DROP INDEX ux_candidate_rankings_candidate_job"))
+    legacy_session = sessionmaker(bind=legacy_engine)
+
+    def calculate(candidate: int, barrier: threading.Barrier):
+        with legacy_session() as db:
+            model = db_models.CandidateRanking
+            existing = db.query(model).filter(
+                model.candidate_id == f"cand-{candidate}", model.job_id == JOB_ID
+            ).first()
+            barrier.wait()  # Every request has looked before any of them writes
+            if existing is None:
+                db.add(model(candidate_id=f"cand-{candidate}", job_id=JOB_ID, total_score=random.uniform(0, 100)))
+            else:
+                existing.total_score = random.uniform(0, 100)
+            db.commit()
+
+    for candidate in range(candidates):
+        barrier = threading.Barrier(repeats)
+        with ThreadPoolExecutor(max_workers=repeats) as pool:
+            list(pool.map(lambda _: calculate(candidate, barrier), range(repeats)))
+
+    rows, distinct = ranking_counts(legacy_session, JOB_ID)
+    legacy_engine.dispose()
+    print(f"   {candidates * repeats} concurrent calculations -> {rows} rows for {distinct} candidates")
+    # The API below starts on this database and migrates it
+    shutil.copy(f"{TMP_DIR}/legacy.db", f"{TMP_DIR}/rankings.db")
+    return rows - distinct
+
+
+async def concurrent_calculations(base_url: str, candidates: int, repeats: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        requests = [payload(c, random.uniform(0, 100)) for c in range(candidates) for _ in range(repeats)]
+        random.shuffle(requests)
+        responses = await asyncio.gather(*[client.post("/rankings/calculate", json=r) for r in requests])
+    return requests, responses
+
+
+def test_api(candidates: int, repeats: int, workers: int, timeout: float, duplicates: int) -> bool:
+    print(f"\n🔹 {workers} API workers start on the legacy database ({duplicates} duplicate rows)...")
+    api_port = free_port()
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BASE_DIR), env.get("PYTHONPATH")]))
+    env["RESULT_CACHE_PATH"] = f"{TMP_DIR}/cache.db"
+
+    log_path = f"{TMP_DIR}/api.log"
+    with open(log_path, "w") as log:
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(api_port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BASE_DIR, env={**env, "PYTHONUNBUFFERED": "1"}, stdout=log, stderr=subprocess.STDOUT
+        )
+    try:
+        base_url = f"http://127.0.0.1:{api_port}"
+        wait_until(lambda: httpx.get(f"{base_url}/health").status_code == 200, timeout, "API")
+        wait_until(lambda: open(log_path).read().count("Database schema up to date") >= workers, timeout, "Every worker")
+        with open(log_path) as log:
+            output = log.read()
+        rows_after, distinct_after = ranking_counts(SessionLocal, JOB_ID)
+        indexes = {index["name"] for index in inspect(engine).get_indexes("candidate_rankings")}
+        migrated = all([
+            check(output.count("Removed") == (1 if duplicates else 0),
+                  f"duplicates removed by {output.count('Removed')} worker(s)"),
+            check(rows_after == distinct_after, f"{rows_after} rows for {distinct_after} candidates after migration"),
+            check("ux_candidate_rankings_candidate_job" in indexes, "unique index created"),
+            check("Traceback" not in output, "no worker failed during startup")
+        ])
+
+        print(f"\n🔹 {candidates} candidates x {repeats} concurrent /rankings/calculate calls ({workers} API workers)...")
+        requests, responses = asyncio.run(concurrent_calculations(base_url, candidates, repeats))
+    finally:
+        api.terminate()
+        api.wait()
+
+    failed = [r.status_code for r in responses if r.status_code != 200]
+    rows, distinct = ranking_counts(SessionLocal, JOB_ID)
+
+    # Each stored score must be one of the scores computed for that candidate
+    submitted = {}
+    for request in requests:
+        score = calculate_ranking_score(
+            request["skill_match"], request["experience_years"], request["required_experience"],
+            request["role_confidence"], request["ats_score"]
+        )["score"]
+        submitted.setdefault(request["candidate_id"], set()).add(score)
+    with SessionLocal() as db:
+        stored = db.query(db_models.CandidateRanking).filter(db_models.CandidateRanking.job_id == JOB_ID).all()
+    consistent = all(r.total_score in submitted[r.candidate_id] for r in stored)
+
+    return migrated and all([
+        check(not failed, f"{len(responses) - len(failed)}/{len(responses)} requests succeeded" + (f" (failed: {failed[:5]})" if failed else "")),
+        check(rows == distinct == candidates, f"{rows} rows for {distinct} candidates"),
+        check(consistent, "every stored score is one of the submitted scores")
+    ])
+
+
+def bulk_rankings(count: int, seed: int):
+    rng = random.Random(seed)
+    return [
+        {
+            "candidate_id": f"bulk-{i}",
+            "result": calculate_ranking_score(rng.uniform(0, 100), rng.uniform(0, 10), 3, rng.random(), rng.uniform(0, 100)),
+            "missing_skills": rng.sample(["Python", "Docker", "AWS", "SQL"], rng.randrange(0, 3))
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk(count: int, writers: int) -> bool:
+    bulk_job = f"{JOB_ID}-bulk"
+    print(f"\n🔹 bulk_upsert_rankings: {count} rankings...")
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        bulk_upsert_rankings(db, bulk_job, bulk_rankings(count, seed=0))
+        inserted = time.perf_counter() - start
+        start = time.perf_counter()
+        bulk_upsert_rankings(db, bulk_job, bulk_rankings(count, seed=1))
+        updated = time.perf_counter() - start
+    print(f"   insert {inserted * 1000:.0f} ms, update {updated * 1000:.0f} ms")
+
+    print(f"\n🔹 {writers} concurrent bulk upserts of the same {count} candidates...")
+
+    def write(seed: int):
+        with SessionLocal() as db:
+            return bulk_upsert_rankings(db, bulk_job, bulk_rankings(count, seed=seed))
+
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        written = list(pool.map(write, range(2, 2 + writers)))
+    rows, distinct = ranking_counts(SessionLocal, bulk_job)
+    return all([
+        check(written == [count] * writers, f"{writers} writers upserted {written}"),
+        check(rows == distinct == count, f"{rows} rows for {distinct} candidates")
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent ranking upsert verification")
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=10, help="Concurrent calculations per candidate")
+    parser.add_argument("--workers", type=int, default=4, help="API worker processes")
+    parser.add_argument("--bulk", type=int, default=10000, help="Rankings per bulk upsert")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    duplicates = legacy_race(args.candidates, args.repeats)
+    print(f"   {'duplicates reproduced' if duplicates else 'no duplicates this time (the race is timing dependent)'}")
+
+    results = [
+        test_api(args.candidates, args.repeats, args.workers, args.timeout, duplicates),
+        test_bulk(args.bulk, writers=4)
+    ]
+    if not all(results):
+        sys.exit(1)
+    print("\n✅ No duplicate rankings under concurrent writes")
+
+
+if __name__ == "__main__":
+    main()